@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark NBACleaner and FeatureBuilder on synthetic data.
+
+Times every public cleaner and feature builder method at several data scales,
+measures peak traced memory, and writes the results to a JSON file that can
+be compared against an earlier run:
+
+    python scripts/run_benchmarks.py --scales 1 10 100 --output bench_results.json
+    python scripts/run_benchmarks.py --compare bench_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.data.cleaners.nba_data_cleaner import NBACleaner
+from src.data.synthetic import generate_datasets
+from src.features.feature_builder import FeatureBuilder
+
+def get_benchmarks(data):
+    """Map benchmark names to (callable, input rows) for one set of synthetic tables."""
+    # NBACleaner creates its data directories in the working directory
+    cleaner = NBACleaner()
+    builder = FeatureBuilder()
+
+    shots = data['shots']
+    players = data['player_stats']
+    teams = data['team_stats']
+    injuries = data['injuries']
+
+    style = builder.create_style_features(teams)
+    composition = builder.create_composition_features(players, injuries)
+    pattern = builder.create_pattern_features(teams)
+    conference_input = cleaner.standardize_team_names(shots[['TEAM_NAME']]).rename(columns={'TEAM_NAME': 'team'})
+
+    return {
+        'cleaner.standardize_team_names': (lambda: cleaner.standardize_team_names(shots), len(shots)),
+        'cleaner.handle_numeric_columns': (lambda: cleaner.handle_numeric_columns(shots), len(shots)),
+        'cleaner.convert_percentages': (lambda: cleaner.convert_percentages(teams), len(teams)),
+        'cleaner.handle_dates': (lambda: cleaner.handle_dates(shots), len(shots)),
+        'cleaner.standardize_player_names': (
+            lambda: cleaner.standardize_player_names(shots, name_col='PLAYER_NAME'), len(shots)),
+        'cleaner.add_conference_mappings': (
+            lambda: cleaner.add_conference_mappings(conference_input.copy()), len(conference_input)),
+        'cleaner.clean': (lambda: cleaner.clean(shots), len(shots)),
+        'builder.create_style_features': (lambda: builder.create_style_features(teams), len(teams)),
+        'builder.create_composition_features': (
+            lambda: builder.create_composition_features(players, injuries), len(players)),
+        'builder.create_pattern_features': (lambda: builder.create_pattern_features(teams), len(teams)),
+        'builder.build[pandas]': (lambda: builder.build(teams, backend='pandas'), len(teams)),
+        'builder.build[numpy]': (lambda: builder.build(teams, backend='numpy'), len(teams)),
+        'builder.combine_features': (
+            lambda: builder.combine_features(style, composition, pattern), len(style)),
+    }
+
+def measure(func, repeat):
+    """Time a callable `repeat` times, then measure its peak traced memory in one more run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds_min': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_bytes': peak
+    }
+
+def run(scales, repeat, seed, only=None):
+    """Run all benchmarks at every scale."""
+    results = []
+    for scale in scales:
+        print(f"\nScale {scale}x: generating data...")
+        data = generate_datasets(scale, seed)
+        for name, (func, rows) in get_benchmarks(data).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            result = {'benchmark': name, 'scale': scale, 'rows': rows, **measure(func, repeat)}
+            results.append(result)
+            print(f"  {name:<40} {result['seconds_median']:>9.4f}s "
+                  f"{result['peak_bytes'] / 2**20:>9.1f} MiB  ({rows:,} rows)")
+    return results
+
+def compare(results, baseline_path):
+    """Print the median time ratio of each benchmark against an earlier results file."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['benchmark'], r['scale']): r for r in json.load(f)['results']}
+
+    print(f"\nComparison against {baseline_path} (ratio > 1 is slower):")
+    for result in results:
+        previous = baseline.get((result['benchmark'], result['scale']))
+        if previous is None:
+            continue
+        ratio = result['seconds_median'] / previous['seconds_median']
+        memory = result['peak_bytes'] / max(previous['peak_bytes'], 1)
+        print(f"  {result['benchmark']:<40} {result['scale']:>5}x  time x{ratio:.2f}  memory x{memory:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help='Data scales to run (1, 10, 100, 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    parser.add_argument('--only', nargs='+', help='Only run benchmarks whose name contains one of these')
+    parser.add_argument('--output', default='bench_results.json', help='Results file to write')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    # Keep the directories NBACleaner creates out of the project tree
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    output = Path(args.output).resolve()
+    baseline = Path(args.compare).resolve() if args.compare else None
+    os.chdir(workdir)
+
+    results = run(args.scales, args.repeat, args.seed, args.only)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+
+    if baseline is not None:
+        compare(results, baseline)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+if __name__ == '__main__':
+    main()
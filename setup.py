@@ -11,6 +11,7 @@ setup(
         'matplotlib',
         'seaborn',
         'yellowbrick',
-        'scipy'
+        'scipy',
+        'pyarrow'
     ]
 )
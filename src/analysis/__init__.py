@@ -0,0 +1,6 @@
+from .anomaly import AnomalyDetector
+from .clustering import ArchetypeClusterer
+from .consensus import ConsensusClusterer
+from .embeddings import EmbeddingService
+
+__all__ = ['AnomalyDetector', 'ArchetypeClusterer', 'ConsensusClusterer', 'EmbeddingService']
@@ -0,0 +1,219 @@
+"""
+Exceptional-performance detection with persisted IsolationForest models.
+
+AnomalyDetector fits a StandardScaler and an IsolationForest on the combined
+features once and saves both together. New team-seasons are then scored in
+batches against the saved models, without refitting on the whole history.
+
+With era_starts, one scaler and forest are fitted per era in parallel, so a
+team is compared with its contemporaries rather than with every season since
+1950. A season belongs to the last era starting at or before it, so future
+seasons fall into the latest era.
+"""
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+from ..features.feature_matrix import FeatureMatrix
+from .inputs import FeatureInput, as_matrix
+
+ALL_SEASONS = 'all'
+
+
+def _fit_model(matrix: np.ndarray, contamination, n_estimators: int,
+               random_state: int) -> Tuple[StandardScaler, IsolationForest]:
+    """Fit a scaler and forest on one era; runs in a worker process."""
+    scaler = StandardScaler().fit(matrix)
+    forest = IsolationForest(n_estimators=n_estimators, contamination=contamination,
+                             random_state=random_state, n_jobs=1)
+    forest.fit(scaler.transform(matrix))
+    return scaler, forest
+
+
+def _team_seasons(features: FeatureInput) -> Optional[pd.DataFrame]:
+    if isinstance(features, FeatureMatrix):
+        return features.team_seasons()
+    if isinstance(features, pd.DataFrame) and {'team', 'season'} <= set(features.columns):
+        return features[['team', 'season']].reset_index(drop=True)
+    return None
+
+
+class AnomalyDetector:
+    """Persisted scaler + IsolationForest models for scoring team-seasons."""
+
+    def __init__(self, contamination=0.1, n_estimators: int = 100, random_state: int = 42,
+                 era_starts: Optional[Sequence[int]] = None, n_jobs: Optional[int] = None,
+                 batch_size: int = 10_000):
+        """
+        Initialize the detector.
+
+        Args:
+            contamination: Expected share of exceptional team-seasons, as for
+                           IsolationForest
+            n_estimators: Trees per forest
+            random_state: Seed for every forest
+            era_starts: First season of each era, e.g. [1990, 2000, 2010].
+                        If None, a single model covers all seasons
+            n_jobs: Worker processes for per-era fits. Defaults to the CPU count
+            batch_size: Rows scored per batch
+        """
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.era_starts = sorted(int(s) for s in era_starts) if era_starts else None
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+        self.models: Dict[str, Tuple[StandardScaler, IsolationForest]] = {}
+        self.columns = None
+        # Identifies the training data, e.g. a FeatureStore version or frame fingerprint
+        self.data_version: Optional[str] = None
+        self.metrics = {'rows_scored': 0, 'batches': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        self.logger = logging.getLogger(__name__)
+
+    def eras(self, seasons) -> np.ndarray:
+        """Era name of every season: its era's first season, or 'all' without eras."""
+        seasons = np.asarray(seasons)
+        if self.era_starts is None:
+            return np.full(len(seasons), ALL_SEASONS, dtype=object)
+        starts = np.asarray(self.era_starts)
+        positions = np.maximum(np.searchsorted(starts, seasons, side='right') - 1, 0)
+        return starts.astype(str).astype(object)[positions]
+
+    def _seasons(self, features: FeatureInput, seasons, n_rows: int):
+        if seasons is not None:
+            return np.asarray(seasons)
+        keys = _team_seasons(features)
+        if keys is not None:
+            return keys['season'].to_numpy()
+        if self.era_starts is not None:
+            raise ValueError("Seasons are required to assign rows to eras")
+        return np.zeros(n_rows, dtype=int)
+
+    def fit(self, features: FeatureInput, columns: Optional[Sequence[str]] = None,
+            seasons: Optional[Sequence[int]] = None, data_version: Optional[str] = None) -> 'AnomalyDetector':
+        """
+        Fit the scaler and forest, one pair per era.
+
+        Args:
+            features: Combined feature frame, FeatureMatrix or unscaled array
+            columns: Feature columns to use. Defaults to every numeric feature
+            seasons: Season of every row, if `features` does not carry them
+            data_version: Identifier of the training data, saved with the
+                          models so a stale saved detector can be detected
+        """
+        start = time.perf_counter()
+        matrix, names = as_matrix(features, columns, standardized=False)
+        matrix = np.asarray(matrix, dtype=np.float64)
+        eras = self.eras(self._seasons(features, seasons, len(matrix)))
+        params = (self.contamination, self.n_estimators, self.random_state)
+
+        groups = {era: np.flatnonzero(eras == era) for era in pd.unique(eras)}
+        if self.n_jobs > 1 and len(groups) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(groups))) as pool:
+                futures = {era: pool.submit(_fit_model, matrix[rows], *params) for era, rows in groups.items()}
+                self.models = {era: future.result() for era, future in futures.items()}
+        else:
+            self.models = {era: _fit_model(matrix[rows], *params) for era, rows in groups.items()}
+
+        self.columns = names
+        self.data_version = data_version
+        self.logger.info(f"Fitted {len(self.models)} anomaly model(s) on {len(matrix)} rows "
+                         f"in {time.perf_counter() - start:.2f}s")
+        return self
+
+    def score(self, features: FeatureInput, seasons: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Score team-seasons against the fitted models, in batches.
+
+        Args:
+            features: Rows to score, with the columns the models were fitted on
+            seasons: Season of every row, if `features` does not carry them
+
+        Returns:
+            DataFrame with team and season (when known), era, anomaly score
+            (lower is more exceptional, as IsolationForest.decision_function)
+            and an is_exceptional flag
+        """
+        if not self.models:
+            raise ValueError("AnomalyDetector is not fitted")
+        start = time.perf_counter()
+        matrix, _ = as_matrix(features, self.columns, standardized=False)
+        n_rows = len(matrix)
+        eras = self.eras(self._seasons(features, seasons, n_rows))
+
+        scores = np.empty(n_rows)
+        batches = 0
+        for era in pd.unique(eras):
+            if era not in self.models:
+                # Only eras that had rows at fit time have a model
+                raise ValueError(f"No anomaly model fitted for era {era}")
+            scaler, forest = self.models[era]
+            rows = np.flatnonzero(eras == era)
+            for offset in range(0, len(rows), self.batch_size):
+                batch = rows[offset:offset + self.batch_size]
+                values = np.asarray(matrix[batch], dtype=np.float64)
+                scores[batch] = forest.decision_function(scaler.transform(values))
+                batches += 1
+
+        result = pd.DataFrame({'era': eras, 'score': scores, 'is_exceptional': scores < 0})
+        keys = _team_seasons(features)
+        if keys is not None:
+            result = pd.concat([keys, result], axis=1)
+
+        seconds = time.perf_counter() - start
+        self.metrics['rows_scored'] += n_rows
+        self.metrics['batches'] += batches
+        self.metrics['seconds'] += seconds
+        self.metrics['rows_per_second'] = self.metrics['rows_scored'] / max(self.metrics['seconds'], 1e-12)
+        self.metrics['last_rows_per_second'] = n_rows / max(seconds, 1e-12)
+        return result
+
+    def save(self, path) -> str:
+        """Persist the fitted scalers and forests, written atomically."""
+        if not self.models:
+            raise ValueError("AnomalyDetector is not fitted")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'models': self.models,
+            'columns': self.columns,
+            'data_version': self.data_version,
+            'era_starts': self.era_starts,
+            'params': {
+                'contamination': self.contamination,
+                'n_estimators': self.n_estimators,
+                'random_state': self.random_state,
+                'batch_size': self.batch_size
+            },
+            'sklearn': sklearn.__version__
+        }
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path, n_jobs: Optional[int] = None) -> 'AnomalyDetector':
+        """Load a detector written by save(), ready to score new rows."""
+        state = joblib.load(path)
+        if state['sklearn'] != sklearn.__version__:
+            logging.getLogger(__name__).warning(
+                f"Anomaly models were saved with scikit-learn {state['sklearn']}, "
+                f"running {sklearn.__version__}")
+        detector = cls(era_starts=state['era_starts'], n_jobs=n_jobs, **state['params'])
+        detector.models = state['models']
+        detector.columns = state['columns']
+        detector.data_version = state.get('data_version')
+        return detector
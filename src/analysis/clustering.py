@@ -0,0 +1,219 @@
+"""
+Team archetype clustering with a parallel, cached elbow search.
+
+ArchetypeClusterer fits KMeans for every candidate k in a process pool, picks
+the elbow of the inertia curve, and stores the fitted models, the inertia
+curve and the Ward linkage on disk keyed on the feature snapshot. Rerunning
+the archetype analysis on unchanged features loads the cache instead of
+refitting anything.
+
+Large matrices can use MiniBatchKMeans, which fits on small random batches
+and scales to many more rows at a small cost in inertia.
+"""
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import sklearn
+from scipy.cluster.hierarchy import linkage
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from threadpoolctl import threadpool_limits
+
+from .inputs import FeatureInput, as_matrix, snapshot_key
+
+MODES = ('kmeans', 'minibatch', 'auto')
+
+# Matrix shared by the tasks of one worker process, set by _init_worker
+_WORKER_MATRIX = None
+
+
+def _init_worker(matrix: np.ndarray) -> None:
+    global _WORKER_MATRIX
+    _WORKER_MATRIX = matrix
+
+
+def make_model(k: int, mode: str, random_state: int, batch_size: int = 1024):
+    """KMeans or MiniBatchKMeans with the given number of clusters."""
+    if mode == 'minibatch':
+        return MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=batch_size, n_init='auto')
+    return KMeans(n_clusters=k, random_state=random_state)
+
+
+def _fit_k(k: int, mode: str, random_state: int, batch_size: int, matrix: Optional[np.ndarray] = None):
+    """Fit one candidate k; runs in a worker process unless a matrix is passed."""
+    matrix = _WORKER_MATRIX if matrix is None else matrix
+    start = time.perf_counter()
+    model = make_model(k, mode, random_state, batch_size)
+    # One BLAS/OpenMP thread per worker, so workers do not oversubscribe the CPUs
+    with threadpool_limits(limits=1):
+        model.fit(matrix)
+    return k, model, float(model.inertia_), time.perf_counter() - start
+
+
+def find_elbow(ks: Sequence[int], inertias: Sequence[float]) -> int:
+    """
+    Elbow of a decreasing inertia curve.
+
+    Both axes are scaled to [0, 1] and the elbow is the k whose point lies
+    farthest below the straight line from the first to the last point.
+    """
+    ks = np.asarray(ks, dtype=float)
+    inertias = np.asarray(inertias, dtype=float)
+    if len(ks) < 3:
+        return int(ks[0])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertias[0] - inertias[-1]
+    y = (inertias - inertias[-1]) / span if span > 0 else np.zeros_like(inertias)
+    # The chord runs from (0, 1) to (1, 0), i.e. y = 1 - x
+    distance = (1 - x) - y
+    return int(ks[int(np.argmax(distance))])
+
+
+class ArchetypeClusterer:
+    """Parallel elbow search and cached cluster models for team archetypes."""
+
+    def __init__(self, cache_dir: Optional[str] = 'data/models/clustering', k_range: Tuple[int, int] = (2, 9),
+                 mode: str = 'auto', minibatch_threshold: int = 50_000, batch_size: int = 1024,
+                 random_state: int = 42, n_jobs: Optional[int] = None):
+        """
+        Initialize the clusterer.
+
+        Args:
+            cache_dir: Directory for cached results. None disables caching
+            k_range: Inclusive range of candidate cluster counts; (2, 9) matches
+                     the yellowbrick k=(2, 10) search it replaced
+            mode: 'kmeans', 'minibatch', or 'auto' to use mini-batch KMeans
+                  from `minibatch_threshold` rows on
+            minibatch_threshold: Row count from which 'auto' uses mini-batches
+            batch_size: Mini-batch size
+            random_state: Seed for every fit
+            n_jobs: Worker processes for the elbow search. Defaults to the CPU count
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}. Available modes: {list(MODES)}")
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.k_range = k_range
+        self.mode = mode
+        self.minibatch_threshold = minibatch_threshold
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+        self.result: Optional[Dict] = None
+        self.last_run: Dict = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _resolve_mode(self, n_rows: int) -> str:
+        if self.mode == 'auto':
+            return 'minibatch' if n_rows >= self.minibatch_threshold else 'kmeans'
+        return self.mode
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"clustering-{key}.joblib" if self.cache_dir is not None else None
+
+    def _load(self, key: str) -> Optional[Dict]:
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable clustering cache {path}: {e}")
+            return None
+
+    def _save(self, key: str, result: Dict) -> None:
+        path = self._cache_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        joblib.dump(result, tmp_path)
+        os.replace(tmp_path, path)
+
+    def elbow_search(self, features: FeatureInput, columns: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Fit every candidate k and find the elbow, or load the cached result.
+
+        Args:
+            features: Combined feature frame, FeatureMatrix or standardized array
+            columns: Feature columns to cluster on. Defaults to every numeric feature
+
+        Returns:
+            Dict with 'k', 'inertia', 'fit_seconds', 'elbow', 'mode', 'columns',
+            'key' and the fitted 'models' by k
+        """
+        start = time.perf_counter()
+        matrix, names = as_matrix(features, columns)
+        mode = self._resolve_mode(len(matrix))
+        ks = list(range(self.k_range[0], self.k_range[1] + 1))
+        key = snapshot_key(matrix, ks=ks, mode=mode, random_state=self.random_state,
+                           batch_size=self.batch_size, sklearn=sklearn.__version__)
+
+        result = self._load(key)
+        if result is not None:
+            self.result = result
+            self.last_run = {'cached': True, 'seconds': time.perf_counter() - start, 'key': key}
+            return result
+
+        fits = {}
+        if self.n_jobs > 1 and len(ks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(ks)), initializer=_init_worker,
+                                     initargs=(np.asarray(matrix),)) as pool:
+                futures = [pool.submit(_fit_k, k, mode, self.random_state, self.batch_size) for k in ks]
+                for future in futures:
+                    k, model, inertia, seconds = future.result()
+                    fits[k] = (model, inertia, seconds)
+        else:
+            for k in ks:
+                _, model, inertia, seconds = _fit_k(k, mode, self.random_state, self.batch_size, matrix)
+                fits[k] = (model, inertia, seconds)
+
+        inertias = [fits[k][1] for k in ks]
+        result = {
+            'key': key,
+            'mode': mode,
+            'columns': names,
+            'k': ks,
+            'inertia': inertias,
+            'fit_seconds': [fits[k][2] for k in ks],
+            'elbow': find_elbow(ks, inertias),
+            'models': {k: fits[k][0] for k in ks},
+            'linkage': None
+        }
+        self._save(key, result)
+
+        self.result = result
+        self.last_run = {'cached': False, 'seconds': time.perf_counter() - start, 'key': key}
+        self.logger.info(f"Elbow search over k={ks[0]}..{ks[-1]} found k={result['elbow']} "
+                         f"in {self.last_run['seconds']:.2f}s")
+        return result
+
+    def fit(self, features: FeatureInput, k: Optional[int] = None,
+            columns: Optional[Sequence[str]] = None):
+        """
+        Cluster model for k clusters (the elbow by default), fitted or loaded from cache.
+
+        Returns:
+            Tuple of (fitted model, labels of every row)
+        """
+        result = self.elbow_search(features, columns)
+        k = k if k is not None else result['elbow']
+        if k not in result['models']:
+            raise ValueError(f"k={k} is outside the searched range {self.k_range}")
+        model = result['models'][k]
+        return model, model.labels_
+
+    def ward_linkage(self, features: FeatureInput, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Ward linkage matrix for a dendrogram, computed once per feature snapshot."""
+        result = self.elbow_search(features, columns)
+        if result['linkage'] is None:
+            matrix, _ = as_matrix(features, columns)
+            result['linkage'] = linkage(matrix, method='ward')
+            self._save(result['key'], result)
+        return result['linkage']
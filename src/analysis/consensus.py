@@ -0,0 +1,208 @@
+"""
+Consensus clustering for archetype stability.
+
+Each resample clusters a random subset of the team-seasons. Across many
+resamples, the consensus of two team-seasons is the fraction of resamples
+containing both in which they landed in the same cluster. Archetypes whose
+members keep clustering together are stable; team-seasons that drift between
+clusters sit on archetype boundaries.
+
+Resamples run in a process pool in chunks. Every chunk adds its
+co-assignment counts into two n x n matrices and returns only those, so
+memory does not grow with the number of resamples. Each resample draws its
+seed from a SeedSequence spawned from the run's random_state, so results do
+not depend on the number of workers or on scheduling.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from ..features.feature_matrix import FeatureMatrix
+from .clustering import MODES, make_model
+from .inputs import FeatureInput, as_matrix
+
+# Matrix shared by the tasks of one worker process, set by _init_worker
+_WORKER_MATRIX = None
+
+
+def _init_worker(matrix: np.ndarray) -> None:
+    global _WORKER_MATRIX
+    _WORKER_MATRIX = matrix
+
+
+def _resample_chunk(seeds: List[np.random.SeedSequence], k: int, mode: str, subsample: float,
+                    batch_size: int, matrix: Optional[np.ndarray] = None):
+    """
+    Cluster one chunk of resamples.
+
+    Returns:
+        Tuple of (co-assignment counts, co-sampling counts) for the chunk
+    """
+    matrix = _WORKER_MATRIX if matrix is None else matrix
+    n_rows = len(matrix)
+    n_sample = max(k, int(round(subsample * n_rows)))
+    together = np.zeros((n_rows, n_rows), dtype=np.int32)
+    sampled = np.zeros((n_rows, n_rows), dtype=np.int32)
+
+    with threadpool_limits(limits=1):
+        for seed in seeds:
+            rng = np.random.default_rng(seed)
+            rows = np.sort(rng.choice(n_rows, size=n_sample, replace=False))
+            model = make_model(k, mode, int(rng.integers(2**31 - 1)), batch_size)
+            labels = model.fit_predict(matrix[rows])
+
+            # Unsampled rows get label -1, which never matches a sampled row
+            full_labels = np.full(n_rows, -1)
+            full_labels[rows] = labels
+            in_sample = full_labels >= 0
+            together += (full_labels[:, None] == full_labels[None, :]) & in_sample[:, None]
+            sampled += in_sample[:, None] & in_sample[None, :]
+
+    return together, sampled
+
+
+class ConsensusClusterer:
+    """Resampling-based stability scores for a k-cluster archetype solution."""
+
+    def __init__(self, k: int, n_resamples: int = 200, subsample: float = 0.8, mode: str = 'kmeans',
+                 batch_size: int = 1024, random_state: int = 42, n_jobs: Optional[int] = None,
+                 chunk_size: int = 10):
+        """
+        Initialize the consensus run.
+
+        Args:
+            k: Number of clusters, e.g. ArchetypeClusterer's elbow
+            n_resamples: Number of resampled fits
+            subsample: Fraction of team-seasons drawn, without replacement,
+                       for each resample
+            mode: 'kmeans' or 'minibatch'
+            batch_size: Mini-batch size
+            random_state: Seed for the reference fit and all resamples
+            n_jobs: Worker processes. Defaults to the CPU count
+            chunk_size: Resamples per worker task; each task returns two
+                        n x n count matrices
+        """
+        if mode not in MODES or mode == 'auto':
+            raise ValueError(f"Unknown mode: {mode}. Available modes: ['kmeans', 'minibatch']")
+        if not 0 < subsample <= 1:
+            raise ValueError("subsample must be in (0, 1]")
+        self.k = k
+        self.n_resamples = n_resamples
+        self.subsample = subsample
+        self.mode = mode
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self.consensus: Optional[np.ndarray] = None
+        self.labels: Optional[np.ndarray] = None
+        self.last_run: Dict = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _chunks(self) -> List[List[np.random.SeedSequence]]:
+        seeds = np.random.SeedSequence(self.random_state).spawn(self.n_resamples)
+        return [seeds[i:i + self.chunk_size] for i in range(0, len(seeds), self.chunk_size)]
+
+    def consensus_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Fraction of co-sampled resamples in which each pair clustered together.
+
+        Pairs that were never sampled together get NaN.
+        """
+        n_rows = len(matrix)
+        together = np.zeros((n_rows, n_rows), dtype=np.int64)
+        sampled = np.zeros((n_rows, n_rows), dtype=np.int64)
+        chunks = self._chunks()
+
+        worker = partial(_resample_chunk, k=self.k, mode=self.mode, subsample=self.subsample,
+                         batch_size=self.batch_size)
+        if self.n_jobs > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(chunks)), initializer=_init_worker,
+                                     initargs=(np.asarray(matrix),)) as pool:
+                # Counts are added as chunks come back; labelings are never kept
+                for chunk_together, chunk_sampled in pool.map(worker, chunks):
+                    together += chunk_together
+                    sampled += chunk_sampled
+        else:
+            for chunk in chunks:
+                chunk_together, chunk_sampled = worker(chunk, matrix=matrix)
+                together += chunk_together
+                sampled += chunk_sampled
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            consensus = np.where(sampled > 0, together / sampled, np.nan)
+        return consensus
+
+    def fit(self, features: FeatureInput, columns: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Fit the reference clustering and score its stability.
+
+        Args:
+            features: Combined feature frame, FeatureMatrix or standardized array
+            columns: Feature columns to cluster on. Defaults to every numeric feature
+
+        Returns:
+            Dict with:
+            - 'labels': reference cluster of every team-season
+            - 'cluster_stability': Series of mean within-cluster consensus per cluster
+            - 'item_stability': DataFrame with team, season (when known), cluster
+              and the mean consensus of each team-season with its own cluster
+            - 'pac': proportion of ambiguous clustering, the share of pairs with
+              consensus strictly between 0.1 and 0.9 (lower is more stable)
+        """
+        start = time.perf_counter()
+        matrix, _ = as_matrix(features, columns)
+        matrix = np.asarray(matrix)
+
+        with threadpool_limits(limits=1):
+            reference = make_model(self.k, self.mode, self.random_state, self.batch_size)
+            labels = reference.fit_predict(matrix)
+        consensus = self.consensus_matrix(matrix)
+
+        cluster_stability = {}
+        item_stability = np.full(len(matrix), np.nan)
+        for cluster in range(self.k):
+            members = np.flatnonzero(labels == cluster)
+            if len(members) < 2:
+                cluster_stability[cluster] = np.nan
+                continue
+            block = consensus[np.ix_(members, members)].copy()
+            np.fill_diagonal(block, np.nan)
+            cluster_stability[cluster] = float(np.nanmean(block))
+            item_stability[members] = np.nanmean(block, axis=1)
+
+        upper = consensus[np.triu_indices(len(matrix), k=1)]
+        upper = upper[~np.isnan(upper)]
+        pac = float(np.mean((upper > 0.1) & (upper < 0.9))) if len(upper) else np.nan
+
+        items = pd.DataFrame({'cluster': labels, 'stability': item_stability})
+        if isinstance(features, FeatureMatrix):
+            items = pd.concat([features.team_seasons(), items], axis=1)
+        elif isinstance(features, pd.DataFrame) and {'team', 'season'} <= set(features.columns):
+            items.insert(0, 'season', features['season'].to_numpy())
+            items.insert(0, 'team', features['team'].to_numpy())
+
+        self.consensus = consensus
+        self.labels = labels
+        self.last_run = {
+            'seconds': time.perf_counter() - start,
+            'n_resamples': self.n_resamples,
+            'resamples_per_second': self.n_resamples / max(time.perf_counter() - start, 1e-12)
+        }
+        self.logger.info(f"Consensus over {self.n_resamples} resamples: PAC={pac:.3f} "
+                         f"in {self.last_run['seconds']:.2f}s")
+
+        return {
+            'labels': labels,
+            'cluster_stability': pd.Series(cluster_stability, name='stability').rename_axis('cluster'),
+            'item_stability': items,
+            'pac': pac
+        }
@@ -0,0 +1,198 @@
+"""
+Cached, out-of-sample embeddings of the combined features.
+
+EmbeddingService fits 2-D (or k-D) embeddings of the team-season feature
+matrix and caches them on disk keyed on the feature snapshot, so notebook
+reruns on unchanged features load them instead of recomputing:
+
+- PCA is fitted with IncrementalPCA over row chunks, standardizing each chunk
+  on the fly, so the full scaled matrix is never materialized. New rows are
+  projected with the fitted components.
+- t-SNE has no transform for new points. New rows are placed at the
+  inverse-distance weighted mean of the embedding coordinates of their
+  nearest training team-seasons in feature space, which takes milliseconds
+  instead of a full refit.
+"""
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.decomposition import IncrementalPCA
+from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+
+from ..features.feature_matrix import FeatureMatrix, scaler_params
+from .inputs import FeatureInput, as_matrix, snapshot_key
+
+METHODS = ('pca', 'tsne')
+
+
+class EmbeddingService:
+    """Fit, cache and extend PCA and t-SNE embeddings of team-seasons."""
+
+    def __init__(self, cache_dir: Optional[str] = 'data/models/embeddings', n_components: int = 2,
+                 chunk_size: int = 1000, perplexity: float = 30.0, n_neighbors: int = 10,
+                 random_state: int = 42):
+        """
+        Initialize the service.
+
+        Args:
+            cache_dir: Directory for cached embeddings. None disables caching
+            n_components: Embedding dimensions
+            chunk_size: Rows per IncrementalPCA batch
+            perplexity: t-SNE perplexity
+            n_neighbors: Training neighbors used to place a new row in t-SNE space
+            random_state: Seed for t-SNE
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.n_components = n_components
+        self.chunk_size = chunk_size
+        self.perplexity = perplexity
+        self.n_neighbors = n_neighbors
+        self.random_state = random_state
+
+        self.fitted: Dict[str, Dict] = {}
+        self.last_run: Dict = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _params(self, method: str) -> Dict:
+        params = {'method': method, 'n_components': self.n_components, 'sklearn': sklearn.__version__}
+        if method == 'pca':
+            params['chunk_size'] = self.chunk_size
+        else:
+            params.update(perplexity=self.perplexity, n_neighbors=self.n_neighbors,
+                          random_state=self.random_state)
+        return params
+
+    def _cache_path(self, method: str, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{method}-{key}.joblib" if self.cache_dir is not None else None
+
+    def _load(self, method: str, key: str) -> Optional[Dict]:
+        path = self._cache_path(method, key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable embedding cache {path}: {e}")
+            return None
+
+    def _save(self, method: str, key: str, state: Dict) -> None:
+        path = self._cache_path(method, key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _fit_pca(self, matrix: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> Dict:
+        pca = IncrementalPCA(n_components=self.n_components)
+        # IncrementalPCA needs at least n_components rows per batch
+        chunk_size = max(self.chunk_size, self.n_components)
+        starts = range(0, len(matrix), chunk_size)
+        for start in starts:
+            chunk = matrix[start:start + chunk_size]
+            if len(chunk) < self.n_components:
+                break
+            pca.partial_fit((np.asarray(chunk, dtype=np.float64) - mean) / scale)
+
+        embedding = np.empty((len(matrix), self.n_components))
+        for start in starts:
+            chunk = np.asarray(matrix[start:start + chunk_size], dtype=np.float64)
+            embedding[start:start + chunk_size] = pca.transform((chunk - mean) / scale)
+        return {'model': pca, 'embedding': embedding}
+
+    def _fit_tsne(self, matrix: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> Dict:
+        scaled = (np.asarray(matrix, dtype=np.float64) - mean) / scale
+        tsne = TSNE(n_components=self.n_components, perplexity=min(self.perplexity, len(scaled) - 1),
+                    random_state=self.random_state, init='pca')
+        embedding = tsne.fit_transform(scaled)
+        neighbors = NearestNeighbors(n_neighbors=min(self.n_neighbors, len(scaled))).fit(scaled)
+        return {'model': neighbors, 'embedding': embedding}
+
+    def embed(self, features: FeatureInput, method: str = 'pca',
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Embedding of every team-season, fitted or loaded from cache.
+
+        Args:
+            features: Combined feature frame, FeatureMatrix or unscaled array
+            method: 'pca' or 'tsne'
+            columns: Feature columns to embed. Defaults to every numeric feature
+
+        Returns:
+            DataFrame with team and season (when known) and one column per
+            embedding dimension, e.g. pca_1, pca_2
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method}. Available methods: {list(METHODS)}")
+        start = time.perf_counter()
+        matrix, names = as_matrix(features, columns, standardized=False)
+        key = snapshot_key(matrix, columns=names, **self._params(method))
+
+        state = self._load(method, key)
+        cached = state is not None
+        if not cached:
+            mean, scale = scaler_params(matrix)
+            fit = self._fit_pca if method == 'pca' else self._fit_tsne
+            state = {'key': key, 'columns': names, 'mean': mean, 'scale': scale, **fit(matrix, mean, scale)}
+            self._save(method, key, state)
+
+        self.fitted[method] = state
+        self.last_run = {'method': method, 'cached': cached, 'seconds': time.perf_counter() - start,
+                         'key': key}
+        return self._frame(features, state['embedding'], method)
+
+    def project(self, features: FeatureInput, method: str = 'pca') -> pd.DataFrame:
+        """
+        Place new team-seasons into a fitted embedding without refitting.
+
+        Args:
+            features: New rows with the columns the embedding was fitted on,
+                      unscaled; they are standardized with the fitted scaler
+            method: 'pca' or 'tsne'; embed() must have run for it
+
+        Returns:
+            DataFrame like embed() for the new rows
+        """
+        if method not in self.fitted:
+            raise ValueError(f"No {method} embedding fitted; call embed() first")
+        start = time.perf_counter()
+        state = self.fitted[method]
+        matrix, _ = as_matrix(features, state['columns'], standardized=False)
+        scaled = (np.asarray(matrix, dtype=np.float64) - state['mean']) / state['scale']
+
+        if method == 'pca':
+            embedding = state['model'].transform(scaled)
+        else:
+            distances, neighbors = state['model'].kneighbors(scaled)
+            # Exact matches would divide by zero; give them all the weight instead
+            weights = 1.0 / np.maximum(distances, 1e-12)
+            weights /= weights.sum(axis=1, keepdims=True)
+            embedding = np.einsum('ij,ijk->ik', weights, state['embedding'][neighbors])
+
+        self.last_run = {'method': method, 'seconds': time.perf_counter() - start,
+                         'rows_projected': len(scaled)}
+        return self._frame(features, embedding, method)
+
+    def _frame(self, features: FeatureInput, embedding: np.ndarray, method: str) -> pd.DataFrame:
+        frame = pd.DataFrame(embedding, columns=[f"{method}_{i + 1}" for i in range(embedding.shape[1])])
+        if isinstance(features, FeatureMatrix):
+            return pd.concat([features.team_seasons(), frame], axis=1)
+        if isinstance(features, pd.DataFrame) and {'team', 'season'} <= set(features.columns):
+            return pd.concat([features[['team', 'season']].reset_index(drop=True), frame], axis=1)
+        return frame
+
+    def explained_variance_ratio(self) -> np.ndarray:
+        """Variance explained by each fitted PCA component."""
+        if 'pca' not in self.fitted:
+            raise ValueError("No pca embedding fitted; call embed() first")
+        return self.fitted['pca']['model'].explained_variance_ratio_
@@ -0,0 +1,72 @@
+"""
+Shared input handling for the analysis modules.
+
+Clustering, consensus, anomaly detection and embeddings all start from the
+standardized combined feature matrix. It may arrive as the DataFrame returned
+by FeatureBuilder.combine_features, a FeatureMatrix opened from disk, or a
+plain array; as_matrix() turns any of them into a float array and
+snapshot_key() identifies its content, so fitted models can be cached per
+feature snapshot.
+"""
+import hashlib
+import json
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..features.feature_matrix import FeatureMatrix, matrix_columns, scaler_params
+
+FeatureInput = Union[pd.DataFrame, FeatureMatrix, np.ndarray]
+
+
+def as_matrix(features: FeatureInput, columns: Optional[Sequence[str]] = None,
+              standardized: bool = True) -> Tuple[np.ndarray, List[str]]:
+    """
+    Float matrix and column names of a feature input.
+
+    Args:
+        features: Combined feature frame, FeatureMatrix or 2-D array
+        columns: Feature columns to use. Defaults to every numeric feature
+        standardized: Standardize the features: a FeatureMatrix uses its
+                      stored standardized matrix, a frame is scaled here.
+                      Arrays are used as given
+
+    Returns:
+        Tuple of (matrix, column names)
+    """
+    if isinstance(features, FeatureMatrix):
+        if standardized and features.standardized is None:
+            raise ValueError(f"No standardized matrix stored in {features.path}")
+        if columns is None:
+            source = features.standardized if standardized else features.values
+            return source, list(features.columns)
+        return features.select(columns, standardized=standardized), list(columns)
+
+    if isinstance(features, pd.DataFrame):
+        columns = list(columns) if columns is not None else matrix_columns(features)
+        matrix = features[columns].to_numpy(dtype=np.float64)
+        if standardized:
+            mean, scale = scaler_params(matrix)
+            matrix = (matrix - mean) / scale
+        return matrix, columns
+
+    matrix = np.asarray(features)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D feature matrix, got shape {matrix.shape}")
+    names = list(columns) if columns is not None else [f"f{j}" for j in range(matrix.shape[1])]
+    return matrix, names
+
+
+def snapshot_key(matrix: np.ndarray, **params) -> str:
+    """
+    Content hash of a feature matrix plus the parameters a result depends on.
+
+    Two runs over the same feature snapshot with the same parameters get the
+    same key, whatever file or frame the matrix was loaded from.
+    """
+    digest = hashlib.sha256()
+    digest.update(str((matrix.shape, str(matrix.dtype))).encode())
+    digest.update(np.ascontiguousarray(matrix).tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:24]
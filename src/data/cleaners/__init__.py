@@ -1 +1,5 @@
-from .nba_data_cleaner import NBACleaner
\ No newline at end of file
+from .nba_data_cleaner import NBACleaner
+from .team_resolver import TeamNameResolver
+from .streaming_cleaner import StreamingCleaner
+from .pipeline import CleaningPipeline
+from .player_index import PlayerIdentityIndex
@@ -15,9 +15,155 @@ import numpy as np
 from pathlib import Path
 import os
 
+from .pipeline import (
+    CleaningPipeline, DateStep, NumericStep, PercentageStep, PlayerNameStep, TeamNameStep
+)
+from .player_index import PlayerIdentityIndex
+from .team_resolver import TeamNameResolver
+from ..franchises import FranchiseTable
+from ..schemas import numeric_columns
+
+# Team name mappings for historical teams, shared with the feature builder
+TEAM_MAPPINGS = {
+    'BULLETS': 'WAS',
+    'WASHINGTON BULLETS': 'WAS',
+    'CAPITAL BULLETS': 'WAS',
+    'BALTIMORE BULLETS': 'WAS',
+    'WASHINGTON WIZARDS': 'WAS',
+    'WIZARDS': 'WAS',
+    'CHICAGO ZEPHYRS': 'WAS',
+    'CHICAGO PACKERS': 'WAS',
+    
+    'HAWKS': 'ATL',
+    'ATLANTA HAWKS': 'ATL',
+    'ST. LOUIS HAWKS': 'ATL',
+    'MILWAUKEE HAWKS': 'ATL',
+    'TRI-CITIES BLACKHAWKS': 'ATL',
+    
+    'CLIPPERS': 'LAC',
+    'LA CLIPPERS': 'LAC',
+    'LOS ANGELES CLIPPERS': 'LAC',
+    'BUFFALO BRAVES': 'LAC',
+    'SAN DIEGO CLIPPERS': 'LAC',
+    
+    'KINGS': 'SAC',
+    'SACRAMENTO KINGS': 'SAC',
+    'KANSAS CITY KINGS': 'SAC',
+    'CINCINNATI ROYALS': 'SAC',
+    'ROCHESTER ROYALS': 'SAC',
+    
+    '76ERS': 'PHI',
+    'SIXERS': 'PHI',
+    'PHILADELPHIA 76ERS': 'PHI',
+    'SYRACUSE NATIONALS': 'PHI',
+    
+    'LAKERS': 'LAL',
+    'LA LAKERS': 'LAL',
+    'LOS ANGELES LAKERS': 'LAL',
+    'MINNEAPOLIS LAKERS': 'LAL',
+    
+    'ROCKETS': 'HOU',
+    'HOUSTON ROCKETS': 'HOU',
+    'SAN DIEGO ROCKETS': 'HOU',
+    
+    'THUNDER': 'OKC',
+    'OKLAHOMA CITY THUNDER': 'OKC',
+    'SEATTLE SUPERSONICS': 'OKC',
+    'SONICS': 'OKC',
+    'SEA': 'OKC',
+    
+    'GRIZZLIES': 'MEM',
+    'MEMPHIS GRIZZLIES': 'MEM',
+    'VANCOUVER GRIZZLIES': 'MEM',
+    
+    'PELICANS': 'NOP',
+    'NEW ORLEANS PELICANS': 'NOP',
+    'NEW ORLEANS HORNETS': 'NOP',
+    'NEW ORLEANS/OKLAHOMA CITY HORNETS': 'NOP',
+    'NOK': 'NOP',
+    'NOH': 'NOP',
+    
+    'JAZZ': 'UTA',
+    'UTAH JAZZ': 'UTA',
+    'NEW ORLEANS JAZZ': 'UTA',
+    
+    'HORNETS': 'CHA',
+    'CHARLOTTE HORNETS': 'CHA',
+    'CHARLOTTE BOBCATS': 'CHA',
+    'BOBCATS': 'CHA',
+    'CHO': 'CHA',
+    
+    'NETS': 'BKN',
+    'BROOKLYN NETS': 'BKN',
+    'NEW JERSEY NETS': 'BKN',
+    'NJN': 'BKN',
+    'BRK': 'BKN',
+    
+    'WARRIORS': 'GSW',
+    'GOLDEN STATE WARRIORS': 'GSW',
+    'SAN FRANCISCO WARRIORS': 'GSW',
+    
+    'SUNS': 'PHX',
+    'PHOENIX SUNS': 'PHX',
+    'PHO': 'PHX',
+    
+    'BLAZERS': 'POR',
+    'TRAIL BLAZERS': 'POR',
+    'PORTLAND TRAIL BLAZERS': 'POR',
+    
+    'SPURS': 'SAS',
+    'SAN ANTONIO SPURS': 'SAS',
+    
+    'RAPTORS': 'TOR',
+    'TORONTO RAPTORS': 'TOR',
+    
+    'BUCKS': 'MIL',
+    'MILWAUKEE BUCKS': 'MIL',
+    
+    'TIMBERWOLVES': 'MIN',
+    'MINNESOTA TIMBERWOLVES': 'MIN',
+    
+    'NUGGETS': 'DEN',
+    'DENVER NUGGETS': 'DEN',
+    
+    'HEAT': 'MIA',
+    'MIAMI HEAT': 'MIA',
+    
+    'CAVALIERS': 'CLE',
+    'CLEVELAND CAVALIERS': 'CLE',
+    'CAVS': 'CLE',
+    
+    'CELTICS': 'BOS',
+    'BOSTON CELTICS': 'BOS',
+    
+    'PISTONS': 'DET',
+    'DETROIT PISTONS': 'DET',
+    
+    'PACERS': 'IND',
+    'INDIANA PACERS': 'IND',
+    
+    'BULLS': 'CHI',
+    'CHICAGO BULLS': 'CHI',
+    
+    'MAVERICKS': 'DAL',
+    'DALLAS MAVERICKS': 'DAL',
+    
+    'MAGIC': 'ORL',
+    'ORLANDO MAGIC': 'ORL',
+    
+    'KNICKS': 'NYK',
+    'NEW YORK KNICKS': 'NYK',
+}
+
 class NBACleaner:
-    def __init__(self):
-        """Initialize the cleaner with project directory structure."""
+    def __init__(self, fuzzy_team_matching=False):
+        """
+        Initialize the cleaner with project directory structure.
+        
+        Args:
+            fuzzy_team_matching: Fall back to Levenshtein matching for team
+                                 spellings missing from the team mappings
+        """
         self.project_root = Path(os.getcwd())
         self.base_dir = self.project_root / 'data'
         self.raw_dir = self.base_dir / 'raw'
@@ -28,138 +174,53 @@ class NBACleaner:
             (self.processed_dir / subdir).mkdir(parents=True, exist_ok=True)
         
         # Define team name mappings for historical teams
-        self.team_mappings = {
-            'BULLETS': 'WAS',
-            'WASHINGTON BULLETS': 'WAS',
-            'CAPITAL BULLETS': 'WAS',
-            'BALTIMORE BULLETS': 'WAS',
-            'WASHINGTON WIZARDS': 'WAS',
-            'WIZARDS': 'WAS',
-            'CHICAGO ZEPHYRS': 'WAS',
-            'CHICAGO PACKERS': 'WAS',
-            
-            'HAWKS': 'ATL',
-            'ATLANTA HAWKS': 'ATL',
-            'ST. LOUIS HAWKS': 'ATL',
-            'MILWAUKEE HAWKS': 'ATL',
-            'TRI-CITIES BLACKHAWKS': 'ATL',
-            
-            'CLIPPERS': 'LAC',
-            'LA CLIPPERS': 'LAC',
-            'LOS ANGELES CLIPPERS': 'LAC',
-            'BUFFALO BRAVES': 'LAC',
-            'SAN DIEGO CLIPPERS': 'LAC',
-            
-            'KINGS': 'SAC',
-            'SACRAMENTO KINGS': 'SAC',
-            'KANSAS CITY KINGS': 'SAC',
-            'CINCINNATI ROYALS': 'SAC',
-            'ROCHESTER ROYALS': 'SAC',
-            
-            '76ERS': 'PHI',
-            'SIXERS': 'PHI',
-            'PHILADELPHIA 76ERS': 'PHI',
-            'SYRACUSE NATIONALS': 'PHI',
-            
-            'LAKERS': 'LAL',
-            'LA LAKERS': 'LAL',
-            'LOS ANGELES LAKERS': 'LAL',
-            'MINNEAPOLIS LAKERS': 'LAL',
-            
-            'ROCKETS': 'HOU',
-            'HOUSTON ROCKETS': 'HOU',
-            'SAN DIEGO ROCKETS': 'HOU',
-            
-            'THUNDER': 'OKC',
-            'OKLAHOMA CITY THUNDER': 'OKC',
-            'SEATTLE SUPERSONICS': 'OKC',
-            'SONICS': 'OKC',
-            'SEA': 'OKC',
-            
-            'GRIZZLIES': 'MEM',
-            'MEMPHIS GRIZZLIES': 'MEM',
-            'VANCOUVER GRIZZLIES': 'MEM',
-            
-            'PELICANS': 'NOP',
-            'NEW ORLEANS PELICANS': 'NOP',
-            'NEW ORLEANS HORNETS': 'NOP',
-            'NEW ORLEANS/OKLAHOMA CITY HORNETS': 'NOP',
-            'NOK': 'NOP',
-            'NOH': 'NOP',
-            
-            'JAZZ': 'UTA',
-            'UTAH JAZZ': 'UTA',
-            'NEW ORLEANS JAZZ': 'UTA',
-            
-            'HORNETS': 'CHA',
-            'CHARLOTTE HORNETS': 'CHA',
-            'CHARLOTTE BOBCATS': 'CHA',
-            'BOBCATS': 'CHA',
-            'CHO': 'CHA',
-            
-            'NETS': 'BKN',
-            'BROOKLYN NETS': 'BKN',
-            'NEW JERSEY NETS': 'BKN',
-            'NJN': 'BKN',
-            'BRK': 'BKN',
-            
-            'WARRIORS': 'GSW',
-            'GOLDEN STATE WARRIORS': 'GSW',
-            'SAN FRANCISCO WARRIORS': 'GSW',
-            
-            'SUNS': 'PHX',
-            'PHOENIX SUNS': 'PHX',
-            'PHO': 'PHX',
-            
-            'BLAZERS': 'POR',
-            'TRAIL BLAZERS': 'POR',
-            'PORTLAND TRAIL BLAZERS': 'POR',
-            
-            'SPURS': 'SAS',
-            'SAN ANTONIO SPURS': 'SAS',
-            
-            'RAPTORS': 'TOR',
-            'TORONTO RAPTORS': 'TOR',
-            
-            'BUCKS': 'MIL',
-            'MILWAUKEE BUCKS': 'MIL',
-            
-            'TIMBERWOLVES': 'MIN',
-            'MINNESOTA TIMBERWOLVES': 'MIN',
-            
-            'NUGGETS': 'DEN',
-            'DENVER NUGGETS': 'DEN',
-            
-            'HEAT': 'MIA',
-            'MIAMI HEAT': 'MIA',
-            
-            'CAVALIERS': 'CLE',
-            'CLEVELAND CAVALIERS': 'CLE',
-            'CAVS': 'CLE',
-            
-            'CELTICS': 'BOS',
-            'BOSTON CELTICS': 'BOS',
-            
-            'PISTONS': 'DET',
-            'DETROIT PISTONS': 'DET',
-            
-            'PACERS': 'IND',
-            'INDIANA PACERS': 'IND',
-            
-            'BULLS': 'CHI',
-            'CHICAGO BULLS': 'CHI',
-            
-            'MAVERICKS': 'DAL',
-            'DALLAS MAVERICKS': 'DAL',
-            
-            'MAGIC': 'ORL',
-            'ORLANDO MAGIC': 'ORL',
-            
-            'KNICKS': 'NYK',
-            'NEW YORK KNICKS': 'NYK',
+        self.team_mappings = dict(TEAM_MAPPINGS)
+        
+        # Resolves each distinct team spelling once and caches it across datasets
+        self.team_resolver = TeamNameResolver(self.team_mappings, fuzzy=fuzzy_team_matching)
+        # Season-aware franchise, era code and conference lookup on top of the resolver
+        self.franchises = FranchiseTable(self.team_resolver)
+    
+    def pipeline(self, steps=('team_names', 'percentages', 'dates', 'numeric'), team_cols=None,
+                 date_cols=None, fill_values=None, name_col='player_name', source=None,
+                 profile=False, season_col='season'):
+        """
+        Build a CleaningPipeline from this cleaner's steps.
+        
+        Args:
+            steps: Step names, in the order they apply to each column. One of
+                   'team_names', 'percentages', 'dates', 'numeric', 'player_names'
+            team_cols: Team columns. If None, finds columns with 'team' in name
+            date_cols: Date columns. If None, finds columns with 'date' in name
+            fill_values: Optional precomputed fill value per numeric column
+            name_col: Player name column
+            source: Schema name (see src.data.schemas). If given, numeric
+                    columns come from the schema instead of name patterns
+            profile: Record peak memory per step in the pipeline report
+            season_col: Season column used to resolve team names per era
+                        when present. None resolves names without seasons
+        
+        Returns:
+            CleaningPipeline running the requested steps in a single pass per column
+        """
+        if source is not None:
+            numeric_cols = lambda columns: numeric_columns(source, columns)
+        else:
+            numeric_cols = self.numeric_candidates
+        
+        available = {
+            'team_names': lambda: TeamNameStep(self.team_resolver, team_cols, self.franchises, season_col),
+            'percentages': lambda: PercentageStep(self.percentage_columns),
+            'dates': lambda: DateStep(date_cols),
+            'numeric': lambda: NumericStep(numeric_cols, fill_values),
+            'player_names': lambda: PlayerNameStep([name_col]),
         }
+        unknown = [step for step in steps if step not in available]
+        if unknown:
+            raise ValueError(f"Unknown cleaning steps: {unknown}")
+        return CleaningPipeline([available[step]() for step in steps], profile=profile)
     
-    def standardize_team_names(self, df, team_cols=None):
+    def standardize_team_names(self, df, team_cols=None, season_col='season'):
         """
         Standardize team names to NBA three-letter codes.
         
@@ -167,118 +228,92 @@ class NBACleaner:
             df: DataFrame containing team names
             team_cols: List of columns containing team names
                       If None, finds columns with 'team' in name
+            season_col: Season column. When present, names resolve to the
+                        franchise they belonged to in that season, so
+                        'HORNETS' is CHA up to 2002 and NOP from 2003 to 2013
         
         Returns:
             DataFrame with standardized team codes
         """
-        if team_cols is None:
-            team_cols = [col for col in df.columns if 'team' in col.lower()]
-            # Also check for common team name columns
-            extra_cols = ['tm', 'Team', 'TEAM_NAME']
-            team_cols.extend([col for col in extra_cols if col in df.columns])
-        
-        df = df.copy()
-        for col in team_cols:
-            if col in df.columns and df[col].dtype == 'object':
-                # Convert to uppercase and strip whitespace
-                df[col] = df[col].str.strip().str.upper()
-                
-                # Map team names to standard three-letter codes
-                df[col] = df[col].map(lambda x: self.team_mappings.get(x, x) if pd.notnull(x) else x)
-        
-        return df
+        return self.pipeline(['team_names'], team_cols=team_cols, season_col=season_col).run(df)
     
-    def handle_numeric_columns(self, df):
-        """Convert and clean numeric columns in the dataset."""
-        # Get all columns except obvious categorical ones
+    def numeric_candidates(self, columns):
+        """Columns treated as numeric: everything except obvious categorical ones."""
         exclude_patterns = ['name', 'team', 'position', 'date', 'season', 'location']
-        numeric_candidates = [col for col in df.columns 
-                            if not any(pattern in col.lower() for pattern in exclude_patterns)]
-        
-        df = df.copy()
-        # Convert to numeric and handle missing values
-        for col in numeric_candidates:
-            try:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                if df[col].isnull().any():
-                    median_val = df[col].median()
-                    if pd.isnull(median_val):  # If median is also NaN
-                        df[col] = df[col].fillna(0)
-                    else:
-                        df[col] = df[col].fillna(median_val)
-            except Exception as e:
-                print(f"Warning: Could not convert column {col} to numeric: {str(e)}")
-                continue
+        return [col for col in columns
+                if not any(pattern in col.lower() for pattern in exclude_patterns)]
+    
+    def percentage_columns(self, columns):
+        """Columns holding percentages."""
+        return [col for col in columns if any(x in col.lower() for x in ['percentage', 'pct'])]
+    
+    def handle_numeric_columns(self, df, fill_values=None, source=None):
+        """
+        Convert and clean numeric columns in the dataset.
         
-        return df
+        Args:
+            df: DataFrame to clean
+            fill_values: Optional precomputed fill value per column. If None,
+                         missing values are filled with the column median
+            source: Optional schema name declaring which columns are numeric
+        """
+        return self.pipeline(['numeric'], fill_values=fill_values, source=source).run(df)
     
     def convert_percentages(self, df):
         """Convert percentage strings to decimal values."""
-        df = df.copy()
-        pct_cols = [col for col in df.columns if any(x in col.lower() for x in ['percentage', 'pct'])]
-        for col in pct_cols:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.rstrip('%').astype('float') / 100.0
-        return df
+        return self.pipeline(['percentages']).run(df)
     
     def handle_dates(self, df, date_cols=None):
         """Convert date strings to datetime objects."""
-        if date_cols is None:
-            date_cols = [col for col in df.columns if 'date' in col.lower()]
-        
-        df = df.copy()
-        for col in date_cols:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        return df
+        return self.pipeline(['dates'], date_cols=date_cols).run(df)
     
     def standardize_player_names(self, df, name_col='player_name'):
         """Standardize player names to consistent format."""
-        df = df.copy()
-        if name_col in df.columns:
-            df[name_col] = df[name_col].str.strip().str.upper()
-        return df
+        return self.pipeline(['player_names'], name_col=name_col).run(df)
     
-    def add_conference_mappings(self, df, name_col='team'):
-
-        eastern_conf = [
-            'ATL',  # Atlanta Hawks
-            'BOS',  # Boston Celtics
-            'BKN',  # Brooklyn Nets
-            'CHA',  # Charlotte Hornets
-            'CHI',  # Chicago Bulls
-            'CLE',  # Cleveland Cavaliers
-            'DET',  # Detroit Pistons
-            'IND',  # Indiana Pacers
-            'MIA',  # Miami Heat
-            'MIL',  # Milwaukee Bucks
-            'NYK',  # New York Knicks
-            'ORL',  # Orlando Magic
-            'PHI',  # Philadelphia 76ers
-            'TOR',  # Toronto Raptors
-            'WAS'   # Washington Wizards
-        ]
-
-        western_conf = [
-            'DAL',  # Dallas Mavericks
-            'DEN',  # Denver Nuggets
-            'GSW',  # Golden State Warriors
-            'HOU',  # Houston Rockets
-            'LAC',  # Los Angeles Clippers
-            'LAL',  # Los Angeles Lakers
-            'MEM',  # Memphis Grizzlies
-            'MIN',  # Minnesota Timberwolves
-            'NOP',  # New Orleans Pelicans
-            'OKC',  # Oklahoma City Thunder
-            'PHX',  # Phoenix Suns
-            'POR',  # Portland Trail Blazers
-            'SAC',  # Sacramento Kings
-            'SAS',  # San Antonio Spurs
-            'UTA'   # Utah Jazz
-        ]
-
-        df['conference'] = df[name_col].apply(
-            lambda x: 'EAST' if x in eastern_conf else 'WEST' if x in western_conf else 'Unknown'
-        )
+    def player_index(self, player_season, name_col='player', id_col='player_id', team_col='team',
+                     season_col='season', **kwargs):
+        """
+        Build a PlayerIdentityIndex of the players in Player Season Info.
+        
+        Other datasets (injuries, shots) can then be linked to player
+        identities with index.link(). Teams are compared by franchise per
+        season, so differently spelled team columns still block candidates.
+        
+        Args:
+            player_season: Player Season Info, raw or cleaned
+            name_col: Player name column
+            id_col: Player identifier column, or None to identify players by name
+            team_col: Team column
+            season_col: Season column
+            **kwargs: Passed to PlayerIdentityIndex, e.g. threshold or cache_path
+        """
+        if id_col is not None and id_col not in player_season.columns:
+            id_col = None
+        index = PlayerIdentityIndex(franchises=self.franchises, **kwargs)
+        return index.fit(player_season, name_col=name_col, id_col=id_col, team_col=team_col,
+                         season_col=season_col)
+    
+    def clean(self, df, team_cols=None, date_cols=None, fill_values=None, source=None,
+              season_col='season'):
+        """
+        Run the standard cleaning sequence on a dataset.
+        
+        Team names are standardized (per era when `season_col` is present),
+        percentages and dates converted, and numeric columns coerced with
+        missing values filled, all in a single pass per column. Compact
+        dtypes from the schema registry are kept.
+        """
+        return self.pipeline(team_cols=team_cols, date_cols=date_cols, fill_values=fill_values,
+                             source=source, season_col=season_col).run(df)
+    
+    def add_conference_mappings(self, df, name_col='team', season_col='season'):
+        """
+        Add each team's conference ('EAST', 'WEST' or 'Unknown') in a 'conference' column.
+        
+        Conferences follow the franchise's realignments when `season_col` is
+        present; otherwise current conferences are used.
+        """
+        seasons = df[season_col] if season_col in df.columns else None
+        df['conference'] = self.franchises.resolve(df[name_col], seasons)['conference'].to_numpy()
         return df
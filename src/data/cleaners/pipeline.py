@@ -0,0 +1,248 @@
+"""
+Declarative, single-copy cleaning pipeline for NBA data.
+
+Running the NBACleaner methods one after another copies the full frame at
+every step and rescans the column names each time. A CleaningPipeline plans
+once which step applies to which column, then runs all steps for a column
+back to back and assembles the result in a single frame construction, which
+makes the one copy that keeps the result independent of the input.
+"""
+import logging
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ColumnSpec = Union[None, Sequence[str], Callable[[Iterable[str]], List[str]]]
+
+
+def map_categories(series: pd.Series, func) -> pd.Series:
+    """
+    Apply a value-wise string transform to a categorical column through its categories.
+
+    Categories that become equal are merged, and the column stays categorical.
+    """
+    mapped = func(pd.Series(series.cat.categories))
+    new_categories = pd.Index(mapped.dropna().unique())
+    # Old category code -> new category code, with -1 for missing values
+    recode = np.append(new_categories.get_indexer(mapped), -1)
+    codes = recode[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=new_categories),
+                     index=series.index, name=series.name)
+
+
+class CleaningStep:
+    """
+    One column-wise cleaning operation.
+
+    Args:
+        columns: Columns the step applies to: an explicit list, a callable
+                 choosing columns from the frame's column names, or None
+                 for the step's default selection
+    """
+    name = 'step'
+
+    def __init__(self, columns: ColumnSpec = None):
+        self.columns = columns
+
+    def default_columns(self, columns: List[str]) -> List[str]:
+        return []
+
+    def select(self, columns: List[str]) -> List[str]:
+        """Choose the columns this step applies to."""
+        if self.columns is None:
+            selected = self.default_columns(columns)
+        elif callable(self.columns):
+            selected = self.columns(columns)
+        else:
+            selected = list(self.columns)
+        present = set(columns)
+        return [col for col in dict.fromkeys(selected) if col in present]
+
+    def prepare(self, df: pd.DataFrame) -> None:
+        """Capture frame-level context (e.g. other columns) before the step runs on df."""
+
+    def apply(self, series: pd.Series) -> pd.Series:
+        raise NotImplementedError
+
+
+class TeamNameStep(CleaningStep):
+    """
+    Standardize team names to three-letter codes with a TeamNameResolver.
+
+    With a FranchiseTable and a season column present in the frame, names
+    resolve to the franchise they belonged to in each row's season instead.
+    """
+    name = 'team_names'
+
+    def __init__(self, resolver, columns: ColumnSpec = None, franchises=None,
+                 season_col: Optional[str] = 'season'):
+        super().__init__(columns)
+        self.resolver = resolver
+        self.franchises = franchises
+        self.season_col = season_col
+        self.seasons = None
+
+    def prepare(self, df):
+        use_seasons = self.franchises is not None and self.season_col in df.columns
+        self.seasons = df[self.season_col] if use_seasons else None
+
+    def default_columns(self, columns):
+        team_cols = [col for col in columns if 'team' in col.lower()]
+        # Also check for common team name columns
+        team_cols.extend([col for col in ['tm', 'Team', 'TEAM_NAME'] if col in columns])
+        return team_cols
+
+    def apply(self, series):
+        if series.dtype == 'object' or isinstance(series.dtype, pd.CategoricalDtype):
+            if self.seasons is not None:
+                return self.franchises.franchises(series, self.seasons)
+            return self.resolver.resolve_series(series)
+        return series
+
+
+class PercentageStep(CleaningStep):
+    """Convert percentage strings to decimal values."""
+    name = 'percentages'
+
+    def apply(self, series):
+        if series.dtype == 'object':
+            return series.str.rstrip('%').astype('float') / 100.0
+        return series
+
+
+class DateStep(CleaningStep):
+    """Convert date strings to datetime values."""
+    name = 'dates'
+
+    def default_columns(self, columns):
+        return [col for col in columns if 'date' in col.lower()]
+
+    def apply(self, series):
+        return pd.to_datetime(series, errors='coerce')
+
+
+class NumericStep(CleaningStep):
+    """Coerce values to numbers and fill missing values with the median or a given value."""
+    name = 'numeric'
+
+    def __init__(self, columns: ColumnSpec = None, fill_values: Optional[Dict[str, float]] = None):
+        super().__init__(columns)
+        self.fill_values = fill_values
+        self.logger = logging.getLogger(__name__)
+
+    def apply(self, series):
+        # Declared categorical, boolean and date columns are never numeric
+        if (isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series)
+                or pd.api.types.is_datetime64_any_dtype(series)):
+            return series
+        try:
+            series = pd.to_numeric(series, errors='coerce')
+            if series.isnull().any():
+                # Columns without a given fill value use their own median
+                if self.fill_values is not None and series.name in self.fill_values:
+                    median_val = self.fill_values[series.name]
+                else:
+                    median_val = series.median()
+                # If the median is also NaN, fall back to zero
+                series = series.fillna(0 if pd.isnull(median_val) else median_val)
+        except Exception as e:
+            self.logger.warning(f"Could not convert column {series.name} to numeric: {str(e)}")
+        return series
+
+
+class PlayerNameStep(CleaningStep):
+    """Standardize player names to stripped upper case."""
+    name = 'player_names'
+
+    def apply(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return map_categories(series, lambda names: names.str.strip().str.upper())
+        return series.str.strip().str.upper()
+
+
+class CleaningPipeline:
+    """
+    Run several cleaning steps in one pass per column.
+
+    Steps apply to each column in the order they are listed, so the result is
+    the same as calling the equivalent NBACleaner methods in sequence. After
+    run(), `report` holds the time and peak traced memory of every step.
+    """
+
+    def __init__(self, steps: List[CleaningStep], profile: bool = False):
+        """
+        Initialize the pipeline.
+
+        Args:
+            steps: Cleaning steps, in the order they apply to each column
+            profile: Track peak memory per step with tracemalloc. Timing is
+                     always recorded; memory tracing slows cleaning down
+        """
+        self.steps = steps
+        self.profile = profile
+        self.report: List[Dict] = []
+
+    def plan(self, columns: Iterable[str]) -> Dict[str, List[CleaningStep]]:
+        """Map every column that needs cleaning to the steps that apply to it, in order."""
+        columns = list(columns)
+        plan: Dict[str, List[CleaningStep]] = {}
+        for step in self.steps:
+            for col in step.select(columns):
+                plan.setdefault(col, []).append(step)
+        return plan
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean a DataFrame.
+
+        The input frame is never modified, and the result shares no memory
+        with it, so changing one never changes the other.
+        """
+        plan = self.plan(df.columns)
+        for step in self.steps:
+            step.prepare(df)
+        seconds = {step.name: 0.0 for step in self.steps}
+        peaks = {step.name: 0 for step in self.steps}
+        columns = {step.name: 0 for step in self.steps}
+
+        tracing = self.profile and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        try:
+            cleaned = {}
+            for col in df.columns:
+                series = df[col]
+                for step in plan.get(col, []):
+                    if self.profile:
+                        baseline = tracemalloc.get_traced_memory()[0]
+                        tracemalloc.reset_peak()
+                    start = time.perf_counter()
+
+                    series = step.apply(series)
+
+                    seconds[step.name] += time.perf_counter() - start
+                    columns[step.name] += 1
+                    if self.profile:
+                        peak = tracemalloc.get_traced_memory()[1] - baseline
+                        peaks[step.name] = max(peaks[step.name], peak)
+                cleaned[col] = series
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+        self.report = [
+            {
+                'step': step.name,
+                'columns': columns[step.name],
+                'seconds': seconds[step.name],
+                'peak_bytes': peaks[step.name] if self.profile else None
+            }
+            for step in self.steps
+        ]
+
+        # Copy, so columns a step passed through unchanged do not share the input's buffers
+        return pd.DataFrame(cleaned, index=df.index, columns=df.columns, copy=True)
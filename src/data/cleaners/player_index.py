@@ -0,0 +1,338 @@
+"""
+Player identity matching across datasets.
+
+Player Season Info, the injury transactions and the shot data spell player
+names differently: accents ('Nikola Jokić'), suffixes ('Gary Payton II'),
+initials ('C.J. McCollum', 'K. Durant') and injury-report decorations
+('• Kevin Durant (DTD)'). standardize_player_names only strips and
+upper-cases, so joins on the name miss these rows, and comparing every query
+name with every known player is quadratic in tens of thousands of names.
+
+PlayerIdentityIndex is built once from a reference table of known players
+and resolves other spellings to their identity in three stages:
+
+1. Normalization: accents, punctuation, suffixes and decorations removed.
+   Equal normalized names match exactly.
+2. Blocking: only players sharing the Soundex key of the last name and the
+   first initial are candidates, falling back to players sharing last-name
+   trigrams when no one in that block is close enough. When both sides
+   carry team-seasons, candidates must also have played for one of the
+   query's team-seasons.
+3. Scoring: the remaining candidates are scored with the Levenshtein ratio,
+   and the best one at or above the threshold wins.
+
+Resolved spellings are cached, optionally on disk, so repeated runs skip
+matching entirely. Only matches that do not depend on the query's
+team-seasons are cached. `stats` reports throughput and how many candidate pairs
+were scored against the all-pairs count.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import Levenshtein
+except ImportError:  # Checked when an index is created
+    Levenshtein = None
+
+# Version of the on-disk cache layout; caches of other versions are ignored
+CACHE_FORMAT = 2
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6'
+}
+
+
+def normalize_name(name) -> Optional[str]:
+    """
+    Comparable form of a player name: lower-case ASCII words without
+    punctuation, suffixes or injury-report decorations.
+
+    'Nikola Jokić' -> 'nikola jokic', 'C.J. McCollum' -> 'cj mccollum',
+    '• Gary Payton II (DTD)' -> 'gary payton'
+    """
+    if not isinstance(name, str):
+        return None
+    # Injury notes list alternate names after a slash and statuses in parentheses
+    name = re.sub(r'\(.*?\)', ' ', name.split('/')[0])
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    name = re.sub(r"[.'`’]", '', name)
+    tokens = re.sub(r'[^a-z0-9]+', ' ', name).split()
+    while len(tokens) > 2 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens) or None
+
+
+def soundex(word: str) -> str:
+    """Four-character Soundex code of a word."""
+    if not word:
+        return ''
+    digits = [SOUNDEX_CODES.get(c, '') for c in word]
+    code, previous = word[0], digits[0]
+    for c, digit in zip(word[1:], digits[1:]):
+        if digit and digit != previous:
+            code += digit
+        # 'h' and 'w' do not separate letters with the same code
+        if c not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def block_key(normalized: str) -> str:
+    """Blocking key of a normalized name: Soundex of the last name and first initial."""
+    tokens = normalized.split()
+    return f"{soundex(tokens[-1])}:{tokens[0][0]}"
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _initial_form(normalized: str) -> str:
+    """'kevin durant' -> 'k durant', for comparing with abbreviated first names."""
+    tokens = normalized.split()
+    return ' '.join([tokens[0][0]] + tokens[1:])
+
+
+class PlayerIdentityIndex:
+    """Blocked fuzzy matching of player spellings to known player identities."""
+
+    def __init__(self, threshold: float = 0.88, min_shared_trigrams: int = 3,
+                 cache_path: Optional[str] = None, franchises=None):
+        """
+        Initialize an empty index; call fit() with the reference players.
+
+        Args:
+            threshold: Minimum Levenshtein ratio of a fuzzy match
+            min_shared_trigrams: Last-name trigrams a fallback candidate must
+                                 share with the query
+            cache_path: JSON file keeping resolved spellings across runs
+            franchises: Optional FranchiseTable, so team-seasons from datasets
+                        that spell teams differently can be compared
+        """
+        if Levenshtein is None:
+            raise ImportError("Player matching requires the Levenshtein package")
+        self.threshold = threshold
+        self.min_shared_trigrams = min_shared_trigrams
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.franchises = franchises
+
+        self.names: Dict = {}
+        self.normalized: Dict = {}
+        self.team_seasons: Dict[object, Set[Tuple]] = defaultdict(set)
+        self._exact: Dict[str, List] = defaultdict(list)
+        self._blocks: Dict[str, List] = defaultdict(list)
+        self._trigrams: Dict[str, List] = defaultdict(list)
+        self.fingerprint: Optional[str] = None
+        self._cache: Dict[str, object] = {}
+        self.stats = {'names': 0, 'cache_hits': 0, 'exact': 0, 'fuzzy': 0, 'unmatched': 0,
+                      'candidate_pairs': 0, 'all_pairs': 0, 'seconds': 0.0, 'names_per_second': 0.0}
+        self.logger = logging.getLogger(__name__)
+
+    def _team_season_pairs(self, df: pd.DataFrame, team_col: Optional[str],
+                           season_col: Optional[str]) -> Optional[pd.DataFrame]:
+        if team_col is None or season_col is None or team_col not in df or season_col not in df:
+            return None
+        teams = df[team_col]
+        if self.franchises is not None:
+            teams = self.franchises.franchises(teams, df[season_col])
+        return pd.DataFrame({'team': np.asarray(teams, dtype=object),
+                             'season': pd.to_numeric(df[season_col], errors='coerce').to_numpy()})
+
+    def fit(self, reference: pd.DataFrame, name_col: str = 'player', id_col: Optional[str] = None,
+            team_col: Optional[str] = 'team', season_col: Optional[str] = 'season') -> 'PlayerIdentityIndex':
+        """
+        Build the index from a table of known players, e.g. Player Season Info.
+
+        Args:
+            reference: One row per player (or player-season)
+            name_col: Player name column
+            id_col: Player identifier column. If None, identities are names
+            team_col: Team column, for team-season blocking. Optional
+            season_col: Season column, for team-season blocking. Optional
+        """
+        self.names, self.normalized = {}, {}
+        for table in (self.team_seasons, self._exact, self._blocks, self._trigrams):
+            table.clear()
+
+        names = reference[name_col]
+        ids = reference[id_col] if id_col is not None else names
+        rows = pd.DataFrame({'id': ids.to_numpy(), 'name': names.to_numpy()})
+        pairs = self._team_season_pairs(reference, team_col, season_col)
+        if pairs is not None:
+            rows = pd.concat([rows, pairs], axis=1)
+            for (player, team, season) in rows[['id', 'team', 'season']].drop_duplicates().itertuples(index=False):
+                self.team_seasons[player].add((team, season))
+
+        # Per distinct identity, in Python; rows never are
+        for player, name in rows[['id', 'name']].drop_duplicates('id').itertuples(index=False):
+            normalized = normalize_name(name)
+            if normalized is None:
+                continue
+            self.names[player] = name
+            self.normalized[player] = normalized
+            self._exact[normalized].append(player)
+            self._blocks[block_key(normalized)].append(player)
+            for gram in _trigrams(normalized.split()[-1]):
+                self._trigrams[gram].append(player)
+
+        digest = hashlib.sha256(json.dumps(sorted((str(k), v) for k, v in self.normalized.items())).encode())
+        self.fingerprint = digest.hexdigest()
+        self._load_cache()
+        return self
+
+    def _load_cache(self) -> None:
+        self._cache = {}
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        with open(self.cache_path) as f:
+            cached = json.load(f)
+        # Matches only hold for the reference they were made against, and caches
+        # without a format version may hold matches that depended on team-seasons
+        if cached.get('fingerprint') == self.fingerprint and cached.get('format') == CACHE_FORMAT:
+            self._cache = {raw: player for raw, player in cached['matches']}
+
+    def save_cache(self) -> None:
+        """Write the resolved spellings to `cache_path`, atomically."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': CACHE_FORMAT, 'fingerprint': self.fingerprint, 'matches': sorted(self._cache.items(), key=str)}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _overlapping(self, candidates, team_seasons: Optional[Set[Tuple]]) -> List:
+        """Candidates that played for one of the query's team-seasons, or have none recorded."""
+        if not team_seasons:
+            return list(candidates)
+        return [player for player in candidates
+                if not self.team_seasons.get(player) or self.team_seasons[player] & team_seasons]
+
+    def _trigram_candidates(self, normalized: str) -> List:
+        shared = Counter(player for gram in _trigrams(normalized.split()[-1])
+                         for player in self._trigrams.get(gram, ()))
+        return [player for player, count in shared.items() if count >= self.min_shared_trigrams]
+
+    def _best(self, normalized: str, candidates: List) -> List:
+        """Candidates with the highest Levenshtein ratio, if it reaches the threshold."""
+        self.stats['candidate_pairs'] += len(candidates)
+        abbreviated = len(normalized.split()[0]) == 1
+        best, best_score = [], self.threshold
+        for player in candidates:
+            known = self.normalized[player]
+            score = Levenshtein.ratio(normalized, _initial_form(known) if abbreviated else known)
+            if score > best_score:
+                best, best_score = [player], score
+            elif score == best_score:
+                best.append(player)
+        return best
+
+    def _resolve(self, normalized: str, team_seasons: Optional[Set[Tuple]]) -> Tuple[List, str]:
+        """Best matching identities of one normalized spelling, and how they matched."""
+        exact = self._exact.get(normalized)
+        if exact:
+            return exact, 'exact'
+
+        # Phonetic block first; a typo in the last name's first letters changes
+        # its Soundex key, so fall back to players sharing last-name trigrams
+        block = self._blocks.get(block_key(normalized), [])
+        best = self._best(normalized, self._overlapping(block, team_seasons))
+        if not best:
+            scored = set(block)
+            fallback = [player for player in self._trigram_candidates(normalized) if player not in scored]
+            best = self._best(normalized, self._overlapping(fallback, team_seasons))
+        return best, 'fuzzy' if best else 'unmatched'
+
+    def match(self, names: pd.Series, teams: Optional[pd.Series] = None,
+              seasons: Optional[pd.Series] = None) -> pd.Series:
+        """
+        Identity of every row's player, or missing where nothing matches.
+
+        Each distinct spelling is resolved once. When a spelling matches
+        several identities equally well (e.g. two players with the same
+        name), each row takes the one that played for its team-season.
+
+        Args:
+            names: Player names in any spelling
+            teams: Team of every row, enabling team-season blocking
+            seasons: Season of every row, enabling team-season blocking
+        """
+        start = time.perf_counter()
+        frame = pd.DataFrame({'name': names.to_numpy()}, index=names.index)
+        pairs = None
+        if teams is not None and seasons is not None:
+            pairs = self._team_season_pairs(
+                pd.DataFrame({'team': teams.to_numpy(), 'season': seasons.to_numpy()}), 'team', 'season')
+            frame['team'] = pairs['team'].to_numpy()
+            frame['season'] = pairs['season'].to_numpy()
+
+        codes, uniques = pd.factorize(frame['name'], use_na_sentinel=True)
+        query_seasons: Dict[int, Set[Tuple]] = defaultdict(set)
+        if pairs is not None:
+            distinct = pd.DataFrame({'code': codes, 'team': frame['team'], 'season': frame['season']})
+            for code, team, season in distinct.drop_duplicates().itertuples(index=False):
+                query_seasons[code].add((team, season))
+
+        resolved = np.full(len(uniques) + 1, None, dtype=object)
+        ambiguous: Dict[int, List] = {}
+        for code, raw in enumerate(uniques):
+            if raw in self._cache:
+                resolved[code] = self._cache[raw]
+                self.stats['cache_hits'] += 1
+                continue
+            normalized = normalize_name(raw)
+            team_seasons = query_seasons.get(code)
+            players, kind = self._resolve(normalized, team_seasons) if normalized else ([], 'unmatched')
+            self.stats[kind] += 1
+            if len(players) == 1:
+                resolved[code] = players[0]
+                # A fuzzy match narrowed down by this query's team-seasons may not hold
+                # for another query's, so only cache it if it is the match without them
+                if kind == 'exact' or not team_seasons or self._resolve(normalized, None)[0] == players:
+                    self._cache[raw] = players[0]
+            elif players:
+                # Depends on each row's team-season, so never cached
+                ambiguous[code] = players
+
+        result = resolved[codes]
+        if ambiguous and pairs is not None:
+            for code, players in ambiguous.items():
+                rows = np.flatnonzero(codes == code)
+                for row in rows:
+                    key = (frame['team'].iat[row], frame['season'].iat[row])
+                    matches = [player for player in players if key in self.team_seasons.get(player, ())]
+                    result[row] = matches[0] if len(matches) == 1 else None
+
+        seconds = time.perf_counter() - start
+        self.stats['names'] += len(uniques)
+        self.stats['all_pairs'] += len(uniques) * len(self.names)
+        self.stats['seconds'] += seconds
+        self.stats['names_per_second'] = self.stats['names'] / max(self.stats['seconds'], 1e-12)
+        self.logger.info(f"Matched {len(uniques)} distinct names in {seconds:.2f}s, "
+                         f"{self.stats['candidate_pairs']} candidate pairs scored so far")
+        return pd.Series(result, index=names.index, name=names.name, dtype=object)
+
+    def link(self, df: pd.DataFrame, name_col: str, team_col: Optional[str] = None,
+             season_col: Optional[str] = None, output_col: str = 'player_key') -> pd.DataFrame:
+        """Add the matched identity of every row as `output_col`, for joining datasets on it."""
+        teams = df[team_col] if team_col is not None else None
+        seasons = df[season_col] if season_col is not None else None
+        df = df.copy()
+        df[output_col] = self.match(df[name_col], teams, seasons)
+        return df
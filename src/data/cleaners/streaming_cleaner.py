@@ -0,0 +1,182 @@
+"""
+Streaming cleaner for raw NBA files too large to clean in memory.
+
+The shot-level dataset does not fit comfortably in memory once the whole-frame
+cleaning methods have copied it several times. StreamingCleaner applies the
+same cleaning sequence as NBACleaner.clean() to bounded-size chunks and writes
+cleaned output as it goes, so peak memory depends on the chunk size rather
+than the file size.
+
+Median imputation needs a global statistic, so cleaning takes two passes:
+
+1. Scan every chunk and build a value-count sketch of each numeric column,
+   with values rounded to `median_decimals` decimal places.
+2. Clean every chunk, filling missing values with the medians from pass 1.
+
+Medians are exact for columns recorded with at most `median_decimals`
+decimals (all per-game, percentage and shot columns at the default of 6),
+and otherwise within 0.5 * 10**-median_decimals of the in-memory median.
+Sketch memory grows with the number of distinct values, not rows.
+"""
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .nba_data_cleaner import NBACleaner
+
+
+class StreamingCleaner:
+    """Clean large CSV files chunk by chunk with NBACleaner semantics."""
+
+    def __init__(self, cleaner: Optional[NBACleaner] = None, chunksize: int = 250_000,
+                 median_decimals: int = 6):
+        """
+        Initialize the streaming cleaner.
+
+        Args:
+            cleaner: NBACleaner providing the cleaning steps. If None, a new one is created
+            chunksize: Number of rows read per chunk
+            median_decimals: Decimal places kept in the median sketch
+        """
+        self.cleaner = cleaner or NBACleaner()
+        self.chunksize = chunksize
+        self.median_decimals = median_decimals
+        self.logger = logging.getLogger(__name__)
+
+    def _read_chunks(self, path, **read_csv_kwargs):
+        return pd.read_csv(path, chunksize=self.chunksize, **read_csv_kwargs)
+
+    def scan(self, path, **read_csv_kwargs) -> Dict:
+        """
+        First pass: gather the global statistics the cleaning steps need.
+
+        Returns:
+            Dict with 'medians' (fill value per numeric column), 'text_percentages'
+            (percentage columns stored as text somewhere in the file),
+            'integer_columns' (numeric columns that stay integer) and 'rows'
+        """
+        sketches: Dict[str, pd.Series] = {}
+        text_percentages = set()
+        not_integer = set()
+        rows = 0
+
+        for chunk in self._read_chunks(path, **read_csv_kwargs):
+            rows += len(chunk)
+            pct_cols = set(self.cleaner.percentage_columns(chunk.columns))
+
+            for col in self.cleaner.numeric_candidates(chunk.columns):
+                values = chunk[col]
+                if col in pct_cols and values.dtype == 'object':
+                    # Sketch on the raw scale; the /100 is applied once at the end
+                    text_percentages.add(col)
+                    values = values.str.rstrip('%')
+
+                values = pd.to_numeric(values, errors='coerce')
+                if not pd.api.types.is_integer_dtype(values) or col in text_percentages:
+                    not_integer.add(col)
+
+                counts = values.dropna().round(self.median_decimals).value_counts()
+                sketches[col] = counts if col not in sketches else sketches[col].add(counts, fill_value=0)
+
+        medians = {}
+        for col, counts in sketches.items():
+            median = self._sketch_median(counts)
+            if col in text_percentages and not pd.isnull(median):
+                median = median / 100.0
+            medians[col] = median
+
+        return {
+            'medians': medians,
+            'text_percentages': sorted(text_percentages),
+            'integer_columns': sorted(set(sketches) - not_integer),
+            'rows': rows
+        }
+
+    @staticmethod
+    def _sketch_median(counts: pd.Series) -> float:
+        """Median of the values described by a value -> count sketch."""
+        if counts.empty:
+            return np.nan
+
+        counts = counts.sort_index()
+        cumulative = counts.to_numpy().cumsum()
+        total = cumulative[-1]
+        values = counts.index.to_numpy(dtype=np.float64)
+
+        # Positions of the middle value(s) in the sorted data, 1-based
+        lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+        upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+        return (lower + upper) / 2.0
+
+    def _conform(self, chunk: pd.DataFrame, integer_columns: List[str]) -> pd.DataFrame:
+        """Give numeric columns the dtype the in-memory path would produce."""
+        for col in self.cleaner.numeric_candidates(chunk.columns):
+            if pd.api.types.is_integer_dtype(chunk[col]) and col not in integer_columns:
+                chunk[col] = chunk[col].astype('float64')
+        return chunk
+
+    def clean_file(self, input_path, output_path, team_cols: Optional[List[str]] = None,
+                   date_cols: Optional[List[str]] = None, **read_csv_kwargs) -> Dict:
+        """
+        Clean a CSV file in chunks and write the result incrementally.
+
+        Args:
+            input_path: Raw CSV file
+            output_path: Cleaned output; written as Parquet if the suffix is
+                         .parquet, otherwise as CSV
+            team_cols: Team columns, as in NBACleaner.standardize_team_names
+            date_cols: Date columns, as in NBACleaner.handle_dates
+            **read_csv_kwargs: Passed through to pandas.read_csv
+
+        Returns:
+            Dict with the output path, rows and chunks written, and the medians used
+        """
+        stats = self.scan(input_path, **read_csv_kwargs)
+        self.logger.info(f"Scanned {stats['rows']:,} rows of {input_path}")
+
+        # Read text percentages as text in every chunk, as a whole-file read would
+        dtypes = dict(read_csv_kwargs.pop('dtype', None) or {})
+        dtypes.update({col: 'object' for col in stats['text_percentages']})
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        as_parquet = output_path.suffix == '.parquet'
+        writer = None
+        chunks = 0
+
+        try:
+            for chunk in self._read_chunks(input_path, dtype=dtypes, **read_csv_kwargs):
+                cleaned = self.cleaner.clean(chunk, team_cols=team_cols, date_cols=date_cols,
+                                             fill_values=stats['medians'])
+                cleaned = self._conform(cleaned, stats['integer_columns'])
+
+                if as_parquet:
+                    table = pa.Table.from_pandas(cleaned, preserve_index=False)
+                    if writer is None:
+                        # All-missing text columns in the first chunk would otherwise be typed null
+                        schema = pa.schema([
+                            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                            for field in table.schema
+                        ])
+                        writer = pq.ParquetWriter(output_path, schema)
+                    writer.write_table(table.cast(writer.schema))
+                else:
+                    cleaned.to_csv(output_path, mode='w' if chunks == 0 else 'a',
+                                   header=chunks == 0, index=False)
+                chunks += 1
+        finally:
+            if writer is not None:
+                writer.close()
+
+        self.logger.info(f"Wrote {stats['rows']:,} cleaned rows in {chunks} chunks to {output_path}")
+        return {
+            'path': str(output_path),
+            'rows': stats['rows'],
+            'chunks': chunks,
+            'medians': stats['medians']
+        }
@@ -0,0 +1,115 @@
+"""
+Team name resolution for NBA data cleaning.
+
+Team columns hold a few dozen distinct spellings spread over millions of rows.
+TeamNameResolver resolves each distinct spelling once, through factorized
+(categorical) codes, and broadcasts the result back to every row. Resolved
+and unresolved spellings are remembered across calls, so later datasets only
+pay for spellings they introduce.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import map_categories
+
+try:
+    import Levenshtein
+except ImportError:  # Fuzzy matching is optional
+    Levenshtein = None
+
+
+class TeamNameResolver:
+    """
+    Resolve raw team spellings to NBA three-letter codes.
+
+    A spelling is normalized (stripped and upper-cased) and looked up in the
+    mapping table. Spellings that are already standard codes resolve to
+    themselves. Anything else is left as the normalized spelling, unless fuzzy
+    matching is enabled and finds a close enough mapping key.
+    """
+
+    def __init__(self, mappings: Dict[str, str], fuzzy: bool = False,
+                 fuzzy_threshold: float = 0.9, fuzzy_min_length: int = 5):
+        """
+        Initialize the resolver.
+
+        Args:
+            mappings: Mapping of upper-case team names to three-letter codes
+            fuzzy: Whether to fall back to Levenshtein matching for unknown spellings
+            fuzzy_threshold: Minimum Levenshtein ratio for a fuzzy match
+            fuzzy_min_length: Shorter spellings are never fuzzy matched, since
+                              abbreviations are too close to each other
+        """
+        if fuzzy and Levenshtein is None:
+            raise ImportError("Fuzzy team matching requires the Levenshtein package")
+
+        self.mappings = mappings
+        self.codes = set(mappings.values())
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_min_length = fuzzy_min_length
+
+        # Raw spelling -> resolved value, shared across every call
+        self._cache: Dict[str, object] = {}
+        self.unresolved = set()
+        self.fuzzy_matches: Dict[str, str] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _fuzzy_lookup(self, name: str) -> Optional[str]:
+        """Find the closest mapping key for a spelling, if any is close enough."""
+        best_key, best_score = None, self.fuzzy_threshold
+        for key in self.mappings:
+            score = Levenshtein.ratio(name, key)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self.mappings[best_key] if best_key is not None else None
+
+    def _resolve_one(self, raw):
+        if not isinstance(raw, str):
+            # Matches .str accessor semantics: non-strings become missing
+            return np.nan
+
+        name = raw.strip().upper()
+        if name in self.mappings:
+            return self.mappings[name]
+        if name in self.codes:
+            return name
+
+        if self.fuzzy and len(name) >= self.fuzzy_min_length:
+            match = self._fuzzy_lookup(name)
+            if match is not None:
+                self.fuzzy_matches[name] = match
+                self.logger.info(f"Fuzzy matched team '{name}' to {match}")
+                return match
+
+        self.unresolved.add(name)
+        return name
+
+    def resolve_values(self, values: Iterable) -> Dict[object, object]:
+        """Resolve distinct raw spellings, consulting and filling the cache."""
+        resolved = {}
+        for raw in values:
+            if raw not in self._cache:
+                self._cache[raw] = self._resolve_one(raw)
+            resolved[raw] = self._cache[raw]
+        return resolved
+
+    def resolve_series(self, series: pd.Series) -> pd.Series:
+        """
+        Resolve every value of a team column.
+
+        Object columns come back as object columns; categorical columns stay
+        categorical, with the categories replaced by resolved codes.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            lookup = self.resolve_values(series.cat.categories)
+            return map_categories(series, lambda names: names.map(lookup))
+
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        lookup = self.resolve_values(uniques)
+        # Append a missing-value slot so the -1 sentinel maps to NaN
+        resolved = np.array([lookup[u] for u in uniques] + [np.nan], dtype=object)
+        return pd.Series(resolved[codes], index=series.index, name=series.name, dtype=object)
@@ -3,66 +3,189 @@ KaggleCollector class for downloading NBA datasets from Kaggle.
 """
 
 import os
+import json
+import time
+import uuid
+import shutil
 import logging
-from typing import Dict
-from kaggle.api.kaggle_api_extended import KaggleApi
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from ..raw_store import RawDataStore
 
 class KaggleCollector:
     """
     A class to manage the download of datasets from Kaggle.
     """
 
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, api=None, store: Optional[RawDataStore] = None):
         """
         Initialize the KaggleCollector with the target directory for downloads.
 
         Args:
             base_dir (str): Base directory where downloaded datasets will be stored
+            api: Object implementing the KaggleApi methods used here
+                 (dataset_download_files, dataset_list_files). If None, an
+                 authenticated KaggleApi is created
+            store (RawDataStore): Manifest of downloaded content. If None, a
+                 store rooted at base_dir is used
         """
         self.base_dir = base_dir
-        self.api = KaggleApi()
-        self.api.authenticate()
-        
+        self.store = store or RawDataStore(base_dir)
+        if api is None:
+            # Importing kaggle authenticates immediately, so only do it when needed
+            from kaggle.api.kaggle_api_extended import KaggleApi
+            api = KaggleApi()
+            api.authenticate()
+        self.api = api
+
         # Set up logging
         self.logger = logging.getLogger(__name__)
 
-    def download_dataset(self, dataset_name: str, dataset_path: str) -> Dict:
+    def download_dataset(self, dataset_name: str, dataset_path: str, force: bool = False) -> Dict:
         """
         Download a specific dataset from Kaggle.
 
+        The download is skipped if the manifest shows the local copy matches
+        the remote version, as in download_many().
+
         Args:
             dataset_name (str): Name to use for the dataset directory
             dataset_path (str): Kaggle path to the dataset (e.g., 'username/dataset-name')
+            force (bool): Download even if the local copy is up to date
+
+        Returns:
+            Dict: Result of the download operation including status ('success',
+            'skipped' or 'failed') and any error message
+        """
+        return self._fetch(dataset_name, dataset_path, retries=0, backoff=0.0, force=force)
+
+    def _download(self, dataset_path: str) -> Tuple[str, int]:
+        """
+        Download and unzip a dataset into its directory under base_dir.
+
+        The files are unzipped into a temporary directory that then replaces
+        the dataset directory, so files dropped from the dataset do not linger.
 
         Returns:
-            Dict: Result of the download operation including status and any error message
+            Tuple of (dataset directory, bytes of the downloaded files)
         """
+        dataset_dir = os.path.join(self.base_dir, dataset_path)
+        parent, name = os.path.split(dataset_dir)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = os.path.join(parent, f".{name}.{uuid.uuid4().hex}.tmp")
+        os.makedirs(tmp_dir)
+
         try:
-            self.logger.info(f"Downloading dataset: {dataset_name}")
-            
-            # Create the base directory and dataset subdirectory
-            dataset_dir = os.path.join(self.base_dir, dataset_path)
-            os.makedirs(dataset_dir, exist_ok=True)
-            
             # Download the dataset
             self.api.dataset_download_files(
                 dataset_path,
-                path=dataset_dir,
+                path=tmp_dir,
                 unzip=True
             )
-            
-            self.logger.info(f"Successfully downloaded {dataset_name}")
-            return {
-                'status': 'success',
-                'error': None,
-                'path': dataset_dir
-            }
-            
-        except Exception as e:
-            error_msg = f"Error downloading {dataset_name}: {str(e)}"
-            self.logger.error(error_msg)
-            return {
-                'status': 'failed',
-                'error': error_msg,
-                'path': None
+            size = sum(
+                os.path.getsize(os.path.join(root, file))
+                for root, _, files in os.walk(tmp_dir) for file in files
+            )
+
+            # Swap the fresh copy into place
+            old_dir = None
+            if os.path.exists(dataset_dir):
+                old_dir = os.path.join(parent, f".{name}.{uuid.uuid4().hex}.old")
+                os.rename(dataset_dir, old_dir)
+            os.rename(tmp_dir, dataset_dir)
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return dataset_dir, size
+
+    def remote_version(self, dataset_path: str) -> str:
+        """
+        Get a version signature for the current remote copy of a dataset.
+
+        The signature is built from the name, size and creation date of every
+        file Kaggle lists for the dataset, so it changes whenever any file does.
+        """
+        listing = self.api.dataset_list_files(dataset_path)
+        files = sorted(
+            (str(getattr(f, 'name', '')), str(getattr(f, 'totalBytes', '')),
+             str(getattr(f, 'creationDate', '')))
+            for f in getattr(listing, 'files', None) or []
+        )
+        return json.dumps(files)
+
+    def local_version(self, dataset_path: str) -> Optional[str]:
+        """Get the version signature recorded for the local copy, if it is still intact."""
+        if not self.store.is_intact(dataset_path):
+            return None
+        return self.store.version(dataset_path)
+
+    def _fetch(self, dataset_name: str, dataset_path: str, retries: int,
+               backoff: float, force: bool) -> Dict:
+        """Download one dataset with retries, skipping it if the local copy is current."""
+        start = time.perf_counter()
+        result = {
+            'status': 'failed',
+            'error': None,
+            'path': None,
+            'attempts': 0,
+            'seconds': 0.0,
+            'bytes': 0
+        }
+
+        for attempt in range(retries + 1):
+            result['attempts'] = attempt + 1
+            try:
+                version = self.remote_version(dataset_path)
+                if not force and version == self.local_version(dataset_path):
+                    self.logger.info(f"{dataset_name} is up to date, skipping download")
+                    result['status'] = 'skipped'
+                    result['path'] = os.path.join(self.base_dir, dataset_path)
+                    break
+
+                self.logger.info(f"Downloading dataset: {dataset_name} (attempt {attempt + 1})")
+                result['path'], result['bytes'] = self._download(dataset_path)
+                # Only mark the copy current once the download has fully succeeded
+                self.store.record(dataset_path, source='kaggle', version=version)
+                result['status'] = 'success'
+                result['error'] = None
+                break
+
+            except Exception as e:
+                result['error'] = f"Error downloading {dataset_name}: {str(e)}"
+                self.logger.warning(result['error'])
+                if attempt < retries:
+                    time.sleep(backoff * 2 ** attempt)
+
+        if result['status'] == 'failed':
+            self.logger.error(result['error'])
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    def download_many(self, datasets: Dict[str, str], max_workers: int = 3, retries: int = 3,
+                      backoff: float = 2.0, force: bool = False) -> Dict[str, Dict]:
+        """
+        Download several datasets concurrently.
+
+        Datasets whose local copy matches the remote version are skipped, so a
+        failed run can simply be repeated and will resume with the datasets
+        that are still missing or stale.
+
+        Args:
+            datasets (Dict[str, str]): Dataset name -> Kaggle path
+            max_workers (int): Maximum number of concurrent downloads
+            retries (int): Retries per dataset after the first attempt fails
+            backoff (float): Initial retry delay in seconds, doubled on each retry
+            force (bool): Download even if the local copy is up to date
+
+        Returns:
+            Dict[str, Dict]: Per-dataset result with status ('success', 'skipped'
+            or 'failed'), error, path, attempts, seconds and bytes downloaded
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: executor.submit(self._fetch, name, path, retries, backoff, force)
+                for name, path in datasets.items()
             }
+            return {name: future.result() for name, future in futures.items()}
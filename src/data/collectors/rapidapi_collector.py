@@ -0,0 +1,258 @@
+"""
+RapidAPICollector class for collecting NBA games and standings from API-NBA on RapidAPI.
+
+Games are served one date per request, so a few seasons mean thousands of
+requests. The collector issues them concurrently from one asyncio event loop:
+
+- one httpx.AsyncClient, so every request reuses the same connection pool
+- a semaphore bounding the requests in flight
+- a token bucket keeping the request rate under the plan's limit
+- retries with exponential backoff on connection errors, 429 and 5xx,
+  honoring Retry-After
+
+Every response is written as soon as it arrives, atomically, to a
+season-partitioned raw file:
+
+    <base_dir>/games/season=2024/2024-01-15.json
+    <base_dir>/standings/season=2024.json
+
+Seasons are the year a season ends. Responses whose `errors` field is not
+empty are reported as failed and not written. Files already on disk are
+skipped, so an interrupted collection resumes where it stopped. The base URL
+is configurable, so the collector can run against a local stub server.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ..raw_store import RawDataStore
+
+DEFAULT_BASE_URL = 'https://api-nba-v1.p.rapidapi.com'
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def season_of(day: date) -> int:
+    """Season a date belongs to, as the year the season ends (seasons start in the autumn)."""
+    return day.year + 1 if day.month >= 8 else day.year
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RapidAPICollector:
+    """
+    A class to collect game and standings data from API-NBA concurrently.
+    """
+
+    def __init__(self, base_dir: str = 'data/raw/rapidapi', api_key: Optional[str] = None,
+                 base_url: str = DEFAULT_BASE_URL, host: Optional[str] = None,
+                 max_concurrency: int = 8, rate: float = 10.0, burst: Optional[float] = None,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 30.0,
+                 store: Optional[RawDataStore] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the RapidAPICollector.
+
+        Args:
+            base_dir (str): Directory holding the games and standings directories
+            api_key (str): RapidAPI key. Defaults to the RAPIDAPI_KEY environment variable
+            base_url (str): API root, e.g. a local stub server's URL in tests
+            host (str): X-RapidAPI-Host header. Defaults to the host of base_url
+            max_concurrency (int): Requests in flight at once; also the connection pool size
+            rate (float): Requests per second allowed by the token bucket
+            burst (float): Token bucket capacity. Defaults to one second of requests
+            retries (int): Retries per request after the first attempt fails
+            backoff (float): Initial retry delay in seconds, doubled on each retry
+            timeout (float): Request timeout in seconds
+            store (RawDataStore): Manifest of collected content. If None, a
+                 store rooted at base_dir is used
+            transport: Optional httpx transport, e.g. httpx.MockTransport in tests
+        """
+        self.base_dir = Path(base_dir)
+        self.api_key = api_key if api_key is not None else os.environ.get('RAPIDAPI_KEY')
+        self.base_url = base_url.rstrip('/')
+        self.host = host or httpx.URL(self.base_url).host
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.store = store or RawDataStore(str(base_dir))
+        self.transport = transport
+
+        self.stats = {'requests': 0, 'retries': 0, 'written': 0, 'skipped': 0, 'failed': 0,
+                      'bytes': 0, 'seconds': 0.0, 'requests_per_second': 0.0}
+        self.logger = logging.getLogger(__name__)
+
+    def _client(self) -> httpx.AsyncClient:
+        headers = {'X-RapidAPI-Host': self.host}
+        if self.api_key:
+            headers['X-RapidAPI-Key'] = self.api_key
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(base_url=self.base_url, headers=headers, limits=limits,
+                                 timeout=self.timeout, transport=self.transport)
+
+    @staticmethod
+    def _write(path: Path, payload) -> int:
+        """Write JSON atomically and return its size in bytes."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(payload).encode()
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    async def _get(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                   endpoint: str, params: Dict) -> Dict:
+        """GET one endpoint with rate limiting and retries; returns the decoded JSON body."""
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                async with semaphore:
+                    await bucket.acquire()
+                    self.stats['requests'] += 1
+                    response = await client.get(endpoint, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get('Retry-After')
+                if retry_after is not None and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+
+            if attempt == self.retries:
+                raise RuntimeError(f"GET {endpoint} {params} failed after {attempt + 1} attempts: {error}")
+            self.stats['retries'] += 1
+            self.logger.warning(f"GET {endpoint} {params} failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _collect(self, dataset: str, tasks: List, force: bool) -> Dict[str, Dict]:
+        """Fetch (key, path, endpoint, params) tasks concurrently, writing each response as it arrives."""
+        results = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = TokenBucket(self.rate, self.burst)
+
+        async def fetch(client, key, path, endpoint, params):
+            if not force and path.exists():
+                self.stats['skipped'] += 1
+                results[key] = {'status': 'skipped', 'error': None, 'path': str(path), 'bytes': 0}
+                return
+            try:
+                payload = await self._get(client, semaphore, bucket, endpoint, params)
+                # API-NBA reports quota and parameter errors in a 200 response; never
+                # store those, or the skip-existing check would keep them forever
+                errors = payload.get('errors') if isinstance(payload, dict) else None
+                if errors:
+                    raise RuntimeError(f"API error for {endpoint} {params}: {errors}")
+                size = self._write(path, payload)
+                self.stats['written'] += 1
+                self.stats['bytes'] += size
+                results[key] = {'status': 'success', 'error': None, 'path': str(path), 'bytes': size}
+            except Exception as e:
+                self.stats['failed'] += 1
+                self.logger.error(f"Error collecting {dataset} {key}: {e}")
+                results[key] = {'status': 'failed', 'error': str(e), 'path': None, 'bytes': 0}
+
+        start = time.perf_counter()
+        requests_before = self.stats['requests']
+        async with self._client() as client:
+            await asyncio.gather(*(fetch(client, *task) for task in tasks))
+        seconds = time.perf_counter() - start
+
+        self.stats['seconds'] += seconds
+        self.stats['requests_per_second'] = (self.stats['requests'] - requests_before) / max(seconds, 1e-12)
+        if any(r['status'] == 'success' for r in results.values()):
+            self.store.record(dataset, source='rapidapi')
+        return results
+
+    def _run(self, coroutine):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Inside a running loop (e.g. a notebook), use a fresh loop in a worker thread
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def fetch_games(self, dates: Iterable[date], force: bool = False) -> Dict[str, Dict]:
+        """Fetch the games of every date; see collect_games()."""
+        tasks = []
+        for day in dates:
+            key = day.isoformat()
+            path = self.base_dir / 'games' / f"season={season_of(day)}" / f"{key}.json"
+            tasks.append((key, path, '/games', {'date': key}))
+        return await self._collect('games', tasks, force)
+
+    async def fetch_standings(self, seasons: Iterable[int], league: str = 'standard',
+                              force: bool = False) -> Dict[str, Dict]:
+        """Fetch the standings of every season; see collect_standings()."""
+        tasks = []
+        for season in seasons:
+            path = self.base_dir / 'standings' / f"season={int(season)}.json"
+            # API-NBA names seasons by the year they start
+            tasks.append((str(season), path, '/standings', {'league': league, 'season': int(season) - 1}))
+        return await self._collect('standings', tasks, force)
+
+    def collect_games(self, start: date, end: date, force: bool = False) -> Dict[str, Dict]:
+        """
+        Collect the games of every date from start to end, inclusive.
+
+        Args:
+            start (date): First date
+            end (date): Last date
+            force (bool): Fetch dates whose file already exists again
+
+        Returns:
+            Dict[str, Dict]: Per-date result with status ('success', 'skipped'
+            or 'failed'), error, path and bytes written
+        """
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return self._run(self.fetch_games(dates, force=force))
+
+    def collect_standings(self, seasons: Iterable[int], league: str = 'standard',
+                          force: bool = False) -> Dict[str, Dict]:
+        """
+        Collect the standings of every season.
+
+        Args:
+            seasons (Iterable[int]): Seasons, as the year each season ends
+            league (str): API-NBA league
+            force (bool): Fetch seasons whose file already exists again
+
+        Returns:
+            Dict[str, Dict]: Per-season result, as collect_games()
+        """
+        return self._run(self.fetch_standings(list(seasons), league=league, force=force))
@@ -0,0 +1,291 @@
+"""
+Era-aware franchise and conference lookup.
+
+A raw team name or code does not identify a franchise on its own: 'HORNETS'
+is Charlotte up to 2002, New Orleans from 2003 to 2013 and Charlotte again
+from 2015, and 'SEA' is the Thunder franchise under its Seattle code.
+FranchiseTable resolves every (name, season) pair to
+
+- franchise: the current three-letter code of the franchise
+- team_code: the code the franchise used in that season
+- conference: the franchise's conference in that season
+
+through interval tables keyed on (alias, first season, last season) and
+(franchise, first season, last season). Seasons are the year a season ends;
+labels such as '2004-05' are read as that year.
+
+Each table is sorted once into packed int64 interval starts, so resolving
+millions of rows is one factorize of the names plus one binary search over
+integers; only distinct spellings are handled in Python. Names or seasons no
+era covers fall back to a season-independent resolver (e.g. the cleaner's
+TeamNameResolver), or are kept as they are.
+"""
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SEASON_BITS = 16
+OPEN_END = (1 << SEASON_BITS) - 1
+
+EASTERN_CONFERENCE = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DET', 'IND', 'MIA', 'MIL', 'NYK',
+                      'ORL', 'PHI', 'TOR', 'WAS']
+WESTERN_CONFERENCE = ['DAL', 'DEN', 'GSW', 'HOU', 'LAC', 'LAL', 'MEM', 'MIN', 'NOP', 'OKC', 'PHX',
+                      'POR', 'SAC', 'SAS', 'UTA']
+
+# (alias, first season, last season, franchise, team code); None is an open end
+FRANCHISE_ERAS = [
+    ('SEA', None, 2008, 'OKC', 'SEA'),
+    ('SEATTLE SUPERSONICS', None, 2008, 'OKC', 'SEA'),
+    ('SUPERSONICS', None, 2008, 'OKC', 'SEA'),
+    ('SONICS', None, 2008, 'OKC', 'SEA'),
+
+    ('HORNETS', None, 2002, 'CHA', 'CHH'),
+    ('HORNETS', 2003, 2013, 'NOP', 'NOH'),
+    ('HORNETS', 2015, None, 'CHA', 'CHA'),
+    ('CHARLOTTE HORNETS', None, 2002, 'CHA', 'CHH'),
+    ('CHARLOTTE HORNETS', 2015, None, 'CHA', 'CHA'),
+    ('CHH', None, 2002, 'CHA', 'CHH'),
+    ('NEW ORLEANS HORNETS', 2003, 2013, 'NOP', 'NOH'),
+    ('NOH', 2003, 2013, 'NOP', 'NOH'),
+    ('NEW ORLEANS/OKLAHOMA CITY HORNETS', 2006, 2007, 'NOP', 'NOK'),
+    ('NOK', 2006, 2007, 'NOP', 'NOK'),
+    ('CHARLOTTE BOBCATS', 2005, 2014, 'CHA', 'CHA'),
+    ('BOBCATS', 2005, 2014, 'CHA', 'CHA'),
+
+    ('NEW JERSEY NETS', 1978, 2012, 'BKN', 'NJN'),
+    ('NETS', 1978, 2012, 'BKN', 'NJN'),
+    ('NJN', 1978, 2012, 'BKN', 'NJN'),
+
+    ('VANCOUVER GRIZZLIES', None, 2001, 'MEM', 'VAN'),
+    ('GRIZZLIES', None, 2001, 'MEM', 'VAN'),
+    ('VAN', None, 2001, 'MEM', 'VAN'),
+
+    # The 1947-1955 Baltimore Bullets folded; the later Bullets are the Wizards
+    ('BALTIMORE BULLETS', None, 1955, 'BLB', 'BLB'),
+    ('BALTIMORE BULLETS', 1964, 1973, 'WAS', 'BAL'),
+    ('BULLETS', None, 1955, 'BLB', 'BLB'),
+    ('BULLETS', 1964, 1973, 'WAS', 'BAL'),
+    ('BULLETS', 1974, 1974, 'WAS', 'CAP'),
+    ('BULLETS', 1975, 1997, 'WAS', 'WSB'),
+    ('CAPITAL BULLETS', 1974, 1974, 'WAS', 'CAP'),
+    ('WASHINGTON BULLETS', 1975, 1997, 'WAS', 'WSB'),
+    ('WSB', 1975, 1997, 'WAS', 'WSB'),
+
+    ('KANSAS CITY KINGS', 1976, 1985, 'SAC', 'KCK'),
+    ('KCK', 1976, 1985, 'SAC', 'KCK'),
+    ('CINCINNATI ROYALS', 1958, 1972, 'SAC', 'CIN'),
+    ('ROCHESTER ROYALS', None, 1957, 'SAC', 'ROC'),
+
+    ('BUFFALO BRAVES', 1971, 1978, 'LAC', 'BUF'),
+    ('SAN DIEGO CLIPPERS', 1979, 1984, 'LAC', 'SDC'),
+    ('SDC', 1979, 1984, 'LAC', 'SDC'),
+
+    ('NEW ORLEANS JAZZ', 1975, 1979, 'UTA', 'NOJ'),
+    ('SAN DIEGO ROCKETS', 1968, 1971, 'HOU', 'SDR'),
+    ('SAN FRANCISCO WARRIORS', 1963, 1971, 'GSW', 'SFW'),
+    ('PHILADELPHIA WARRIORS', None, 1962, 'GSW', 'PHW'),
+    ('MINNEAPOLIS LAKERS', None, 1960, 'LAL', 'MNL'),
+    ('ST. LOUIS HAWKS', 1956, 1968, 'ATL', 'STL'),
+    ('MILWAUKEE HAWKS', 1952, 1955, 'ATL', 'MLH'),
+    ('TRI-CITIES BLACKHAWKS', None, 1951, 'ATL', 'TRI'),
+    ('SYRACUSE NATIONALS', None, 1963, 'PHI', 'SYR'),
+    ('FORT WAYNE PISTONS', None, 1957, 'DET', 'FTW'),
+    ('CHICAGO PACKERS', 1962, 1962, 'WAS', 'CHP'),
+    ('CHICAGO ZEPHYRS', 1963, 1963, 'WAS', 'CHZ'),
+]
+
+# (franchise, first season, last season, conference) where it differs from
+# the franchise's current conference
+CONFERENCE_ERAS = [
+    ('ATL', None, 1970, 'WEST'),
+    ('CHI', None, 1980, 'WEST'),
+    ('DET', None, 1978, 'WEST'),
+    ('MIL', 1971, 1980, 'WEST'),
+    ('IND', 1977, 1979, 'WEST'),
+    ('MIA', 1989, 1989, 'WEST'),
+    ('CHA', 1990, 1990, 'WEST'),
+    ('ORL', 1991, 1991, 'WEST'),
+    ('SAC', 1963, 1972, 'EAST'),
+    ('HOU', 1973, 1980, 'EAST'),
+    ('SAS', 1977, 1980, 'EAST'),
+    ('NOP', 2003, 2004, 'EAST'),
+    ('BLB', None, 1955, 'EAST'),
+]
+
+UNKNOWN_CONFERENCE = 'Unknown'
+
+
+def _normalize(name) -> Optional[str]:
+    return name.strip().upper() if isinstance(name, str) else None
+
+
+class _IntervalTable:
+    """Sorted, non-overlapping season intervals per key, searched with packed int64 keys."""
+
+    def __init__(self, rows: Sequence[Tuple]):
+        keys = pd.Index(sorted({row[0] for row in rows}))
+        ids = keys.get_indexer([row[0] for row in rows]).astype(np.int64)
+        first = np.array([0 if row[1] is None else row[1] for row in rows], dtype=np.int64)
+        last = np.array([OPEN_END if row[2] is None else row[2] for row in rows], dtype=np.int64)
+        order = np.lexsort((first, ids))
+
+        self.keys = keys
+        self.starts = (ids[order] << SEASON_BITS) | first[order]
+        self.ends = (ids[order] << SEASON_BITS) | last[order]
+        if np.any(self.starts[1:] <= self.ends[:-1]):
+            raise ValueError("Season intervals overlap")
+        self.values = [np.array([row[i] for row in rows], dtype=object)[order] for i in range(3, len(rows[0]))]
+
+    def lookup(self, key_ids: np.ndarray, seasons: np.ndarray) -> np.ndarray:
+        """Interval row of every (key id, season) pair, or -1 where none covers it."""
+        valid = (key_ids >= 0) & (seasons >= 0) & (seasons <= OPEN_END)
+        packed = (key_ids << SEASON_BITS) | np.where(valid, seasons, 0)
+        rows = np.searchsorted(self.starts, packed, side='right') - 1
+        # An interval of a smaller key always ends below the packed value
+        hit = valid & (rows >= 0) & (packed <= self.ends[np.maximum(rows, 0)])
+        return np.where(hit, rows, -1)
+
+
+def _categorical(codes: np.ndarray, labels: pd.Index) -> pd.Categorical:
+    """Categorical of label ids (-1 for missing), keeping only the labels in use."""
+    used = np.bincount(codes[codes >= 0], minlength=len(labels)) > 0
+    remap = np.append(np.cumsum(used) - 1, -1)
+    return pd.Categorical.from_codes(remap[codes], categories=labels[used])
+
+
+def _seasons(seasons, n_rows: int) -> np.ndarray:
+    """
+    Integer seasons with -1 for missing ones.
+
+    Season labels such as '2004-05' or '2004-2005' become the year the
+    season ends. Values that are neither are treated as missing, with a warning.
+    """
+    if seasons is None:
+        return np.full(n_rows, -1, dtype=np.int64)
+    raw = pd.Series(np.asarray(seasons))
+    values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+
+    unparsed = np.isnan(values) & raw.notna().to_numpy()
+    if unparsed.any():
+        labels = raw[unparsed].astype(str).str.extract(r'^\s*(\d{4})\s*[-/]\s*(\d{2}|\d{4})\s*$')
+        start = pd.to_numeric(labels[0]).to_numpy(dtype=np.float64)
+        end = labels[1].fillna('')
+        long_end = pd.to_numeric(end.where(end.str.len() == 4), errors='coerce').to_numpy(dtype=np.float64)
+        values[unparsed] = np.where(np.isnan(long_end), start + 1, long_end)
+
+        failed = np.isnan(values) & unparsed
+        if failed.any():
+            examples = raw[failed].astype(str).unique()[:3].tolist()
+            logging.getLogger(__name__).warning(
+                f"{int(failed.sum())} season values could not be parsed (e.g. {examples}); "
+                f"those rows are resolved without their era")
+    return np.where(np.isnan(values), -1, values).astype(np.int64)
+
+
+class FranchiseTable:
+    """Resolve (team name or code, season) pairs to franchise, era code and conference."""
+
+    def __init__(self, resolver=None, eras: Sequence[Tuple] = FRANCHISE_ERAS,
+                 conference_eras: Sequence[Tuple] = CONFERENCE_ERAS):
+        """
+        Initialize the table.
+
+        Args:
+            resolver: Season-independent resolver with a resolve_values()
+                      method (e.g. TeamNameResolver), used for names or
+                      seasons no era covers. If None, those names are kept
+            eras: (alias, first season, last season, franchise, team code)
+                  rows; intervals of one alias must not overlap
+            conference_eras: (franchise, first season, last season, conference)
+                             rows overriding the current conference
+        """
+        self.resolver = resolver
+        self.eras = _IntervalTable(eras)
+        self.conference_eras = _IntervalTable(conference_eras)
+        self.current_conference = {**{team: 'EAST' for team in EASTERN_CONFERENCE},
+                                   **{team: 'WEST' for team in WESTERN_CONFERENCE}}
+
+    def _fallback(self, uniques) -> np.ndarray:
+        if self.resolver is not None:
+            lookup = self.resolver.resolve_values(uniques)
+            return np.array([lookup[u] for u in uniques], dtype=object)
+        return np.asarray(uniques, dtype=object)
+
+    def resolve(self, names: pd.Series, seasons=None) -> pd.DataFrame:
+        """
+        Franchise, era code and conference of every row.
+
+        Args:
+            names: Team names or codes, in any spelling the resolver accepts
+            seasons: Season of every row. Without seasons (or for missing
+                     ones) names resolve as the fallback resolver would and
+                     get their franchise's current conference
+
+        Returns:
+            DataFrame with categorical franchise, team_code and conference
+            columns, on the index of `names`
+        """
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            codes = names.cat.codes.to_numpy().astype(np.int64)
+            uniques = names.cat.categories
+        else:
+            codes, uniques = pd.factorize(names, use_na_sentinel=True)
+        uniques = list(uniques)
+        seasons = _seasons(seasons, len(names))
+
+        # Distinct spellings are resolved in Python; rows only carry integer label ids
+        alias_ids = self.eras.keys.get_indexer([_normalize(u) for u in uniques]).astype(np.int64)
+        fallback = self._fallback(uniques)
+        era_franchises, era_codes = self.eras.values
+        labels = pd.Index(pd.unique(np.concatenate([fallback[~pd.isnull(fallback)], era_franchises, era_codes])))
+
+        row_alias = np.append(alias_ids, -1)[codes]
+        era_rows = self.eras.lookup(row_alias, seasons)
+        hit = era_rows >= 0
+        franchise = np.append(labels.get_indexer(fallback), -1)[codes]
+        team_code = franchise.copy()
+        franchise[hit] = labels.get_indexer(era_franchises)[era_rows[hit]]
+        team_code[hit] = labels.get_indexer(era_codes)[era_rows[hit]]
+
+        franchise = _categorical(franchise, labels)
+        return pd.DataFrame({
+            'franchise': franchise,
+            'team_code': _categorical(team_code, labels),
+            'conference': self.conference(franchise, seasons)
+        }, index=names.index)
+
+    def conference(self, franchises, seasons=None) -> pd.Categorical:
+        """
+        Conference of every (franchise, season) pair.
+
+        Args:
+            franchises: Franchise codes, as resolve() returns them
+            seasons: Season of every row. If None, current conferences are used
+        """
+        franchises = pd.Categorical(franchises)
+        categories = list(franchises.categories)
+        codes = franchises.codes.astype(np.int64)
+        seasons = _seasons(seasons, len(codes))
+
+        labels = pd.Index(['EAST', 'WEST', UNKNOWN_CONFERENCE])
+        current = labels.get_indexer([self.current_conference.get(team, UNKNOWN_CONFERENCE) for team in categories]
+                                     + [UNKNOWN_CONFERENCE])
+        conference = current[codes]
+        team_ids = np.append(self.conference_eras.keys.get_indexer(categories), -1).astype(np.int64)[codes]
+        era_rows = self.conference_eras.lookup(team_ids, seasons)
+        hit = era_rows >= 0
+        conference[hit] = labels.get_indexer(self.conference_eras.values[0])[era_rows[hit]]
+        return pd.Categorical.from_codes(conference, categories=labels)
+
+    def franchises(self, names: pd.Series, seasons=None) -> pd.Series:
+        """
+        Franchise code of every row, keeping the kind of column given.
+
+        Categorical columns stay categorical; other columns come back as object.
+        """
+        franchise = self.resolve(names, seasons)['franchise']
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            return franchise.rename(names.name)
+        return franchise.astype(object).rename(names.name)
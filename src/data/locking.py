@@ -0,0 +1,48 @@
+"""
+Inter-process file locks for stores shared by several processes.
+
+file_lock() holds an exclusive lock on a lock file for the duration of a
+with block. It uses fcntl.flock on POSIX systems and msvcrt.locking on
+Windows; either way the lock is released by the operating system if the
+holding process dies, so a crashed writer never leaves a stale lock.
+"""
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on `path`, creating it if needed.
+
+    Blocks until the lock is available.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    # Gives up after about 10 seconds of retries, so keep waiting
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,293 @@
+"""
+Stage-level profiling for the collection, cleaning and feature pipeline.
+
+StageProfiler extends DataCollectionProgress: every profiled stage is also a
+tracked task, so get_summary() keeps working, and each task additionally
+carries metrics:
+
+- wall time and CPU time
+- peak traced memory (tracemalloc)
+- rows in and out (from DataFrame arguments and results)
+- bytes read and written (from file paths passed in or returned)
+
+Stages can be profiled with a context manager, a decorator, or by attaching
+the profiler to an existing collector, cleaner or builder instance. Metrics
+export as JSON or Prometheus text format.
+"""
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .utils import DataCollectionProgress
+
+# Metric -> (Prometheus name suffix, type, help text)
+METRIC_HELP = {
+    'calls': ('calls_total', 'counter', 'Number of times the stage ran'),
+    'failures': ('failures_total', 'counter', 'Number of stage runs that raised an exception'),
+    'wall_seconds': ('wall_seconds_total', 'counter', 'Wall-clock time spent in the stage'),
+    'cpu_seconds': ('cpu_seconds_total', 'counter', 'CPU time spent in the stage'),
+    'peak_memory_bytes': ('peak_memory_bytes', 'gauge', 'Peak traced memory allocated by the stage'),
+    'rows_in': ('rows_in_total', 'counter', 'Rows passed into the stage'),
+    'rows_out': ('rows_out_total', 'counter', 'Rows returned by the stage'),
+    'bytes_read': ('bytes_read_total', 'counter', 'Bytes of input files read by the stage'),
+    'bytes_written': ('bytes_written_total', 'counter', 'Bytes of output files written by the stage'),
+}
+
+
+def _empty_metrics() -> Dict:
+    return {name: 0 for name in METRIC_HELP}
+
+
+def _count_rows(value) -> int:
+    """Count DataFrame/Series rows in a value or in a tuple, list or dict of values."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_count_rows(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_count_rows(v) for v in value.values())
+    return 0
+
+
+def _path_bytes(value) -> int:
+    """Size of a file, or total size of a directory, if value names one."""
+    if not isinstance(value, (str, Path)):
+        return 0
+    path = Path(value)
+    try:
+        if path.is_file():
+            return path.stat().st_size
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+    except OSError:
+        pass
+    return 0
+
+
+def _output_bytes(result) -> int:
+    """Bytes of files a stage reports having written: a path, (path, ...) or {'path': ...}."""
+    if isinstance(result, dict):
+        return _path_bytes(result.get('path'))
+    if isinstance(result, tuple) and result:
+        return _path_bytes(result[0])
+    return _path_bytes(result)
+
+
+class StageMetrics:
+    """Metrics for one run of a stage; set rows or bytes explicitly inside a stage block."""
+
+    def __init__(self, rows_in: int = 0):
+        self.rows_in = rows_in
+        self.rows_out = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
+class StageProfiler(DataCollectionProgress):
+    """
+    Record time, memory, row and byte metrics per pipeline stage.
+
+    Stages may nest; a parent's peak memory includes its children's. The
+    profiler is meant for a single thread of execution.
+    """
+
+    def __init__(self, trace_memory: bool = True, namespace: str = 'nba_pipeline'):
+        """
+        Initialize the profiler.
+
+        Args:
+            trace_memory: Measure peak memory with tracemalloc, which slows
+                          allocation-heavy code down noticeably
+            namespace: Prefix for exported Prometheus metric names
+        """
+        super().__init__()
+        self.trace_memory = trace_memory
+        self.namespace = namespace
+        self._active: List[Dict] = []
+        self._started_tracing = False
+        # Instances with an attached method currently running
+        self._attached_active: set = set()
+
+    def _enter_memory(self) -> Dict:
+        if not self.trace_memory:
+            return {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        # Resetting the peak would lose the enclosing stages' peaks, so bank them first
+        for frame in self._active:
+            frame['peak'] = max(frame['peak'], peak)
+        tracemalloc.reset_peak()
+        return {'baseline': current, 'peak': current}
+
+    def _exit_memory(self, frame: Dict) -> int:
+        if not self.trace_memory:
+            return 0
+        peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+        for parent in self._active:
+            parent['peak'] = max(parent['peak'], peak)
+        if not self._active and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return peak - frame['baseline']
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0):
+        """
+        Profile a block of code as a named stage.
+
+        Yields a StageMetrics object; set rows_out, bytes_read or bytes_written
+        on it to record values the profiler cannot infer.
+        """
+        if name not in self.tasks:
+            self.add_task(name)
+            self.tasks[name]['metrics'] = _empty_metrics()
+        self.start_task(name)
+
+        metrics = StageMetrics(rows_in)
+        frame = self._enter_memory()
+        self._active.append(frame)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        error = None
+        try:
+            yield metrics
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._active.pop()
+            peak = self._exit_memory(frame)
+
+            totals = self.tasks[name]['metrics']
+            totals['calls'] += 1
+            totals['failures'] += error is not None
+            totals['wall_seconds'] += wall
+            totals['cpu_seconds'] += cpu
+            totals['peak_memory_bytes'] = max(totals['peak_memory_bytes'], peak)
+            totals['rows_in'] += metrics.rows_in
+            totals['rows_out'] += metrics.rows_out
+            totals['bytes_read'] += metrics.bytes_read
+            totals['bytes_written'] += metrics.bytes_written
+            self.complete_task(name, success=error is None, error=error)
+
+    def profile(self, name: Optional[str] = None):
+        """
+        Decorator profiling every call of a function as a stage.
+
+        Rows in and out are counted from DataFrame arguments and results.
+        Existing file paths among the arguments count as bytes read; a returned
+        path, (path, ...) tuple or {'path': ...} dict counts as bytes written.
+        """
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                inputs = list(args) + list(kwargs.values())
+                with self.stage(stage_name, rows_in=_count_rows(inputs)) as metrics:
+                    metrics.bytes_read = sum(_path_bytes(value) for value in inputs)
+                    result = func(*args, **kwargs)
+                    metrics.rows_out = _count_rows(result)
+                    metrics.bytes_written = _output_bytes(result)
+                return result
+
+            return wrapper
+        return decorator
+
+    def attach(self, obj, methods: Optional[Iterable[str]] = None, prefix: Optional[str] = None):
+        """
+        Profile methods of an existing instance, e.g. a KaggleCollector, NBACleaner or FeatureBuilder.
+
+        Only top-level calls are profiled: an attached method called from
+        inside another attached method of the same instance (e.g. a helper
+        the cleaner uses itself) runs unprofiled as part of the outer stage.
+
+        Args:
+            obj: Instance whose methods to wrap
+            methods: Method names. If None, every public method is wrapped
+            prefix: Stage name prefix. Defaults to the class name
+
+        Returns:
+            The same instance, for chaining
+        """
+        prefix = prefix or type(obj).__name__
+        if methods is None:
+            methods = [
+                attr for attr in dir(type(obj))
+                if not attr.startswith('_') and callable(getattr(type(obj), attr))
+            ]
+        for method in methods:
+            bound = getattr(obj, method)
+            setattr(obj, method, self._attached(obj, bound, self.profile(f"{prefix}.{method}")(bound)))
+        return obj
+
+    def _attached(self, obj, bound, profiled):
+        """Call `profiled` for top-level calls on obj and `bound` for nested ones."""
+        key = id(obj)
+
+        @functools.wraps(bound)
+        def wrapper(*args, **kwargs):
+            if key in self._attached_active:
+                return bound(*args, **kwargs)
+            self._attached_active.add(key)
+            try:
+                return profiled(*args, **kwargs)
+            finally:
+                self._attached_active.discard(key)
+
+        return wrapper
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Get the metrics of every profiled stage."""
+        return {name: task['metrics'] for name, task in self.tasks.items() if 'metrics' in task}
+
+    def to_json(self, path=None) -> str:
+        """
+        Export the summary, including per-stage metrics, as JSON.
+
+        Args:
+            path: Optional file to write the JSON to
+        """
+        text = json.dumps(self.get_summary(), indent=2, default=str)
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, path=None) -> str:
+        """
+        Export per-stage metrics in the Prometheus text exposition format.
+
+        Args:
+            path: Optional file to write to, e.g. for the node exporter textfile collector
+        """
+        stages = self.get_metrics()
+        lines = []
+        for metric, (suffix, metric_type, help_text) in METRIC_HELP.items():
+            full_name = f"{self.namespace}_stage_{suffix}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for stage_name, metrics in stages.items():
+                label = stage_name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                lines.append(f'{full_name}{{stage="{label}"}} {metrics[metric]}')
+        text = '\n'.join(lines) + '\n'
+
+        if path is not None:
+            # Write atomically so a scraper never reads a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return text
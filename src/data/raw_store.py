@@ -0,0 +1,202 @@
+"""
+Content-addressed manifest for raw downloaded data.
+
+RawDataStore keeps a manifest.json at the root of a raw data directory
+(e.g. data/raw/kaggle) that records, for every dataset:
+
+- the source and source version it was downloaded at
+- the SHA-256 hash, size and modification time of every file
+- a dataset digest derived from the file hashes
+
+Collectors use it to skip downloads whose content is already present, and
+downstream stages (cleaning, feature building) record the digests they last
+consumed, so "has anything I depend on changed?" is a dictionary comparison.
+
+Every update re-reads the manifest under an inter-process lock on
+.manifest.lock before writing it, so several processes or store instances
+sharing a root never overwrite each other's entries.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .locking import file_lock
+
+MANIFEST_FILE = 'manifest.json'
+LOCK_FILE = '.manifest.lock'
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_sha256(path) -> str:
+    """Hash a file in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RawDataStore:
+    """Manifest of raw dataset contents and of which versions each stage consumed."""
+
+    def __init__(self, root: str):
+        """
+        Initialize the store, loading the manifest if one exists.
+
+        Args:
+            root: Raw data directory holding one subdirectory per dataset
+        """
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_FILE
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the manifest from disk, e.g. after another process updated it."""
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'datasets': {}, 'consumers': {}}
+
+    @contextmanager
+    def _updating(self):
+        """Lock the manifest across threads and processes, reload it, and save it on exit."""
+        with self._lock, file_lock(self.root / LOCK_FILE):
+            self.reload()
+            yield self.manifest
+            self._save()
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f".{MANIFEST_FILE}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _scan(self, dataset: str, previous: Dict) -> Dict[str, Dict]:
+        """Hash every file of a dataset, reusing hashes of files whose size and mtime are unchanged."""
+        dataset_dir = self.root / dataset
+        files = {}
+        for path in sorted(p for p in dataset_dir.rglob('*') if p.is_file()):
+            rel = path.relative_to(dataset_dir).as_posix()
+            stat = path.stat()
+            known = previous.get(rel)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                sha256 = known['sha256']
+            else:
+                sha256 = file_sha256(path)
+            files[rel] = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return files
+
+    @staticmethod
+    def _digest(files: Dict[str, Dict]) -> str:
+        digest = hashlib.sha256()
+        for rel in sorted(files):
+            digest.update(f"{rel}\0{files[rel]['sha256']}\n".encode())
+        return digest.hexdigest()
+
+    def record(self, dataset: str, source: str, version: Optional[str] = None) -> Dict:
+        """
+        Record the current contents of a dataset directory.
+
+        Args:
+            dataset: Dataset directory relative to the store root (e.g. 'mexwell/nba-shots')
+            source: Where the data came from (e.g. 'kaggle')
+            version: Source version signature of the downloaded copy
+
+        Returns:
+            The manifest entry for the dataset
+        """
+        # Hash outside the lock; only the manifest update is serialized
+        previous = self.manifest['datasets'].get(dataset, {}).get('files', {})
+        files = self._scan(dataset, previous)
+        with self._updating() as manifest:
+            entry = {
+                'source': source,
+                'version': version,
+                'digest': self._digest(files),
+                'files': files,
+                'bytes': sum(f['size'] for f in files.values()),
+                'recorded_at': datetime.now().isoformat(timespec='seconds')
+            }
+            manifest['datasets'][dataset] = entry
+
+        self.logger.info(f"Recorded {dataset}: {len(files)} files, digest {entry['digest'][:12]}")
+        return entry
+
+    def entry(self, dataset: str) -> Optional[Dict]:
+        """Get the manifest entry for a dataset, if recorded."""
+        return self.manifest['datasets'].get(dataset)
+
+    def digest(self, dataset: str) -> Optional[str]:
+        """Get the recorded content digest of a dataset."""
+        entry = self.entry(dataset)
+        return entry['digest'] if entry else None
+
+    def version(self, dataset: str) -> Optional[str]:
+        """Get the recorded source version of a dataset."""
+        entry = self.entry(dataset)
+        return entry['version'] if entry else None
+
+    def is_intact(self, dataset: str) -> bool:
+        """Check, by size and modification time, that the recorded files are still on disk unchanged."""
+        entry = self.entry(dataset)
+        if entry is None:
+            return False
+        dataset_dir = self.root / dataset
+        for rel, meta in entry['files'].items():
+            try:
+                stat = (dataset_dir / rel).stat()
+            except FileNotFoundError:
+                return False
+            if stat.st_size != meta['size'] or stat.st_mtime_ns != meta['mtime_ns']:
+                return False
+        return True
+
+    def is_current(self, dataset: str, version: str) -> bool:
+        """Check whether the local copy of a dataset is intact and at the given source version."""
+        return self.version(dataset) == version and self.is_intact(dataset)
+
+    def find_by_hash(self, sha256: str) -> Optional[Path]:
+        """Find a recorded file with the given content hash."""
+        for dataset, entry in self.manifest['datasets'].items():
+            for rel, meta in entry['files'].items():
+                if meta['sha256'] == sha256:
+                    return self.root / dataset / rel
+        return None
+
+    def changed_since(self, consumer: str, datasets: Iterable[str]) -> bool:
+        """
+        Check whether any dataset changed since the consumer last marked it consumed.
+
+        Args:
+            consumer: Stage name (e.g. 'cleaning')
+            datasets: Datasets the stage depends on
+
+        Returns:
+            True if any dataset was never recorded or its digest differs from
+            the one the stage consumed
+        """
+        consumed = self.manifest['consumers'].get(consumer, {})
+        for dataset in datasets:
+            digest = self.digest(dataset)
+            # A dataset missing from the manifest has no known content, so treat it as changed
+            if digest is None or consumed.get(dataset) != digest:
+                return True
+        return False
+
+    def mark_consumed(self, consumer: str, datasets: Iterable[str]) -> None:
+        """Record that a stage has processed the current version of each dataset."""
+        with self._updating() as manifest:
+            consumed = manifest['consumers'].setdefault(consumer, {})
+            for dataset in datasets:
+                consumed[dataset] = self.digest(dataset)
@@ -0,0 +1,199 @@
+"""
+Schema registry with compact dtypes for the NBA datasets.
+
+Default pandas inference stores team codes and player names as Python object
+strings, seasons and counts as int64, and every stat as float64. Each schema
+here declares compact dtypes for one source instead:
+
+- categorical team, player and other low-cardinality text columns
+- int16 (or smaller) seasons, counts and identifiers that fit
+- float32 stats, which are recorded with at most a few decimals
+
+read_table() applies a schema while parsing, so the wide default dtypes are
+never materialized, and memory_report() shows how much memory that saves.
+Columns that may be missing use float32 rather than an integer dtype.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+PER_GAME_COLS = [
+    'mp_per_game', 'fg_per_game', 'fga_per_game', 'x3p_per_game', 'x3pa_per_game',
+    'x2p_per_game', 'x2pa_per_game', 'ft_per_game', 'fta_per_game', 'orb_per_game',
+    'drb_per_game', 'trb_per_game', 'ast_per_game', 'stl_per_game', 'blk_per_game',
+    'tov_per_game', 'pf_per_game', 'pts_per_game'
+]
+PERCENT_COLS = ['fg_percent', 'x3p_percent', 'x2p_percent', 'ft_percent']
+
+SCHEMAS = {
+    # Player Season Info.csv (raw uses 'tm', processed player_season uses 'team')
+    'player_season': {
+        'dtypes': {
+            'season': 'int16',
+            'seas_id': 'int32',
+            'player_id': 'int32',
+            'player': 'category',
+            'birth_year': 'float32',
+            'pos': 'category',
+            'age': 'float32',
+            'experience': 'float32',
+            'lg': 'category',
+            'tm': 'category',
+            'team': 'category',
+        },
+        'dates': {},
+    },
+    # Team Stats Per Game.csv and processed team_stats
+    'team_stats': {
+        'dtypes': {
+            'season': 'int16',
+            'lg': 'category',
+            'team': 'category',
+            'abbreviation': 'category',
+            'playoffs': 'bool',
+            'g': 'float32',
+            **{col: 'float32' for col in PER_GAME_COLS + PERCENT_COLS},
+        },
+        'dates': {},
+    },
+    # Raw injury transactions (loganlauton/nba-injury-stats-1951-2023)
+    'injuries': {
+        'dtypes': {
+            'Team': 'category',
+            'Acquired': 'category',
+            'Relinquished': 'category',
+            'Notes': 'object',
+        },
+        'dates': {'Date': '%Y-%m-%d'},
+    },
+    # Processed injury summary
+    'injuries_summary': {
+        'dtypes': {
+            'year': 'int16',
+            'team': 'category',
+            'count': 'int16',
+        },
+        'dates': {},
+    },
+    # mexwell/nba-shots
+    'shots': {
+        'dtypes': {
+            'SEASON_1': 'int16',
+            'SEASON_2': 'category',
+            'TEAM_ID': 'int32',
+            'TEAM_NAME': 'category',
+            'PLAYER_ID': 'int32',
+            'PLAYER_NAME': 'category',
+            'POSITION_GROUP': 'category',
+            'POSITION': 'category',
+            'GAME_ID': 'int32',
+            'HOME_TEAM': 'category',
+            'AWAY_TEAM': 'category',
+            'EVENT_TYPE': 'category',
+            'SHOT_MADE': 'bool',
+            'ACTION_TYPE': 'category',
+            'SHOT_TYPE': 'category',
+            'BASIC_ZONE': 'category',
+            'ZONE_NAME': 'category',
+            'ZONE_ABB': 'category',
+            'ZONE_RANGE': 'category',
+            'LOC_X': 'float32',
+            'LOC_Y': 'float32',
+            'SHOT_DISTANCE': 'float32',
+            'QUARTER': 'float32',
+            'MINS_LEFT': 'float32',
+            'SECS_LEFT': 'float32',
+        },
+        'dates': {'GAME_DATE': '%m-%d-%Y'},
+    },
+}
+
+
+def get_schema(source: str) -> Dict:
+    """Get the schema for a source, with 'dtypes' and 'dates' (column -> format)."""
+    if source not in SCHEMAS:
+        raise ValueError(f"Unknown source: {source}. Available sources: {sorted(SCHEMAS)}")
+    return SCHEMAS[source]
+
+
+def numeric_columns(source: str, columns: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Columns a source declares as numeric.
+
+    Args:
+        source: Schema name
+        columns: If given, only columns present in this list are returned
+    """
+    dtypes = get_schema(source)['dtypes']
+    numeric = [
+        col for col, dtype in dtypes.items()
+        if dtype not in ('category', 'object', 'bool') and np.issubdtype(np.dtype(dtype), np.number)
+    ]
+    if columns is not None:
+        present = set(columns)
+        numeric = [col for col in numeric if col in present]
+    return numeric
+
+
+def read_table(path, source: str, columns: Optional[Sequence[str]] = None,
+               **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV with the compact dtypes of a source schema applied while parsing.
+
+    Args:
+        path: CSV file
+        source: Schema name, e.g. 'team_stats' or 'shots'
+        columns: Columns to read. If None, reads every column
+        **read_csv_kwargs: Passed through to pandas.read_csv
+
+    Returns:
+        DataFrame using the schema's dtypes; columns the schema does not
+        declare keep pandas' default inference
+    """
+    schema = get_schema(source)
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = list(header) if columns is None else [col for col in columns if col in header]
+
+    dtypes = {col: dtype for col, dtype in schema['dtypes'].items() if col in wanted}
+    dtypes.update(read_csv_kwargs.pop('dtype', None) or {})
+    dates = {col: fmt for col, fmt in schema['dates'].items() if col in wanted}
+
+    df = pd.read_csv(path, usecols=wanted, dtype=dtypes, **read_csv_kwargs)
+    for col, fmt in dates.items():
+        df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+    return df
+
+
+def _default_column_bytes(series: pd.Series) -> int:
+    """Memory a column would take with default pandas inference."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == 'object':
+        return int(series.astype(object).memory_usage(index=False, deep=True))
+    if pd.api.types.is_bool_dtype(series):
+        return len(series)
+    return len(series) * 8
+
+
+def memory_report(df: pd.DataFrame) -> Dict:
+    """
+    Compare a frame's memory against the same data with default pandas dtypes.
+
+    Returns:
+        Dict with 'compact_bytes', 'default_bytes', 'saved_bytes', 'reduction'
+        (fraction of memory saved) and per-column 'columns' details
+    """
+    columns = {}
+    for col in df.columns:
+        compact = int(df[col].memory_usage(index=False, deep=True))
+        default = _default_column_bytes(df[col])
+        columns[col] = {'dtype': str(df[col].dtype), 'compact_bytes': compact, 'default_bytes': default}
+
+    compact_total = sum(c['compact_bytes'] for c in columns.values())
+    default_total = sum(c['default_bytes'] for c in columns.values())
+    return {
+        'compact_bytes': compact_total,
+        'default_bytes': default_total,
+        'saved_bytes': default_total - compact_total,
+        'reduction': 1 - compact_total / default_total if default_total else 0.0,
+        'columns': columns
+    }
@@ -0,0 +1,142 @@
+"""
+Columnar storage for processed NBA datasets.
+
+Processed tables (team_stats, player_season, injuries_summary, feature matrices)
+are written as Parquet files partitioned by season:
+
+    <directory>/<name>/season=1998/part-0.parquet
+    <directory>/<name>/season=1999/part-0.parquet
+
+Each partition keeps its column types, so readers skip CSV parsing entirely,
+and the directory layout lets readers prune seasons before opening any file.
+"""
+import numbers
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PART_FILE = 'part-0.parquet'
+
+SeasonSelector = Union[None, int, Tuple[Optional[int], Optional[int]], Iterable[int]]
+
+
+def _dataset_dir(directory, name) -> Path:
+    return Path(directory) / name
+
+
+def _season_filter(seasons: SeasonSelector):
+    """Turn a season selector into a predicate over integer season values."""
+    if seasons is None:
+        return lambda season: True
+    if isinstance(seasons, numbers.Integral):
+        # Also numpy integers, e.g. df['season'].max()
+        seasons = int(seasons)
+        return lambda season: season == seasons
+    if isinstance(seasons, tuple) and len(seasons) == 2:
+        start, end = seasons
+        return lambda season: ((start is None or season >= start) and
+                               (end is None or season <= end))
+    wanted = {int(s) for s in seasons}
+    return lambda season: season in wanted
+
+
+def list_partitions(directory, name, partition_col: str = 'season') -> List[int]:
+    """List the partition values stored for a dataset, in ascending order."""
+    root = _dataset_dir(directory, name)
+    if not root.exists():
+        return []
+
+    prefix = f"{partition_col}="
+    values = []
+    for child in root.iterdir():
+        if child.is_dir() and child.name.startswith(prefix) and (child / PART_FILE).exists():
+            values.append(int(child.name[len(prefix):]))
+    return sorted(values)
+
+
+def save_partitioned(df: pd.DataFrame, directory, name: str,
+                     partition_col: str = 'season') -> Tuple[str, int]:
+    """
+    Write a DataFrame as a season-partitioned Parquet dataset.
+
+    Only the partitions present in ``df`` are replaced; partitions for other
+    seasons are left untouched, so loading a single new season rewrites a
+    single file. Each partition is written to a temporary file and moved into
+    place, so readers never see a half-written partition.
+
+    Args:
+        df: DataFrame to store
+        directory: Parent directory of the dataset
+        name: Dataset name, used as the dataset directory
+        partition_col: Integer column to partition on
+
+    Returns:
+        Tuple of (dataset directory, number of rows written)
+    """
+    if partition_col not in df.columns:
+        raise ValueError(f"Partition column '{partition_col}' not found in {name}")
+    if df[partition_col].isnull().any():
+        raise ValueError(f"Partition column '{partition_col}' contains missing values in {name}")
+
+    root = _dataset_dir(directory, name)
+    root.mkdir(parents=True, exist_ok=True)
+
+    for value, part in df.groupby(partition_col, sort=True, observed=True):
+        part_dir = root / f"{partition_col}={int(value)}"
+        part_dir.mkdir(exist_ok=True)
+
+        table = pa.Table.from_pandas(part, preserve_index=False)
+        tmp_path = part_dir / f".{PART_FILE}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, part_dir / PART_FILE)
+
+    return str(root), len(df)
+
+
+def load_partitioned(directory, name: str, columns: Optional[Sequence[str]] = None,
+                     seasons: SeasonSelector = None,
+                     partition_col: str = 'season') -> pd.DataFrame:
+    """
+    Load a season-partitioned Parquet dataset.
+
+    Args:
+        directory: Parent directory of the dataset
+        name: Dataset name
+        columns: Columns to read. If None, reads every column
+        seasons: A single season, an inclusive (start, end) range where either
+                 bound may be None, or an iterable of seasons. If None, reads
+                 every season
+        partition_col: Column the dataset was partitioned on
+
+    Returns:
+        DataFrame with the requested columns and seasons
+
+    Raises:
+        FileNotFoundError: If the dataset has no stored partitions
+    """
+    root = _dataset_dir(directory, name)
+    stored = next(root.glob(f"{partition_col}=*/{PART_FILE}"), None) if root.exists() else None
+    if stored is None:
+        raise FileNotFoundError(f"No stored dataset named {name} in {directory}")
+
+    keep = _season_filter(seasons)
+    files = [
+        root / f"{partition_col}={value}" / PART_FILE
+        for value in list_partitions(directory, name, partition_col)
+        if keep(value)
+    ]
+
+    columns = list(columns) if columns is not None else None
+    if not files:
+        # Keep the stored schema even when no season matches
+        schema = pq.read_schema(stored)
+        empty = schema.empty_table().to_pandas()
+        return empty[columns] if columns is not None else empty
+
+    tables = [pq.read_table(path, columns=columns) for path in files]
+    return pa.concat_tables(tables, promote_options='default').to_pandas()
@@ -0,0 +1,174 @@
+"""
+Seeded synthetic NBA data for benchmarking.
+
+generate_datasets() produces tables with the same columns and value types as
+the real inputs of NBACleaner and FeatureBuilder:
+
+- team_stats: processed team per-game stats (Team Stats Per Game)
+- player_stats: processed player seasons (Player Season Info)
+- injuries: processed injury summary (injuries_summary)
+- shots: raw shot-level rows (mexwell/nba-shots)
+
+Sizes scale linearly with `scale`. Scale 1 is roughly the size of the real
+team, player and injury tables; shots are kept smaller so 1000x stays feasible.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+BASE_SEASONS = 75
+BASE_SHOTS = 10_000
+PLAYERS_PER_TEAM = 15
+INJURY_ROWS_PER_TEAM = 4
+
+# Spellings seen in raw files, so cleaners exercise their mapping tables
+TEAM_SPELLINGS = [
+    'ATL', 'Atlanta Hawks', 'BOS', 'Boston Celtics', 'BRK', 'Brooklyn Nets',
+    'CHO', 'Charlotte Hornets', 'CHI', 'Chicago Bulls', 'CLE', 'Cleveland Cavaliers',
+    'DAL', 'Dallas Mavericks', 'DEN', 'Denver Nuggets', 'DET', 'Detroit Pistons',
+    'GSW', 'Golden State Warriors', 'HOU', 'Houston Rockets', 'IND', 'Indiana Pacers',
+    'LAC', 'LA Clippers', 'LAL', 'Los Angeles Lakers', 'MEM', 'Memphis Grizzlies',
+    'MIA', 'Miami Heat', 'MIL', 'Milwaukee Bucks', 'MIN', 'Minnesota Timberwolves',
+    'NOP', 'New Orleans Pelicans', 'NYK', 'New York Knicks', 'OKC', 'Seattle SuperSonics',
+    'ORL', 'Orlando Magic', 'PHI', 'Philadelphia 76ers', 'PHO', 'Phoenix Suns',
+    'POR', 'Portland Trail Blazers', 'SAC', 'Sacramento Kings', 'SAS', 'San Antonio Spurs',
+    'TOR', 'Toronto Raptors', 'UTA', 'Utah Jazz', 'WAS', 'Washington Wizards'
+]
+TEAM_CODES = TEAM_SPELLINGS[::2]
+
+PER_GAME_RANGES = {
+    'fg_per_game': (30, 45), 'fga_per_game': (75, 95), 'x3p_per_game': (0, 16),
+    'x3pa_per_game': (0, 42), 'ft_per_game': (12, 26), 'fta_per_game': (16, 34),
+    'orb_per_game': (7, 18), 'drb_per_game': (28, 38), 'ast_per_game': (18, 30),
+    'stl_per_game': (5, 11), 'blk_per_game': (3, 7), 'tov_per_game': (11, 19)
+}
+
+SHOT_ZONES = [
+    ('Restricted Area', 'Center', 'C', 'Less Than 8 ft.'),
+    ('In The Paint (Non-RA)', 'Center', 'C', '8-16 ft.'),
+    ('Mid-Range', 'Left Side', 'L', '16-24 ft.'),
+    ('Mid-Range', 'Right Side', 'R', '16-24 ft.'),
+    ('Above the Break 3', 'Center', 'C', '24+ ft.'),
+    ('Left Corner 3', 'Left Side', 'L', '24+ ft.'),
+    ('Right Corner 3', 'Right Side', 'R', '24+ ft.')
+]
+
+
+def _team_seasons(scale: int) -> pd.DataFrame:
+    """Team-season grid; larger scales add more franchises per season."""
+    n_teams = len(TEAM_CODES) * scale
+    teams = [
+        code if copy == 0 else f"{code}{copy}"
+        for copy in range(scale) for code in TEAM_CODES
+    ]
+    seasons = np.arange(2025 - BASE_SEASONS, 2025)
+    return pd.DataFrame({
+        'season': np.repeat(seasons, n_teams),
+        'team': np.tile(teams, len(seasons))
+    })
+
+
+def generate_team_stats(scale: int = 1, seed: int = 42) -> pd.DataFrame:
+    """Generate processed team per-game statistics."""
+    rng = np.random.default_rng(seed)
+    df = _team_seasons(scale)
+    n = len(df)
+
+    df['g'] = 82
+    for col, (low, high) in PER_GAME_RANGES.items():
+        df[col] = rng.uniform(low, high, n).round(1)
+    # Keep made shots consistent with attempts
+    df['x3p_per_game'] = np.minimum(df['x3p_per_game'], df['x3pa_per_game']).round(1)
+    df['pts_per_game'] = (2 * df['fg_per_game'] + df['x3p_per_game'] + df['ft_per_game']).round(1)
+    df['fg_percent'] = (df['fg_per_game'] / df['fga_per_game']).round(3)
+    df['trb_per_game'] = (df['orb_per_game'] + df['drb_per_game']).round(1)
+    return df
+
+
+def generate_player_stats(scale: int = 1, seed: int = 42) -> pd.DataFrame:
+    """Generate processed player-season rows."""
+    rng = np.random.default_rng(seed + 1)
+    grid = _team_seasons(scale)
+    df = grid.loc[grid.index.repeat(PLAYERS_PER_TEAM)].reset_index(drop=True)
+    n = len(df)
+
+    player_ids = rng.integers(0, max(n // 6, 1), n)
+    df['player_id'] = player_ids
+    df['player'] = [f"Player {i}" for i in player_ids]
+    df['pos'] = rng.choice(['PG', 'SG', 'SF', 'PF', 'C'], n)
+    df['age'] = rng.integers(19, 40, n)
+    df['experience'] = np.clip(df['age'] - 19 - rng.integers(0, 4, n), 1, None)
+    df['lg'] = 'NBA'
+    return df
+
+
+def generate_injuries(scale: int = 1, seed: int = 42) -> pd.DataFrame:
+    """Generate the processed injury summary (year, team, count)."""
+    rng = np.random.default_rng(seed + 2)
+    grid = _team_seasons(scale).rename(columns={'season': 'year'})
+    df = grid.loc[grid.index.repeat(INJURY_ROWS_PER_TEAM)].reset_index(drop=True)
+    df['count'] = rng.poisson(3, len(df))
+    return df
+
+
+def generate_shots(scale: int = 1, seed: int = 42) -> pd.DataFrame:
+    """Generate raw shot-level rows in the mexwell/nba-shots layout."""
+    rng = np.random.default_rng(seed + 3)
+    n = BASE_SHOTS * scale
+
+    season = rng.integers(2004, 2025, n)
+    loc_x = rng.normal(0, 120, n).clip(-250, 250).round(1)
+    loc_y = np.abs(rng.normal(80, 90, n)).clip(0, 420).round(1)
+    distance = (np.sqrt(loc_x ** 2 + loc_y ** 2) / 10).astype(int)
+    zone = rng.integers(0, len(SHOT_ZONES), n)
+    made = rng.random(n) < np.where(distance < 8, 0.62, np.where(distance < 23, 0.41, 0.36))
+    zones = pd.DataFrame(SHOT_ZONES, columns=['BASIC_ZONE', 'ZONE_NAME', 'ZONE_ABB', 'ZONE_RANGE'])
+    team = rng.choice(TEAM_SPELLINGS[1::2], n)
+    dates = pd.to_datetime(season - 1, format='%Y') + pd.to_timedelta(rng.integers(290, 470, n), unit='D')
+
+    df = pd.DataFrame({
+        'SEASON_1': season,
+        'SEASON_2': [f"{s - 1}-{str(s)[-2:]}" for s in season],
+        'TEAM_ID': 1610612700 + rng.integers(37, 67, n),
+        'TEAM_NAME': team,
+        'PLAYER_ID': rng.integers(1, 1_700_000, n),
+        'PLAYER_NAME': [f"Player {i}" for i in rng.integers(0, 5000, n)],
+        'POSITION_GROUP': rng.choice(['G', 'F', 'C'], n),
+        'POSITION': rng.choice(['PG', 'SG', 'SF', 'PF', 'C'], n),
+        'GAME_DATE': dates.strftime('%m-%d-%Y'),
+        'GAME_ID': rng.integers(20400001, 22401230, n),
+        'HOME_TEAM': rng.choice(TEAM_CODES, n),
+        'AWAY_TEAM': rng.choice(TEAM_CODES, n),
+        'EVENT_TYPE': np.where(made, 'Made Shot', 'Missed Shot'),
+        'SHOT_MADE': made,
+        'ACTION_TYPE': rng.choice(['Jump Shot', 'Layup Shot', 'Dunk Shot', 'Pullup Jump Shot'], n),
+        'SHOT_TYPE': np.where(distance >= 23, '3PT Field Goal', '2PT Field Goal'),
+        'LOC_X': loc_x,
+        'LOC_Y': loc_y,
+        'SHOT_DISTANCE': distance,
+        'QUARTER': rng.integers(1, 5, n),
+        'MINS_LEFT': rng.integers(0, 12, n),
+        'SECS_LEFT': rng.integers(0, 60, n)
+    })
+    zone_cols = zones.iloc[zone].reset_index(drop=True)
+    return pd.concat([df.iloc[:, :16], zone_cols, df.iloc[:, 16:]], axis=1)
+
+
+def generate_datasets(scale: int = 1, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Generate every synthetic table at the given scale.
+
+    Args:
+        scale: Size multiplier (1, 10, 100, 1000, ...)
+        seed: Random seed; the same seed and scale always give the same tables
+
+    Returns:
+        Dict with 'team_stats', 'player_stats', 'injuries' and 'shots'
+    """
+    return {
+        'team_stats': generate_team_stats(scale, seed),
+        'player_stats': generate_player_stats(scale, seed),
+        'injuries': generate_injuries(scale, seed),
+        'shots': generate_shots(scale, seed)
+    }
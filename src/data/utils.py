@@ -4,6 +4,8 @@ import logging
 from datetime import datetime
 import pandas as pd
 
+from .storage import save_partitioned
+
 def setup_logging(logging_level=logging.INFO):
     """Configure logging with timestamp and formatting"""
     logging.basicConfig(
@@ -62,11 +64,22 @@ def validate_dataframe(df, name, required_columns=None):
     
     return True
 
-def save_data(df, directory, name, validate_cols=None):
-    """Save data with validation and timestamping"""
+def save_data(df, directory, name, validate_cols=None, file_format='csv', partition_col='season'):
+    """
+    Save data with validation and timestamping.
+
+    With file_format='parquet' the data is written as a columnar dataset
+    partitioned on partition_col (e.g. 'year' for injuries_summary) under
+    directory/name instead of a date-stamped CSV.
+    """
     try:
         validate_dataframe(df, name, validate_cols)
         
+        if file_format == 'parquet':
+            return save_partitioned(df, directory, name, partition_col=partition_col)
+        if file_format != 'csv':
+            raise ValueError(f"Unsupported file format: {file_format}")
+        
         date_str = datetime.now().strftime('%Y%m%d')
         output_path = Path(directory) / f"{name}_{date_str}.csv"
         
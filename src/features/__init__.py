@@ -1,3 +1,9 @@
 from .feature_builder import FeatureBuilder
+from .feature_matrix import FeatureMatrix
+from .feature_store import FeatureStore
+from .incremental import IncrementalFeatureBuilder
+from .shot_profiles import ShotProfileAggregator
+from .temporal import TemporalFeatureBuilder
 
-__all__ = ['FeatureBuilder']
+__all__ = ['FeatureBuilder', 'FeatureMatrix', 'FeatureStore', 'IncrementalFeatureBuilder',
+           'ShotProfileAggregator', 'TemporalFeatureBuilder']
@@ -7,11 +7,44 @@ creating features for clustering, dimensionality reduction, and anomaly detectio
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..data.cleaners.nba_data_cleaner import TEAM_MAPPINGS
+from ..data.cleaners.team_resolver import TeamNameResolver
+from ..data.franchises import FranchiseTable
+from .feature_graph import PATTERN_FEATURES, STYLE_FEATURES, TEAM_FEATURE_GRAPH
+from .feature_matrix import write_feature_matrix
+from .grouped_stats import GroupedStats
+from .keys import TeamSeasonIndex, align_keys
+from .shot_profiles import shot_profile_features
+from .temporal import TemporalFeatureBuilder
+
+BACKENDS = ('pandas', 'numpy')
 
 class FeatureBuilder:
-    def __init__(self):
-        """Initialize the FeatureBuilder with required column definitions."""
+    def __init__(self, backend: str = 'pandas', franchises: Optional[FranchiseTable] = None):
+        """
+        Initialize the FeatureBuilder with required column definitions.
+        
+        Args:
+            backend: How team features are evaluated: 'pandas' (column
+                     expressions) or 'numpy' (in-place kernels over a single
+                     float matrix). Both give identical results
+            franchises: Table resolving teams to franchises per season, e.g.
+                        NBACleaner().franchises. Defaults to one over the
+                        cleaner's team mappings, so both resolve names alike
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Available backends: {list(BACKENDS)}")
+        self.backend = backend
         self.feature_stats = {}
+        # Stable integer team codes and per-block fill values, reused across calls.
+        # Teams are keyed by franchise per season, as the cleaner resolves them
+        if franchises is None:
+            franchises = FranchiseTable(TeamNameResolver(TEAM_MAPPINGS))
+        self.key_index = TeamSeasonIndex(franchises=franchises)
+        self.fill_stats: Dict[str, Dict[str, float]] = {}
+        self.temporal: Optional[TemporalFeatureBuilder] = None
         
         # Define required columns for each data source
         self._required_team_cols = [
@@ -35,40 +68,94 @@ class FeatureBuilder:
         if missing_cols:
             raise ValueError(f"Missing required columns in {source} data: {missing_cols}")
 
-    def create_style_features(self, team_stats: pd.DataFrame) -> pd.DataFrame:
-        """Create features that capture team playing styles and strategies."""
-        self._validate_columns(team_stats, self._required_team_cols, "team")
-        df = team_stats.copy()
-        
-        # Offensive style features
-        df['pace_factor'] = (
-            df['fga_per_game'] + 
-            0.44 * df['fta_per_game'] - 
-            df['orb_per_game'] + 
-            df['tov_per_game']
-        )
-        df['three_point_rate'] = df['x3pa_per_game'] / df['fga_per_game']
-        df['assist_rate'] = df['ast_per_game'] / df['fg_per_game']
+    @staticmethod
+    def stat_matrix(team_stats: pd.DataFrame, columns: List[str]) -> np.ndarray:
+        """
+        Load stat columns into one contiguous column-major float array.
         
-        # Defensive style features
-        df['defensive_pressure'] = df['stl_per_game'] + df['blk_per_game']
-        df['paint_protection'] = df['blk_per_game'] / (df['fga_per_game'] - df['x3pa_per_game'])
-        df['transition_rate'] = df['stl_per_game'] / df['tov_per_game']
+        Float columns keep their precision (float32 stays float32); anything
+        else is promoted to float64, as pandas does for division.
+        """
+        dtype = np.result_type(*[team_stats[col].dtype for col in columns]) if columns else np.float64
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        matrix = np.empty((len(team_stats), len(columns)), dtype=dtype, order='F')
+        for j, col in enumerate(columns):
+            matrix[:, j] = team_stats[col].to_numpy(dtype=dtype)
+        return matrix
+
+    def _compute_team_features(self, team_stats: pd.DataFrame, features: List[str],
+                               keep_columns: bool, backend: Optional[str] = None) -> pd.DataFrame:
+        """Evaluate team features through the feature graph."""
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Available backends: {list(BACKENDS)}")
+        inputs = TEAM_FEATURE_GRAPH.input_columns(features)
+        self._validate_columns(team_stats, ['team', 'season'] + inputs, "team")
+        
+        base = team_stats if keep_columns else team_stats[['team', 'season']]
+        if backend == 'numpy':
+            matrix = self.stat_matrix(team_stats, inputs)
+            out = TEAM_FEATURE_GRAPH.evaluate_matrix(
+                {col: matrix[:, j] for j, col in enumerate(inputs)}, features, dtype=matrix.dtype,
+                n_rows=len(team_stats)
+            )
+            if not base.columns.isin(features).any():
+                # Attach the output matrix as a single block instead of column by column
+                block = pd.DataFrame(out, index=team_stats.index, columns=features, copy=False)
+                df = pd.concat([base, block], axis=1)
+                return df[['team', 'season'] + [col for col in df.columns if col not in ['team', 'season']]]
+            values = {name: out[:, j] for j, name in enumerate(features)}
+        else:
+            values = TEAM_FEATURE_GRAPH.evaluate(team_stats, features)
+        
+        df = base.copy()
+        for name in features:
+            df[name] = values[name]
+        
+        return df[['team', 'season'] + [col for col in df.columns if col not in ['team', 'season']]]
+
+    def build(self, team_stats: pd.DataFrame, features: Optional[List[str]] = None,
+              keep_columns: bool = False, backend: Optional[str] = None) -> pd.DataFrame:
+        """
+        Compute only the requested team features.
         
-        # Ball movement features
-        df['ball_control'] = df['ast_per_game'] / df['tov_per_game']
-        df['passing_efficiency'] = df['ast_per_game'] / df['fga_per_game']
+        Features are resolved through the feature graph, so shared
+        sub-expressions are computed once and unrequested features are skipped.
         
-        # Shot selection features
-        df['inside_focus'] = (df['fga_per_game'] - df['x3pa_per_game']) / df['fga_per_game']
-        df['free_throw_rate'] = df['fta_per_game'] / df['fga_per_game']
+        Args:
+            team_stats: Team per-game statistics
+            features: Style and/or pattern feature names. If None, computes all of them
+            keep_columns: Keep every input column rather than only team and season
+            backend: 'pandas' or 'numpy'. Defaults to the builder's backend
+        
+        Returns:
+            DataFrame with team, season and the requested features, in request order
+        """
+        features = list(features) if features is not None else TEAM_FEATURE_GRAPH.features
+        backend = backend or self.backend
+        df = self._compute_team_features(team_stats, features, keep_columns, backend)
+        
+        self.feature_stats['built_features'] = {
+            'n_features': len(features),
+            'n_samples': len(df),
+            'backend': backend,
+            'evaluated_nodes': list(TEAM_FEATURE_GRAPH.last_evaluated)
+        }
+        
+        return df
+
+    def create_style_features(self, team_stats: pd.DataFrame) -> pd.DataFrame:
+        """Create features that capture team playing styles and strategies."""
+        self._validate_columns(team_stats, self._required_team_cols, "team")
+        df = self._compute_team_features(team_stats, STYLE_FEATURES, keep_columns=True)
         
         self.feature_stats['style_features'] = {
             'n_features': len(df.columns),
             'n_samples': len(df)
         }
         
-        return df[['team', 'season'] + [col for col in df.columns if col not in ['team', 'season']]]
+        return df
 
     def create_composition_features(self, player_stats: pd.DataFrame, injuries: pd.DataFrame) -> pd.DataFrame:
         """Create features that describe team roster composition."""
@@ -79,30 +166,37 @@ class FeatureBuilder:
         player_stats = player_stats.copy()
         injuries = injuries.copy()
         
+        # Roster, experience and age statistics in a single grouped pass
+        stats = GroupedStats.compute(
+            player_stats, ['team', 'season'],
+            moment_cols=['experience', 'age'],
+            distinct_cols=['player']
+        )
+        
         # Calculate roster stability
-        roster_changes = player_stats.groupby(['team', 'season'])['player'].agg([
-            ('roster_size', 'count'),
-            ('unique_players', 'nunique')
-        ])
+        roster_changes = pd.DataFrame({
+            'roster_size': stats.count('player'),
+            'unique_players': stats.nunique('player')
+        })
         roster_changes['roster_stability'] = roster_changes['roster_size'] / roster_changes['unique_players']
         
         # Experience distribution features
-        exp_stats = player_stats.groupby(['team', 'season'])['experience'].agg([
-            ('experience_mean', 'mean'),
-            ('experience_var', 'var'),
-            ('experience_skew', lambda x: x.skew())
-        ]).fillna(0)
+        exp_stats = pd.concat([
+            stats.mean('experience'),
+            stats.var('experience'),
+            stats.skew('experience')
+        ], axis=1).fillna(0)
         
         # Age distribution features
-        age_stats = player_stats.groupby(['team', 'season'])['age'].agg([
-            ('age_mean', 'mean'),
-            ('age_var', 'var'),
-            ('age_skew', lambda x: x.skew())
-        ]).fillna(0)
+        age_stats = pd.concat([
+            stats.mean('age'),
+            stats.var('age'),
+            stats.skew('age')
+        ], axis=1).fillna(0)
         
         # Injury features
         injuries = injuries.rename(columns={'year': 'season'})
-        injury_stats = injuries.groupby(['team', 'season']).agg({
+        injury_stats = injuries.groupby(['team', 'season'], observed=True).agg({
             'count': ['sum', 'mean']
         }).fillna(0)
         injury_stats.columns = ['injury_total', 'injury_rate']
@@ -128,80 +222,155 @@ class FeatureBuilder:
     def create_pattern_features(self, team_stats: pd.DataFrame) -> pd.DataFrame:
         """Create features that capture team performance patterns."""
         self._validate_columns(team_stats, self._required_team_cols, "team")
-        df = team_stats.copy()
-        
-        # Efficiency features
-        df['true_shooting'] = df['pts_per_game'] / (2 * (df['fga_per_game'] + 0.44 * df['fta_per_game']))
-        df['off_efficiency'] = df['pts_per_game'] / (
-            df['fga_per_game'] + 
-            0.44 * df['fta_per_game'] - 
-            df['orb_per_game'] + 
-            df['tov_per_game']
-        )
-        df['def_efficiency'] = (df['stl_per_game'] + df['blk_per_game']) / df['tov_per_game']
-        
-        # Performance consistency features
-        df['scoring_consistency'] = df['pts_per_game'] / df['fga_per_game']
-        df['defensive_consistency'] = (df['stl_per_game'] + df['blk_per_game']) / df['tov_per_game']
-        
-        # Strategic tendency features
-        df['inside_outside_balance'] = df['x3pa_per_game'] / (df['fga_per_game'] - df['x3pa_per_game'])
-        df['playmaking_tendency'] = df['ast_per_game'] / (df['fga_per_game'] + df['fta_per_game'])
-        
-        # Create composite scores
-        df['offensive_rating'] = (
-            0.4 * df['true_shooting'] +
-            0.3 * df['off_efficiency'] +
-            0.3 * df['scoring_consistency']
-        )
-        df['defensive_rating'] = (
-            0.4 * df['def_efficiency'] +
-            0.3 * df['defensive_consistency'] +
-            0.3 * (df['stl_per_game'] + df['blk_per_game'])
-        )
-        df['consistency_score'] = (
-            df['offensive_rating'] * df['defensive_rating']
-        )
+        df = self._compute_team_features(team_stats, PATTERN_FEATURES, keep_columns=True)
         
         self.feature_stats['pattern_features'] = {
             'n_features': len(df.columns),
             'n_samples': len(df)
         }
         
-        return df[['team', 'season'] + [col for col in df.columns if col not in ['team', 'season']]]
+        return df
+
+    def create_shot_features(self, shot_counts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create shot profile features: per team-season shot-zone, distance and
+        location frequencies and make rates.
+        
+        Args:
+            shot_counts: Team-season shot counts from ShotProfileAggregator,
+                         which streams the shot-level files
+        """
+        df = shot_profile_features(shot_counts)
+        
+        self.feature_stats['shot_features'] = {
+            'n_features': len(df.columns) - 2,  # Exclude team and season
+            'n_samples': len(df),
+            'n_shots': int(df['shot_attempts'].sum())
+        }
+        
+        return df
+
+    def create_temporal_features(self, features: pd.DataFrame, columns: List[str],
+                                 lags: List[int] = (1,), windows: List[int] = (3,)) -> pd.DataFrame:
+        """
+        Create season-over-season features per team: lags, deltas and rolling
+        means and standard deviations of the given columns.
+        
+        The returned frame has team and season plus the temporal features and
+        can be merged onto any feature block. The TemporalFeatureBuilder used
+        is kept in `self.temporal` so new seasons can be added with append().
+        """
+        self._validate_columns(features, ['team', 'season'] + list(columns), "temporal")
+        self.temporal = TemporalFeatureBuilder(columns, lags=lags, windows=windows)
+        df = self.temporal.fit_transform(features)
+        
+        self.feature_stats['temporal_features'] = {
+            'n_features': len(self.temporal.output_columns),
+            'n_samples': len(df),
+            'lags': list(self.temporal.lags),
+            'windows': list(self.temporal.windows)
+        }
+        
+        return df
 
     def combine_features(self, style_features: pd.DataFrame, composition_features: pd.DataFrame,
-                        pattern_features: pd.DataFrame) -> pd.DataFrame:
-        """Combine all feature sets for unsupervised learning analysis."""
-        # Create copies to avoid modifying originals
-        style_features = style_features.copy()
-        composition_features = composition_features.copy()
-        pattern_features = pattern_features.copy()
-        
-        # Ensure team and season columns are the correct type
-        for df in [style_features, composition_features, pattern_features]:
-            df['team'] = df['team'].astype(str)
-            df['season'] = df['season'].astype(int)
-        
-        # Merge all features
-        features = style_features.merge(
-            composition_features,
-            on=['team', 'season'],
-            how='left'
-        ).merge(
-            pattern_features,
-            on=['team', 'season'],
-            how='left'
-        )
+                        pattern_features: pd.DataFrame,
+                        fill_stats: Optional[Dict[str, Dict[str, float]]] = None,
+                        matrix_path: Optional[str] = None, standardize: bool = False) -> pd.DataFrame:
+        """
+        Combine all feature sets for unsupervised learning analysis.
+        
+        Composition and pattern features are left-joined onto the style
+        features through packed team-season keys, built from each row's
+        franchise in its season, so renamed or relocated teams still align.
+        The team column keeps the style features' names. Missing values are filled
+        per block with the block's column means, which are kept in
+        `fill_stats` so new seasons can be filled with the same values.
         
-        # Handle missing values
-        numeric_cols = features.select_dtypes(include=['int64', 'float64']).columns
-        features[numeric_cols] = features[numeric_cols].fillna(features[numeric_cols].mean())
+        Args:
+            style_features: Output of create_style_features
+            composition_features: Output of create_composition_features
+            pattern_features: Output of create_pattern_features
+            fill_stats: Block name -> column -> fill value, e.g. a previous
+                        `builder.fill_stats`. Columns it does not cover are
+                        filled with their mean. If None, means are computed
+                        and stored in `self.fill_stats`
+            matrix_path: If given, also write the numeric features as a
+                         memory-mapped float32 matrix there (see FeatureMatrix)
+            standardize: Also store the standardized matrix and its scaler
+        
+        Returns:
+            DataFrame with one row per style feature row, in the same order
+        """
+        blocks = {
+            'style': style_features,
+            'composition': composition_features,
+            'pattern': pattern_features
+        }
+        
+        # Team as strings and season as integers, keeping compact dtypes
+        team = style_features['team']
+        if not isinstance(team.dtype, pd.CategoricalDtype):
+            team = team.astype(str)
+        season = style_features['season']
+        if not pd.api.types.is_integer_dtype(season):
+            season = season.astype(int)
+        left_keys = self.key_index.encode(team, season)
+        
+        columns = {'team': team, 'season': season}
+        new_stats = {}
+        unmatched = {}
+        for name, block in blocks.items():
+            if name == 'style':
+                indexer = None
+            else:
+                right_team = block['team']
+                if not isinstance(right_team.dtype, pd.CategoricalDtype):
+                    right_team = right_team.astype(str)
+                right_keys = self.key_index.encode(right_team, block['season'].astype(int))
+                indexer = align_keys(left_keys, right_keys)
+                unmatched[name] = int((indexer < 0).sum())
+            
+            aligned = {}
+            for col in block.columns:
+                if col in ('team', 'season'):
+                    continue
+                if indexer is None:
+                    values = block[col]
+                else:
+                    source = block[col]
+                    array = (source.array if isinstance(source.dtype, pd.api.extensions.ExtensionDtype)
+                             else source.to_numpy())
+                    values = pd.api.extensions.take(array, indexer, allow_fill=True)
+                aligned[col] = pd.Series(values, index=style_features.index, name=col, copy=False)
+            
+            # Fill missing values with this block's statistics
+            numeric = [col for col, values in aligned.items() if pd.api.types.is_numeric_dtype(values)
+                       and not pd.api.types.is_bool_dtype(values)]
+            block_stats = (fill_stats or {}).get(name, {})
+            means = {col: block_stats[col] if col in block_stats else aligned[col].mean() for col in numeric}
+            new_stats[name] = means
+            for col in numeric:
+                if aligned[col].isnull().any():
+                    aligned[col] = aligned[col].fillna(means[col])
+            
+            # Overlapping column names get the same suffixes as a merge would add
+            overlap = [col for col in aligned if col in columns]
+            if overlap:
+                columns = {f"{col}_x" if col in overlap else col: values for col, values in columns.items()}
+                aligned = {f"{col}_y" if col in overlap else col: values for col, values in aligned.items()}
+            columns.update(aligned)
+        
+        if fill_stats is None:
+            self.fill_stats = new_stats
+        features = pd.DataFrame(columns, index=style_features.index, copy=False)
+        features = features.reset_index(drop=True)
         
         # Update feature statistics
         self.feature_stats['combined_features'] = {
             'n_features': len(features.columns) - 2,  # Exclude team and season
             'n_samples': len(features),
+            'unmatched_rows': unmatched,
             'feature_names': list(features.columns),
             'feature_types': {
                 'style': list(style_features.columns),
@@ -210,4 +379,8 @@ class FeatureBuilder:
             }
         }
         
+        if matrix_path is not None:
+            write_feature_matrix(features, matrix_path, standardize=standardize, key_index=self.key_index)
+            self.feature_stats['combined_features']['matrix_path'] = str(matrix_path)
+        
         return features
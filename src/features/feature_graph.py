@@ -0,0 +1,298 @@
+"""
+Lazy feature graph for team style and pattern features.
+
+Every derived feature is declared as a named expression over its inputs, which
+are either team stat columns or other features. Evaluating a set of requested
+features resolves only the part of the graph they need, computes each shared
+sub-expression (such as the possession estimate) once, and skips the rest.
+
+Each node also carries an in-place NumPy kernel. evaluate_matrix() uses the
+kernels to write every requested feature straight into a preallocated output
+matrix, performing the same floating point operations in the same order as
+the pandas expressions, so both backends give identical results.
+"""
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+class FeatureNode:
+    """A named expression with explicit dependencies."""
+
+    def __init__(self, name: str, deps: Sequence[str], func: Callable,
+                 kernel: Optional[Callable] = None, intermediate: bool = False):
+        """
+        Args:
+            name: Feature name
+            deps: Names of the input columns or features the expression uses
+            func: Callable taking the dependency values, in order
+            kernel: Callable (out, scratch, *deps) writing the same expression
+                    into the array `out`, using `scratch` for temporaries
+            intermediate: Shared sub-expression that is not a feature on its own
+        """
+        self.name = name
+        self.deps = list(deps)
+        self.func = func
+        self.kernel = kernel
+        self.intermediate = intermediate
+
+
+class FeatureGraph:
+    """Dependency graph of feature expressions."""
+
+    def __init__(self):
+        self.nodes: Dict[str, FeatureNode] = {}
+        self.last_evaluated: List[str] = []
+
+    def add(self, name: str, deps: Sequence[str], func: Callable, kernel: Optional[Callable] = None,
+            intermediate: bool = False) -> None:
+        """Declare a feature; dependencies not declared in the graph are input columns."""
+        if name in self.nodes:
+            raise ValueError(f"Feature already defined: {name}")
+        self.nodes[name] = FeatureNode(name, deps, func, kernel, intermediate)
+
+    def alias(self, name: str, target: str) -> None:
+        """Declare a feature that is identical to another one."""
+        self.add(name, [target], lambda value: value,
+                 kernel=lambda out, scratch, value: np.copyto(out, value))
+
+    @property
+    def features(self) -> List[str]:
+        """Names of all non-intermediate features, in declaration order."""
+        return [name for name, node in self.nodes.items() if not node.intermediate]
+
+    def resolve(self, requested: Iterable[str]) -> List[str]:
+        """
+        Order the nodes needed for the requested features so dependencies come first.
+
+        Raises:
+            ValueError: If a requested name is not a feature of the graph, or
+                        the graph has a cycle
+        """
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str) -> None:
+            if name not in self.nodes or state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Cycle in feature graph at {name}")
+            state[name] = 'visiting'
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in requested:
+            if name not in self.nodes:
+                raise ValueError(f"Unknown feature: {name}")
+            visit(name)
+        return order
+
+    def input_columns(self, requested: Iterable[str]) -> List[str]:
+        """Input columns the requested features depend on."""
+        columns = []
+        for name in self.resolve(requested):
+            for dep in self.nodes[name].deps:
+                if dep not in self.nodes and dep not in columns:
+                    columns.append(dep)
+        return columns
+
+    def evaluate(self, inputs: Mapping, requested: Sequence[str]) -> Dict:
+        """
+        Compute the requested features.
+
+        Args:
+            inputs: Mapping of input column name to values (e.g. a DataFrame)
+            requested: Feature names to compute
+
+        Returns:
+            Dict of requested feature name to computed values
+        """
+        values = {}
+        order = self.resolve(requested)
+        for name in order:
+            node = self.nodes[name]
+            args = [values[dep] if dep in values else inputs[dep] for dep in node.deps]
+            values[name] = node.func(*args)
+
+        self.last_evaluated = order
+        return {name: values[name] for name in requested}
+
+    def evaluate_matrix(self, inputs: Mapping[str, np.ndarray], requested: Sequence[str],
+                        out: Optional[np.ndarray] = None, dtype=np.float64,
+                        n_rows: Optional[int] = None) -> np.ndarray:
+        """
+        Compute the requested features into a preallocated matrix with NumPy kernels.
+
+        Division by zero follows IEEE rules, as in pandas: x / 0 is +/-inf and
+        0 / 0 is NaN.
+
+        Args:
+            inputs: Mapping of input column name to 1-D arrays of equal length
+            requested: Feature names to compute
+            out: Optional (n_rows, len(requested)) output array to fill
+            dtype: Output dtype if `out` is not given
+            n_rows: Number of rows. Defaults to the rows of `out`, or the length
+                    of the input columns the requested features use
+
+        Returns:
+            Array whose j-th column holds requested[j]
+
+        Raises:
+            ValueError: If the number of rows cannot be determined or the
+                        input columns differ in length
+        """
+        order = self.resolve(requested)
+        lengths = {len(inputs[col]) for col in self.input_columns(requested)}
+        if n_rows is None:
+            n_rows = out.shape[0] if out is not None else (lengths.pop() if len(lengths) == 1 else None)
+        if n_rows is None or lengths - {n_rows}:
+            raise ValueError(f"Cannot evaluate {len(requested)} features over input columns "
+                             f"of lengths {sorted(lengths)} (n_rows={n_rows})")
+        if out is None:
+            out = np.empty((n_rows, len(requested)), dtype=dtype, order='F')
+
+        slots = {name: out[:, j] for j, name in enumerate(requested)}
+        # Intermediates that were not requested get their own buffers
+        for name in order:
+            if name not in slots:
+                slots[name] = np.empty(n_rows, dtype=out.dtype)
+        scratch = np.empty(n_rows, dtype=out.dtype)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name in order:
+                node = self.nodes[name]
+                if node.kernel is None:
+                    raise ValueError(f"Feature {name} has no NumPy kernel")
+                args = [slots[dep] if dep in slots else inputs[dep] for dep in node.deps]
+                node.kernel(slots[name], scratch, *args)
+
+        self.last_evaluated = order
+        return out
+
+
+def _ratio(out, scratch, num, den):
+    np.divide(num, den, out=out)
+
+
+def _weighted_sum(weights):
+    """Kernel for sum(w * x) evaluated left to right, as the pandas expression is."""
+    def kernel(out, scratch, *values):
+        np.multiply(values[0], weights[0], out=out)
+        for weight, value in zip(weights[1:], values[1:]):
+            np.multiply(value, weight, out=scratch)
+            np.add(out, scratch, out=out)
+    return kernel
+
+
+def _possessions(out, scratch, fga, fta, orb, tov):
+    np.multiply(fta, 0.44, out=out)
+    np.add(fga, out, out=out)
+    np.subtract(out, orb, out=out)
+    np.add(out, tov, out=out)
+
+
+def _true_shooting(out, scratch, pts, fga, fta):
+    np.multiply(fta, 0.44, out=out)
+    np.add(fga, out, out=out)
+    np.multiply(out, 2, out=out)
+    np.divide(pts, out, out=out)
+
+
+def _playmaking(out, scratch, ast, fga, fta):
+    np.add(fga, fta, out=out)
+    np.divide(ast, out, out=out)
+
+
+def build_team_feature_graph() -> FeatureGraph:
+    """Declare the team style and pattern features."""
+    graph = FeatureGraph()
+
+    # Shared sub-expressions
+    graph.add('possessions', ['fga_per_game', 'fta_per_game', 'orb_per_game', 'tov_per_game'],
+              lambda fga, fta, orb, tov: fga + 0.44 * fta - orb + tov,
+              kernel=_possessions, intermediate=True)
+    graph.add('two_point_attempts', ['fga_per_game', 'x3pa_per_game'],
+              lambda fga, x3pa: fga - x3pa,
+              kernel=lambda out, scratch, fga, x3pa: np.subtract(fga, x3pa, out=out),
+              intermediate=True)
+    graph.add('stocks', ['stl_per_game', 'blk_per_game'],
+              lambda stl, blk: stl + blk,
+              kernel=lambda out, scratch, stl, blk: np.add(stl, blk, out=out),
+              intermediate=True)
+
+    # Offensive style features
+    graph.alias('pace_factor', 'possessions')
+    graph.add('three_point_rate', ['x3pa_per_game', 'fga_per_game'], lambda x3pa, fga: x3pa / fga,
+              kernel=_ratio)
+    graph.add('assist_rate', ['ast_per_game', 'fg_per_game'], lambda ast, fg: ast / fg,
+              kernel=_ratio)
+
+    # Defensive style features
+    graph.alias('defensive_pressure', 'stocks')
+    graph.add('paint_protection', ['blk_per_game', 'two_point_attempts'], lambda blk, two: blk / two,
+              kernel=_ratio)
+    graph.add('transition_rate', ['stl_per_game', 'tov_per_game'], lambda stl, tov: stl / tov,
+              kernel=_ratio)
+
+    # Ball movement features
+    graph.add('ball_control', ['ast_per_game', 'tov_per_game'], lambda ast, tov: ast / tov,
+              kernel=_ratio)
+    graph.add('passing_efficiency', ['ast_per_game', 'fga_per_game'], lambda ast, fga: ast / fga,
+              kernel=_ratio)
+
+    # Shot selection features
+    graph.add('inside_focus', ['two_point_attempts', 'fga_per_game'], lambda two, fga: two / fga,
+              kernel=_ratio)
+    graph.add('free_throw_rate', ['fta_per_game', 'fga_per_game'], lambda fta, fga: fta / fga,
+              kernel=_ratio)
+
+    # Efficiency features
+    graph.add('true_shooting', ['pts_per_game', 'fga_per_game', 'fta_per_game'],
+              lambda pts, fga, fta: pts / (2 * (fga + 0.44 * fta)), kernel=_true_shooting)
+    graph.add('off_efficiency', ['pts_per_game', 'possessions'], lambda pts, poss: pts / poss,
+              kernel=_ratio)
+    graph.add('def_efficiency', ['stocks', 'tov_per_game'], lambda stocks, tov: stocks / tov,
+              kernel=_ratio)
+
+    # Performance consistency features
+    graph.add('scoring_consistency', ['pts_per_game', 'fga_per_game'], lambda pts, fga: pts / fga,
+              kernel=_ratio)
+    graph.alias('defensive_consistency', 'def_efficiency')
+
+    # Strategic tendency features
+    graph.add('inside_outside_balance', ['x3pa_per_game', 'two_point_attempts'],
+              lambda x3pa, two: x3pa / two, kernel=_ratio)
+    graph.add('playmaking_tendency', ['ast_per_game', 'fga_per_game', 'fta_per_game'],
+              lambda ast, fga, fta: ast / (fga + fta), kernel=_playmaking)
+
+    # Composite scores
+    graph.add('offensive_rating', ['true_shooting', 'off_efficiency', 'scoring_consistency'],
+              lambda ts, off, scoring: 0.4 * ts + 0.3 * off + 0.3 * scoring,
+              kernel=_weighted_sum([0.4, 0.3, 0.3]))
+    graph.add('defensive_rating', ['def_efficiency', 'defensive_consistency', 'stocks'],
+              lambda deff, dcons, stocks: 0.4 * deff + 0.3 * dcons + 0.3 * stocks,
+              kernel=_weighted_sum([0.4, 0.3, 0.3]))
+    graph.add('consistency_score', ['offensive_rating', 'defensive_rating'],
+              lambda off, dfn: off * dfn,
+              kernel=lambda out, scratch, off, dfn: np.multiply(off, dfn, out=out))
+
+    return graph
+
+
+TEAM_FEATURE_GRAPH = build_team_feature_graph()
+
+STYLE_FEATURES = [
+    'pace_factor', 'three_point_rate', 'assist_rate',
+    'defensive_pressure', 'paint_protection', 'transition_rate',
+    'ball_control', 'passing_efficiency',
+    'inside_focus', 'free_throw_rate'
+]
+
+PATTERN_FEATURES = [
+    'true_shooting', 'off_efficiency', 'def_efficiency',
+    'scoring_consistency', 'defensive_consistency',
+    'inside_outside_balance', 'playmaking_tendency',
+    'offensive_rating', 'defensive_rating', 'consistency_score'
+]
@@ -0,0 +1,255 @@
+"""
+Memory-mapped feature matrices for the analysis stages.
+
+write_feature_matrix() stores the numeric columns of a combined feature frame
+as a column-major float32 .npy file, next to a sidecar with the column names
+and the packed team-season key of every row:
+
+    <path>/<version>/matrix.npy        float32, Fortran order, (n_rows, n_features)
+    <path>/<version>/standardized.npy  optional, (x - mean) / scale of matrix.npy
+    <path>/<version>/keys.npy          int64 packed team-season keys, one per row
+    <path>/<version>/meta.json         columns, team vocabulary and scaler parameters
+    <path>/CURRENT                     name of the version readers open
+
+Each write adds a new version directory and switches CURRENT atomically.
+
+FeatureMatrix.open() maps the files read-only, so any number of processes
+share one copy through the page cache and can start model fitting without
+parsing or rescaling anything.
+"""
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .keys import TeamSeasonIndex
+
+MATRIX_FILE = 'matrix.npy'
+STANDARDIZED_FILE = 'standardized.npy'
+KEYS_FILE = 'keys.npy'
+META_FILE = 'meta.json'
+CURRENT_FILE = 'CURRENT'
+LEGACY_FILES = {MATRIX_FILE, STANDARDIZED_FILE, KEYS_FILE, META_FILE}
+
+
+def matrix_columns(features: pd.DataFrame) -> List[str]:
+    """Numeric feature columns, excluding the team and season keys."""
+    return [
+        col for col in features.select_dtypes(include=[np.number]).columns
+        if col not in ('team', 'season')
+    ]
+
+
+def scaler_params(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-column mean and scale, as StandardScaler computes them.
+
+    The scale is the population standard deviation, or 1 for constant
+    columns. Non-finite values are ignored.
+    """
+    n_cols = matrix.shape[1]
+    mean = np.zeros(n_cols)
+    scale = np.ones(n_cols)
+    for j in range(n_cols):
+        column = np.asarray(matrix[:, j], dtype=np.float64)
+        finite = column[np.isfinite(column)]
+        if len(finite):
+            mean[j] = finite.mean()
+            std = finite.std()
+            scale[j] = std if std > 0 else 1.0
+    return mean, scale
+
+
+def _current_version(path: Path) -> Optional[Path]:
+    """Version directory the CURRENT pointer of a matrix directory names, if any."""
+    pointer = path / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    name = pointer.read_text().strip()
+    return path / name if name else None
+
+
+def write_feature_matrix(features: pd.DataFrame, path, columns: Optional[Sequence[str]] = None,
+                         standardize: bool = False,
+                         key_index: Optional[TeamSeasonIndex] = None) -> str:
+    """
+    Write a feature frame as a memory-mappable float32 matrix.
+
+    Every write creates a new, immutable version directory under `path`,
+    assembled under a temporary name and renamed into place, then switches
+    the CURRENT pointer to it with one atomic replace. Readers resolve
+    CURRENT once and read every file from that version, so they see either
+    the old or the new matrix, never a mix. The previous version is kept for
+    readers that resolved it just before the switch; older ones are removed.
+
+    Args:
+        features: Frame with team, season and feature columns
+        path: Matrix directory
+        columns: Feature columns to store. Defaults to every numeric column
+        standardize: Also store the standardized matrix. Mean and scale
+                     follow StandardScaler (population standard deviation,
+                     scale 1 for constant columns) and ignore non-finite values
+        key_index: Index used to pack the keys, e.g. FeatureBuilder.key_index
+
+    Returns:
+        The matrix directory
+    """
+    path = Path(path)
+    columns = list(columns) if columns is not None else matrix_columns(features)
+    key_index = key_index if key_index is not None else TeamSeasonIndex()
+    n_rows, n_cols = len(features), len(columns)
+
+    path.mkdir(parents=True, exist_ok=True)
+    # Names sort by creation time, so pruning never removes a version newer than CURRENT's
+    version = f"v-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    tmp_path = path / f".{version}.tmp"
+    tmp_path.mkdir()
+
+    try:
+        matrix = np.lib.format.open_memmap(tmp_path / MATRIX_FILE, mode='w+', dtype=np.float32,
+                                           shape=(n_rows, n_cols), fortran_order=True)
+        for j, col in enumerate(columns):
+            matrix[:, j] = features[col].to_numpy(dtype=np.float32)
+
+        meta = {
+            'created': datetime.now().isoformat(),
+            'rows': n_rows,
+            'columns': columns,
+            'dtype': 'float32',
+            'order': 'F',
+            'standardized': standardize,
+            'scaler': None
+        }
+
+        if standardize:
+            standardized = np.lib.format.open_memmap(tmp_path / STANDARDIZED_FILE, mode='w+',
+                                                     dtype=np.float32, shape=(n_rows, n_cols),
+                                                     fortran_order=True)
+            mean, scale = scaler_params(matrix)
+            for j in range(n_cols):
+                standardized[:, j] = (matrix[:, j].astype(np.float64) - mean[j]) / scale[j]
+            standardized.flush()
+            del standardized
+            meta['scaler'] = {'mean': mean.tolist(), 'scale': scale.tolist()}
+
+        matrix.flush()
+        del matrix
+
+        np.save(tmp_path / KEYS_FILE, key_index.encode(features['team'], features['season']))
+        # Codes follow insertion order, so the vocabulary is saved in code order
+        meta['teams'] = list(key_index.teams)
+        with open(tmp_path / META_FILE, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        os.rename(tmp_path, path / version)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    # Switch the pointer, then drop versions older than the one it replaced
+    previous = _current_version(path)
+    pointer_tmp = path / f".{CURRENT_FILE}.{uuid.uuid4().hex}.tmp"
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, path / CURRENT_FILE)
+
+    oldest_kept = min(version, previous.name) if previous is not None else version
+    for child in path.iterdir():
+        if child.is_dir() and child.name.startswith('v-') and child.name < oldest_kept:
+            shutil.rmtree(child, ignore_errors=True)
+        elif child.name in LEGACY_FILES:
+            # Files of the earlier, unversioned layout
+            child.unlink()
+
+    return str(path)
+
+
+class FeatureMatrix:
+    """Read-only, memory-mapped view of a matrix written by write_feature_matrix."""
+
+    def __init__(self, path, values: np.ndarray, keys: np.ndarray, meta: dict,
+                 standardized: Optional[np.ndarray] = None):
+        self.path = Path(path)
+        self.values = values
+        self.keys = keys
+        self.standardized = standardized
+        self.columns: List[str] = meta['columns']
+        self.meta = meta
+        self.key_index = TeamSeasonIndex.from_vocabulary(meta['teams'])
+
+    @classmethod
+    def open(cls, path, standardized: bool = True) -> 'FeatureMatrix':
+        """
+        Map a stored matrix without reading it into memory.
+
+        Args:
+            path: Matrix directory
+            standardized: Also map the standardized matrix, if it was stored
+        """
+        path = Path(path)
+        # Every file comes from the one version CURRENT names; matrices written
+        # before versioning keep their files directly in path
+        version = _current_version(path) or path
+        with open(version / META_FILE) as f:
+            meta = json.load(f)
+        values = np.load(version / MATRIX_FILE, mmap_mode='r')
+        keys = np.load(version / KEYS_FILE, mmap_mode='r')
+        scaled = None
+        if standardized and meta['standardized']:
+            scaled = np.load(version / STANDARDIZED_FILE, mmap_mode='r')
+        return cls(path, values, keys, meta, scaled)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def mean(self) -> Optional[np.ndarray]:
+        scaler = self.meta['scaler']
+        return np.array(scaler['mean']) if scaler else None
+
+    @property
+    def scale(self) -> Optional[np.ndarray]:
+        scaler = self.meta['scaler']
+        return np.array(scaler['scale']) if scaler else None
+
+    def column(self, name: str, standardized: bool = False) -> np.ndarray:
+        """One feature column, as a contiguous view into the mapped file."""
+        source = self.standardized if standardized else self.values
+        if source is None:
+            raise ValueError(f"No standardized matrix stored in {self.path}")
+        return source[:, self.columns.index(name)]
+
+    def select(self, columns: Sequence[str], standardized: bool = False) -> np.ndarray:
+        """A subset of columns; a view when they are adjacent, a copy otherwise."""
+        source = self.standardized if standardized else self.values
+        if source is None:
+            raise ValueError(f"No standardized matrix stored in {self.path}")
+        positions = [self.columns.index(col) for col in columns]
+        if positions == list(range(positions[0], positions[0] + len(positions))):
+            return source[:, positions[0]:positions[0] + len(positions)]
+        return source[:, positions]
+
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        """Standardize new rows (e.g. a new season) with the stored scaler parameters."""
+        if self.meta['scaler'] is None:
+            raise ValueError(f"No scaler parameters stored in {self.path}")
+        return ((np.asarray(values, dtype=np.float64) - self.mean) / self.scale).astype(np.float32)
+
+    def team_seasons(self) -> pd.DataFrame:
+        """Team and season of every row."""
+        teams, seasons = self.key_index.decode(self.keys)
+        return pd.DataFrame({'team': teams, 'season': seasons})
+
+    def to_frame(self, standardized: bool = False) -> pd.DataFrame:
+        """Team, season and feature columns as a DataFrame."""
+        source = self.standardized if standardized else self.values
+        if source is None:
+            raise ValueError(f"No standardized matrix stored in {self.path}")
+        frame = pd.DataFrame(np.asarray(source), columns=self.columns, copy=False)
+        return pd.concat([self.team_seasons(), frame], axis=1)
@@ -0,0 +1,247 @@
+"""
+Versioned store for feature snapshots.
+
+Each save writes an immutable snapshot, stored as a season-partitioned
+Parquet dataset through save_data:
+
+    <root>/<name>/versions/v000001/season=1998/part-0.parquet
+    <root>/<name>/versions/v000001/_snapshot.json
+    <root>/<name>/index.json
+    <root>/<name>/LATEST
+
+A snapshot is written under a temporary name and renamed into place, so
+readers never see a partial one, and two writers can never claim the same
+version. LATEST holds the newest version id and is replaced atomically, so
+resolving the latest snapshot reads one small file instead of scanning the
+directory. index.json lists every version with its creation time, shape and
+input fingerprints; it can be rebuilt from the per-snapshot metadata. Both
+are updated under an exclusive lock on <root>/<name>/.lock, and LATEST is set
+to the highest committed version, so concurrent writers neither drop index
+entries nor move the pointer back.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from ..data.locking import file_lock
+from ..data.storage import SeasonSelector, load_partitioned
+from ..data.utils import save_data
+
+LATEST_FILE = 'LATEST'
+LOCK_FILE = '.lock'
+INDEX_FILE = 'index.json'
+SNAPSHOT_FILE = '_snapshot.json'
+VERSIONS_DIR = 'versions'
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame, independent of where it was loaded from."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _write_json(path: Path, data) -> None:
+    """Write JSON atomically by writing a temporary file and renaming it."""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class FeatureStore:
+    """Immutable, versioned feature snapshots with an atomic latest pointer."""
+
+    def __init__(self, root: str = 'data/processed/features'):
+        """
+        Args:
+            root: Directory holding one subdirectory per feature set
+        """
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+
+    def _versions_dir(self, name: str) -> Path:
+        return self.root / name / VERSIONS_DIR
+
+    def _locked(self, name: str):
+        """Exclusive lock on a feature set's index and LATEST pointer."""
+        return file_lock(self.root / name / LOCK_FILE)
+
+    def _committed_versions(self, name: str) -> List[str]:
+        """Version ids whose snapshot directory has been renamed into place."""
+        versions_dir = self._versions_dir(name)
+        if not versions_dir.exists():
+            return []
+        return sorted(child.name for child in versions_dir.iterdir()
+                      if child.name.startswith('v') and (child / SNAPSHOT_FILE).exists())
+
+    def _read_index(self, name: str) -> Dict:
+        path = self.root / name / INDEX_FILE
+        if not path.exists():
+            return {'versions': []}
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, df: pd.DataFrame, name: str,
+             inputs: Optional[Mapping[str, Union[str, pd.DataFrame]]] = None,
+             metadata: Optional[Dict] = None) -> str:
+        """
+        Write a new snapshot and make it the latest version.
+
+        Args:
+            df: Feature frame with a season column
+            name: Feature set name, e.g. 'pattern_features'
+            inputs: Input name -> fingerprint of the data the features were
+                    built from, e.g. RawDataStore digests. DataFrames are
+                    fingerprinted here
+            metadata: Extra JSON-serializable details to keep with the snapshot
+
+        Returns:
+            The new version id
+        """
+        fingerprints = {
+            key: frame_fingerprint(value) if isinstance(value, pd.DataFrame) else str(value)
+            for key, value in (inputs or {}).items()
+        }
+        versions_dir = self._versions_dir(name)
+        versions_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write under a temporary name, then claim the next free version id
+        tmp_name = f".tmp-{uuid.uuid4().hex}"
+        save_data(df, versions_dir, tmp_name, file_format='parquet')
+        snapshot = {
+            'created': datetime.now().isoformat(),
+            'rows': len(df),
+            'columns': [str(col) for col in df.columns],
+            'seasons': sorted(int(s) for s in df['season'].unique()),
+            'digest': frame_fingerprint(df),
+            'inputs': fingerprints,
+            'metadata': metadata or {}
+        }
+
+        number = self._next_number(name)
+        while True:
+            version = f"v{number:06d}"
+            snapshot['version'] = version
+            _write_json(versions_dir / tmp_name / SNAPSHOT_FILE, snapshot)
+            try:
+                # Fails if another writer already claimed this version
+                os.rename(versions_dir / tmp_name, versions_dir / version)
+                break
+            except OSError:
+                if not (versions_dir / version).exists():
+                    raise
+                number += 1
+
+        with self._locked(name):
+            index = self._read_index(name)
+            index['versions'] = [v for v in index['versions'] if v['version'] != version] + [snapshot]
+            index['versions'].sort(key=lambda v: v['version'])
+            _write_json(self.root / name / INDEX_FILE, index)
+
+            # The highest committed version, so a concurrent writer that finished a
+            # newer one never has its pointer moved back
+            self._set_latest(name, self._committed_versions(name)[-1])
+
+        self.logger.info(f"Saved {name} {version} ({len(df)} rows)")
+        return version
+
+    def _next_number(self, name: str) -> int:
+        existing = [v['version'] for v in self._read_index(name)['versions']]
+        latest = self.latest(name)
+        if latest is not None:
+            existing.append(latest)
+        return max((int(v[1:]) for v in existing), default=0) + 1
+
+    def _set_latest(self, name: str, version: str) -> None:
+        path = self.root / name / LATEST_FILE
+        tmp_path = path.with_name(f".{LATEST_FILE}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, path)
+
+    def latest(self, name: str) -> Optional[str]:
+        """Latest version id of a feature set, or None if nothing was saved."""
+        path = self.root / name / LATEST_FILE
+        if not path.exists():
+            return None
+        return path.read_text().strip() or None
+
+    def versions(self, name: str) -> List[Dict]:
+        """Index entries of every version, oldest first."""
+        return self._read_index(name)['versions']
+
+    def snapshot_info(self, name: str, version: Optional[str] = None) -> Dict:
+        """Metadata of one snapshot (the latest by default)."""
+        version = self._resolve(name, version)
+        with open(self._versions_dir(name) / version / SNAPSHOT_FILE) as f:
+            return json.load(f)
+
+    def find_version(self, name: str, inputs: Mapping[str, Union[str, pd.DataFrame]]) -> Optional[str]:
+        """
+        Newest version built from exactly these inputs, so unchanged inputs
+        can reuse a snapshot instead of rebuilding it.
+        """
+        wanted = {
+            key: frame_fingerprint(value) if isinstance(value, pd.DataFrame) else str(value)
+            for key, value in inputs.items()
+        }
+        for entry in reversed(self.versions(name)):
+            if entry['inputs'] == wanted:
+                return entry['version']
+        return None
+
+    def _resolve(self, name: str, version: Optional[str]) -> str:
+        version = version or self.latest(name)
+        if version is None:
+            raise FileNotFoundError(f"No snapshots of {name} in {self.root}")
+        if not (self._versions_dir(name) / version).exists():
+            raise FileNotFoundError(f"No snapshot {version} of {name} in {self.root}")
+        return version
+
+    def load(self, name: str, version: Optional[str] = None,
+             columns: Optional[Sequence[str]] = None, seasons: SeasonSelector = None) -> pd.DataFrame:
+        """
+        Load a snapshot (the latest by default), ordered by season.
+
+        Args:
+            name: Feature set name
+            version: Version id. If None, loads the latest version
+            columns: Columns to read. If None, reads every column
+            seasons: Season selector, as for load_partitioned
+        """
+        version = self._resolve(name, version)
+        return load_partitioned(self._versions_dir(name), version, columns=columns, seasons=seasons)
+
+    def lookup(self, name: str, team: str, season: int, version: Optional[str] = None,
+               columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Rows of one team-season, reading only that season's partition.
+
+        Returns:
+            The matching rows; empty if the team-season is not in the snapshot
+        """
+        version = self._resolve(name, version)
+        if columns is not None:
+            columns = list(dict.fromkeys(['team', 'season'] + list(columns)))
+        part = load_partitioned(self._versions_dir(name), version, columns=columns, seasons=int(season))
+        return part[part['team'].astype(str) == team].reset_index(drop=True)
+
+    def rebuild_index(self, name: str) -> Dict:
+        """Recreate index.json from the snapshots on disk, e.g. after concurrent writers."""
+        with self._locked(name):
+            versions = []
+            for version in self._committed_versions(name):
+                with open(self._versions_dir(name) / version / SNAPSHOT_FILE) as f:
+                    versions.append(json.load(f))
+            index = {'versions': versions}
+            _write_json(self.root / name / INDEX_FILE, index)
+        return index
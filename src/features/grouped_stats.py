@@ -0,0 +1,190 @@
+"""
+Single-pass grouped statistics for feature engineering.
+
+GroupedStats computes per-group counts, distinct counts, means, variances and
+skewness from sufficient statistics gathered in one vectorized pass:
+
+    n, sum(d), sum(d**2), sum(d**3)    where d = value - shift
+
+The shift is a per-column reference value (the column mean by default) that
+keeps the power sums small, so central moments recovered from them do not
+suffer from cancellation. Partial results, for example per season or per file
+chunk, can be merged exactly with merge().
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MOMENT_STATS = ['n', 's1', 's2', 's3']
+
+# Central moments below this are treated as zero, following pandas' nanskew
+FPERR_TOLERANCE = 1e-14
+
+
+class GroupedStats:
+    """
+    Mergeable per-group sufficient statistics.
+
+    Use GroupedStats.compute() to build statistics from a DataFrame, merge()
+    to combine partial results, and the accessor methods (count, nunique,
+    mean, var, skew) to read finished statistics as Series indexed by group.
+    """
+
+    def __init__(self, keys: List[str], moments: pd.DataFrame, shifts: Dict[str, float],
+                 distinct: Dict[str, pd.DataFrame]):
+        """
+        Initialize from precomputed statistics; see compute() for the usual entry point.
+
+        Args:
+            keys: Grouping columns
+            moments: Power sums indexed by group, with (column, stat) columns
+            shifts: Reference value subtracted from each moment column
+            distinct: Distinct (group keys, value) pairs for each distinct column
+        """
+        self.keys = keys
+        self.moments = moments
+        self.shifts = shifts
+        self.distinct = distinct
+
+    @classmethod
+    def compute(cls, df: pd.DataFrame, keys: Sequence[str], moment_cols: Sequence[str] = (),
+                distinct_cols: Sequence[str] = (),
+                shifts: Optional[Dict[str, float]] = None) -> 'GroupedStats':
+        """
+        Gather sufficient statistics for every group in one pass.
+
+        Args:
+            df: Input rows
+            keys: Grouping columns
+            moment_cols: Numeric columns to collect count and power sums for
+            distinct_cols: Columns to collect count and distinct values for
+            shifts: Reference value per moment column. Defaults to column means
+
+        Returns:
+            GroupedStats for the groups present in df
+        """
+        keys = list(keys)
+        grouped = df.groupby(keys, sort=True, observed=True)
+        # Rows with a missing key belong to no group; ngroup() gives them NaN
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        index = grouped.size().index
+        n_groups = len(index)
+        valid_key = codes >= 0
+
+        shifts = dict(shifts or {})
+        sums = {}
+        for col in moment_cols:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            mask = valid_key & ~np.isnan(values)
+            if col not in shifts:
+                shifts[col] = float(values[mask].mean()) if mask.any() else 0.0
+
+            group = codes[mask]
+            d = values[mask] - shifts[col]
+            d2 = d * d
+            sums[(col, 'n')] = np.bincount(group, minlength=n_groups)
+            sums[(col, 's1')] = np.bincount(group, weights=d, minlength=n_groups)
+            sums[(col, 's2')] = np.bincount(group, weights=d2, minlength=n_groups)
+            sums[(col, 's3')] = np.bincount(group, weights=d2 * d, minlength=n_groups)
+
+        distinct = {}
+        for col in distinct_cols:
+            mask = valid_key & df[col].notna().to_numpy()
+            sums[(col, 'n')] = np.bincount(codes[mask], minlength=n_groups)
+            distinct[col] = df.loc[mask, keys + [col]].drop_duplicates()
+
+        moments = pd.DataFrame(sums, index=index)
+        return cls(keys, moments, shifts, distinct)
+
+    def _shifted_moments(self, col: str, new_shift: float) -> pd.DataFrame:
+        """Re-express the power sums of a column around a different shift."""
+        sums = self.moments[col]
+        delta = self.shifts[col] - new_shift
+        if delta == 0:
+            return sums
+
+        n, s1, s2, s3 = (sums[stat] for stat in MOMENT_STATS)
+        return pd.DataFrame({
+            'n': n,
+            's1': s1 + n * delta,
+            's2': s2 + 2 * delta * s1 + n * delta ** 2,
+            's3': s3 + 3 * delta * s2 + 3 * delta ** 2 * s1 + n * delta ** 3
+        })
+
+    def merge(self, other: 'GroupedStats') -> 'GroupedStats':
+        """
+        Combine two partial results, as if computed over the union of their rows.
+
+        Groups may appear in both partials. Power sums are re-expressed around
+        this object's shifts before adding, so the result is exact for any split.
+        """
+        if self.keys != other.keys:
+            raise ValueError(f"Cannot merge statistics grouped by {self.keys} and {other.keys}")
+        if set(self.moments.columns) != set(other.moments.columns):
+            raise ValueError("Cannot merge statistics over different columns")
+
+        index = self.moments.index.union(other.moments.index)
+        merged = {}
+        for col in self.moments.columns.get_level_values(0).unique():
+            if col in self.shifts:
+                left = self.moments[col]
+                right = other._shifted_moments(col, self.shifts[col])
+            else:
+                left = self.moments[[col]].droplevel(0, axis=1)
+                right = other.moments[[col]].droplevel(0, axis=1)
+            total = left.reindex(index, fill_value=0) + right.reindex(index, fill_value=0)
+            for stat in total.columns:
+                merged[(col, stat)] = total[stat]
+
+        distinct = {
+            col: pd.concat([self.distinct[col], other.distinct[col]]).drop_duplicates()
+            for col in self.distinct
+        }
+        return GroupedStats(self.keys, pd.DataFrame(merged, index=index), dict(self.shifts), distinct)
+
+    def count(self, col: str) -> pd.Series:
+        """Number of non-missing values per group."""
+        return self.moments[(col, 'n')].rename(f'{col}_count')
+
+    def nunique(self, col: str) -> pd.Series:
+        """Number of distinct non-missing values per group."""
+        counts = self.distinct[col].groupby(self.keys, sort=True, observed=True).size()
+        return counts.reindex(self.moments.index, fill_value=0).rename(f'{col}_nunique')
+
+    def mean(self, col: str) -> pd.Series:
+        """Mean per group, NaN for groups without values."""
+        sums = self.moments[col]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.shifts[col] + sums['s1'] / sums['n']
+        return mean.rename(f'{col}_mean')
+
+    def _central_m2(self, col: str) -> pd.Series:
+        sums = self.moments[col]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            m2 = sums['s2'] - sums['s1'] ** 2 / sums['n']
+        # Recovering m2 from power sums can leave tiny negative rounding error
+        return m2.where(m2.abs() >= FPERR_TOLERANCE * np.maximum(sums['s2'], 1), 0.0)
+
+    def var(self, col: str) -> pd.Series:
+        """Sample variance (ddof=1) per group, NaN for groups with fewer than 2 values."""
+        n = self.moments[(col, 'n')]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = self._central_m2(col) / (n - 1)
+        return var.where(n >= 2).rename(f'{col}_var')
+
+    def skew(self, col: str) -> pd.Series:
+        """
+        Adjusted Fisher-Pearson skewness per group, matching pandas Series.skew().
+
+        Groups with fewer than 3 values are NaN; groups with no spread are 0.
+        """
+        sums = self.moments[col]
+        n, s1, s2, s3 = (sums[stat] for stat in MOMENT_STATS)
+        m2 = self._central_m2(col)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            m3 = s3 - 3 * s1 * s2 / n + 2 * s1 ** 3 / n ** 2
+            m3 = m3.where(m3.abs() >= FPERR_TOLERANCE, 0.0)
+            skew = (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+        skew = skew.where(m2 != 0, 0.0)
+        return skew.where(n >= 3).rename(f'{col}_skew')
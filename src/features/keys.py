@@ -0,0 +1,137 @@
+"""
+Compact team-season keys for aligning feature blocks.
+
+Feature blocks are identified by team and season. Joining them on those two
+columns means hashing strings for every row of every block. TeamSeasonIndex
+instead gives each team an integer code and packs (code, season) into a
+single int64 key, so blocks align with one sorted search over integers.
+
+Team codes are assigned once and kept, so keys stay stable when new seasons
+are scored with the same index. Codes follow the order in which teams were
+first seen (sorted within each batch), so they are not a sorted vocabulary:
+an index that outlives its process must be persisted as `teams` and restored
+with from_vocabulary(), which keeps that order. With a FranchiseTable, team names are first
+resolved to their franchise in each row's season, so 'SEA' 2005 and 'OKC'
+2005 get the same key and every block keys teams the way the cleaner does.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data.franchises import FranchiseTable
+
+SEASON_BITS = 16
+
+
+class TeamSeasonIndex:
+    """Map (team, season) pairs to packed int64 keys."""
+
+    def __init__(self, teams: Iterable[str] = (), franchises: Optional[FranchiseTable] = None):
+        """
+        Args:
+            teams: Team names to assign codes to up front (sorted first); use
+                   from_vocabulary() to restore a saved code order
+            franchises: If given, encode() keys rows by franchise rather than
+                        by the raw team name
+        """
+        self.franchises = franchises
+        self.teams: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.add_teams(teams)
+
+    @classmethod
+    def from_vocabulary(cls, teams: Sequence[str],
+                        franchises: Optional[FranchiseTable] = None) -> 'TeamSeasonIndex':
+        """
+        Restore an index from a saved `teams` list, keeping its code order.
+
+        Raises:
+            ValueError: If the list has duplicate names
+        """
+        index = cls(franchises=franchises)
+        index.teams = [str(team) for team in teams]
+        index._codes = {team: code for code, team in enumerate(index.teams)}
+        if len(index._codes) != len(index.teams):
+            raise ValueError("Team vocabulary has duplicate names")
+        return index
+
+    def add_teams(self, teams: Iterable[str]) -> None:
+        """
+        Append codes for team names not seen before.
+
+        New names are sorted among themselves and numbered after the existing
+        codes, so a team's code depends on the batch that introduced it.
+        """
+        new = sorted({str(team) for team in teams} - self._codes.keys())
+        for team in new:
+            self._codes[team] = len(self.teams)
+            self.teams.append(team)
+
+    def team_codes(self, teams: pd.Series) -> np.ndarray:
+        """
+        Integer code of every value of a team column.
+
+        Unseen names get new codes; missing values get -1.
+        """
+        if isinstance(teams.dtype, pd.CategoricalDtype):
+            positions = teams.cat.codes.to_numpy()
+            uniques = teams.cat.categories
+        else:
+            positions, uniques = pd.factorize(teams, use_na_sentinel=True)
+        self.add_teams(uniques)
+        # Trailing -1 maps the missing-value sentinel
+        lookup = np.array([self._codes[str(team)] for team in uniques] + [-1], dtype=np.int64)
+        return lookup[positions]
+
+    def canonical_teams(self, teams: pd.Series, seasons: pd.Series) -> pd.Series:
+        """Franchise of every row in its season, or the teams unchanged without a FranchiseTable."""
+        if self.franchises is None:
+            return teams
+        return self.franchises.franchises(teams, seasons)
+
+    def encode(self, teams: pd.Series, seasons: pd.Series) -> np.ndarray:
+        """Packed keys for team and season columns of equal length; rows with a missing team get -1."""
+        codes = self.team_codes(self.canonical_teams(teams, seasons))
+        keys = (codes << SEASON_BITS) | seasons.to_numpy(dtype=np.int64)
+        keys[codes < 0] = -1
+        return keys
+
+    def decode(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Team names and seasons of packed keys."""
+        keys = np.asarray(keys, dtype=np.int64)
+        teams = np.array(self.teams, dtype=object)[keys >> SEASON_BITS]
+        return teams, (keys & ((1 << SEASON_BITS) - 1)).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+
+def align_keys(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    Position in `right` of every key in `left`, or -1 where it has no match.
+
+    The right keys are sorted once (skipped when they already are) and every
+    left key is found by binary search.
+
+    Raises:
+        ValueError: If `right` has duplicate keys
+    """
+    if len(right) > 1 and np.all(right[1:] > right[:-1]):
+        order = None
+        sorted_keys = right
+    else:
+        order = np.argsort(right, kind='stable')
+        sorted_keys = right[order]
+        if len(sorted_keys) > 1 and np.any(sorted_keys[1:] == sorted_keys[:-1]):
+            raise ValueError("Feature block has more than one row per team and season")
+
+    if len(sorted_keys) == 0:
+        return np.full(len(left), -1, dtype=np.intp)
+
+    positions = np.searchsorted(sorted_keys, left)
+    positions = np.minimum(positions, len(sorted_keys) - 1)
+    matched = (sorted_keys[positions] == left) & (left >= 0)
+    if order is not None:
+        positions = order[positions]
+    return np.where(matched, positions, -1).astype(np.intp)
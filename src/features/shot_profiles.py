@@ -0,0 +1,333 @@
+"""
+Team-season shot profiles from shot-level data.
+
+The shot-level dataset (mexwell/nba-shots) is far larger than the team and
+player tables, so ShotProfileAggregator never loads it whole. Each file, or
+each season of a season-partitioned dataset, is read in chunks, and every
+chunk is reduced to integer counts per team-season:
+
+- attempts and makes per BASIC_ZONE
+- attempts and makes per SHOT_DISTANCE bin
+- attempts and makes per LOC_X / LOC_Y grid cell
+
+Counts are binned with NumPy histograms over (team-season, value) pairs, so a
+chunk costs a few vectorized passes regardless of how many teams it holds.
+Files or seasons run in a process pool.
+
+Counts are plain integers, so partial results merge exactly by addition:
+merge_counts() of the per-season counts equals the counts of one scan over
+every season. A new season is added to the stored counts without rescanning
+history. Zone frequencies and make rates are derived from the merged counts.
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from ..data.franchises import FranchiseTable
+from ..data.schemas import get_schema
+from ..data.storage import PART_FILE, list_partitions
+
+# SHOT_DISTANCE bin edges in feet; the last bin is open-ended
+DISTANCE_EDGES = (0, 4, 8, 16, 24, 30, np.inf)
+# Half-court grid in LOC_X / LOC_Y units (tenths of a foot); shots outside
+# the grid are counted in its edge cells
+LOC_X_EDGES = tuple(np.linspace(-250, 250, 11))
+LOC_Y_EDGES = tuple(np.linspace(-50, 420, 11))
+
+SHOT_COLUMNS = ['TEAM_NAME', 'SEASON_1', 'SHOT_MADE', 'BASIC_ZONE', 'SHOT_DISTANCE', 'LOC_X', 'LOC_Y']
+KEY_NAMES = ['team', 'season']
+
+
+def _slug(label) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', str(label).lower()).strip('_')
+
+
+def _edge_label(low, high) -> str:
+    return f"{low:g}_plus" if np.isinf(high) else f"{low:g}_{high:g}"
+
+
+def _binned(keys: np.ndarray, n_keys: int, values: np.ndarray, edges: np.ndarray,
+            made: np.ndarray) -> np.ndarray:
+    """
+    Attempts and makes per (key, value bin).
+
+    Returns:
+        int64 array of shape (n_keys, 2 * n_bins), alternating attempts and
+        makes of each bin
+    """
+    key_edges = np.arange(n_keys + 1)
+    attempts, _, _ = np.histogram2d(keys, values, bins=(key_edges, edges))
+    makes, _, _ = np.histogram2d(keys, values, bins=(key_edges, edges), weights=made)
+    return np.stack([attempts, makes], axis=2).reshape(n_keys, -1).astype(np.int64)
+
+
+def _count_names(labels: Sequence[str]) -> List[str]:
+    return [f"{label}_{kind}" for label in labels for kind in ('attempts', 'makes')]
+
+
+def merge_counts(parts: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge partial shot counts by adding them per team-season.
+
+    Partials may cover overlapping team-seasons (e.g. chunks of one file) or
+    disjoint ones (e.g. seasons); either way the result equals the counts of
+    a single pass over all their shots.
+    """
+    parts = [part for part in parts if part is not None and len(part.columns)]
+    if not parts:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=KEY_NAMES), dtype=np.int64)
+    merged = pd.concat(parts, sort=False).fillna(0).astype(np.int64)
+    merged = merged.groupby(level=KEY_NAMES, sort=True, observed=True).sum()
+    # Keep the first partial's column order; zones it lacks go last
+    columns = list(dict.fromkeys(col for part in parts for col in part.columns))
+    return merged[columns]
+
+
+def shot_profile_features(counts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shot-zone frequency and make-rate table per team-season.
+
+    For every zone, distance bin and location cell, <group>_freq is its
+    share of the team-season's attempts and <group>_make_rate its field
+    goal percentage (NaN without attempts).
+
+    Args:
+        counts: Counts from ShotProfileAggregator or merge_counts()
+
+    Returns:
+        DataFrame with team, season, total shot attempts and the feature columns
+    """
+    groups = [col[:-len('_attempts')] for col in counts.columns
+              if col.endswith('_attempts') and col != 'attempts']
+    attempts = counts[[f"{group}_attempts" for group in groups]].to_numpy(dtype=np.float64)
+    makes = counts[[f"{group}_makes" for group in groups]].to_numpy(dtype=np.float64)
+    total = counts['attempts'].to_numpy(dtype=np.float64)[:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        freq = np.where(total > 0, attempts / total, np.nan)
+        make_rate = np.where(attempts > 0, makes / attempts, np.nan)
+
+    columns = {'shot_attempts': counts['attempts'].to_numpy()}
+    for i, group in enumerate(groups):
+        columns[f"{group}_freq"] = freq[:, i]
+        columns[f"{group}_make_rate"] = make_rate[:, i]
+    return pd.DataFrame(columns, index=counts.index).reset_index()
+
+
+def _count_source(source, aggregator: 'ShotProfileAggregator') -> pd.DataFrame:
+    """Counts of one file or one season partition; runs in a worker process."""
+    if isinstance(source, tuple):
+        chunks = aggregator.read_partition(*source)
+    else:
+        chunks = aggregator.read_chunks(source)
+    return merge_counts(aggregator.count_chunk(chunk) for chunk in chunks)
+
+
+class ShotProfileAggregator:
+    """Stream shot-level rows into mergeable per-team-season shot counts."""
+
+    def __init__(self, distance_edges: Sequence[float] = DISTANCE_EDGES,
+                 x_edges: Sequence[float] = LOC_X_EDGES, y_edges: Sequence[float] = LOC_Y_EDGES,
+                 chunksize: int = 250_000, n_jobs: Optional[int] = None, team_resolver=None):
+        """
+        Initialize the aggregator.
+
+        Args:
+            distance_edges: SHOT_DISTANCE bin edges, increasing
+            x_edges: LOC_X grid edges
+            y_edges: LOC_Y grid edges
+            chunksize: Rows read per chunk
+            n_jobs: Worker processes, one file or season per task. Defaults to the CPU count
+            team_resolver: Optional FranchiseTable (per-season franchises) or
+                           TeamNameResolver mapping TEAM_NAME to team codes,
+                           so profiles join the other feature blocks
+        """
+        self.distance_edges = np.asarray(distance_edges, dtype=np.float64)
+        self.x_edges = np.asarray(x_edges, dtype=np.float64)
+        self.y_edges = np.asarray(y_edges, dtype=np.float64)
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.team_resolver = team_resolver
+
+        self.counts: Optional[pd.DataFrame] = None
+        self.last_run: Dict = {}
+        self.logger = logging.getLogger(__name__)
+
+    def __getstate__(self):
+        # Workers only count; resolution happens in the parent process
+        state = self.__dict__.copy()
+        state.update(team_resolver=None, counts=None)
+        return state
+
+    def read_chunks(self, path):
+        """Read the shot columns of a CSV file in chunks with the shots schema dtypes."""
+        header = pd.read_csv(path, nrows=0).columns
+        columns = [col for col in SHOT_COLUMNS if col in header]
+        dtypes = {col: dtype for col, dtype in get_schema('shots')['dtypes'].items() if col in columns}
+        return pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=self.chunksize)
+
+    def read_partition(self, directory, name: str, season: int, partition_col: str = 'SEASON_1'):
+        """Read the shot columns of one season partition in record batches of `chunksize` rows."""
+        parquet = pq.ParquetFile(Path(directory) / name / f"{partition_col}={int(season)}" / PART_FILE)
+        columns = [col for col in SHOT_COLUMNS if col in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=self.chunksize, columns=columns):
+            yield batch.to_pandas()
+
+    def count_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shot counts of one chunk.
+
+        Returns:
+            int64 DataFrame indexed by (team, season), with attempts and makes
+            columns per zone, distance bin and location cell
+        """
+        chunk = chunk.dropna(subset=['TEAM_NAME', 'SEASON_1'])
+        if chunk.empty:
+            return None
+
+        team_codes, teams = pd.factorize(chunk['TEAM_NAME'])
+        seasons = chunk['SEASON_1'].to_numpy(dtype=np.int64)
+        season_min = seasons.min()
+        n_seasons = seasons.max() - season_min + 1
+        keys, key_values = pd.factorize(team_codes * n_seasons + (seasons - season_min))
+        index = pd.MultiIndex.from_arrays(
+            [np.asarray(teams, dtype=object)[key_values // n_seasons], key_values % n_seasons + season_min],
+            names=KEY_NAMES)
+        n_keys = len(key_values)
+        made = chunk['SHOT_MADE'].to_numpy(dtype=np.float64)
+
+        blocks, names = [], []
+        if 'BASIC_ZONE' in chunk:
+            zone_codes, zones = pd.factorize(chunk['BASIC_ZONE'], sort=True)
+            has_zone = zone_codes >= 0
+            blocks.append(_binned(keys[has_zone], n_keys, zone_codes[has_zone],
+                                  np.arange(len(zones) + 1), made[has_zone]))
+            labels = [f"zone_{_slug(zone)}" for zone in zones]
+            names += _count_names(labels)
+
+        if 'SHOT_DISTANCE' in chunk:
+            distance = chunk['SHOT_DISTANCE'].to_numpy(dtype=np.float64)
+            blocks.append(_binned(keys, n_keys, distance, self.distance_edges, made))
+            labels = [f"dist_{_edge_label(low, high)}"
+                      for low, high in zip(self.distance_edges[:-1], self.distance_edges[1:])]
+            names += _count_names(labels)
+
+        if 'LOC_X' in chunk and 'LOC_Y' in chunk:
+            # Clip into the grid so every located shot lands in a cell
+            x = np.clip(chunk['LOC_X'].to_numpy(dtype=np.float64), self.x_edges[0], self.x_edges[-1])
+            y = np.clip(chunk['LOC_Y'].to_numpy(dtype=np.float64), self.y_edges[0], self.y_edges[-1])
+            n_x, n_y = len(self.x_edges) - 1, len(self.y_edges) - 1
+            # One histogram axis per cell, numbered x-major
+            cells = np.searchsorted(self.x_edges, x, side='right').clip(1, n_x) - 1
+            cells = cells * n_y + (np.searchsorted(self.y_edges, y, side='right').clip(1, n_y) - 1)
+            cells = np.where(np.isnan(x) | np.isnan(y), np.nan, cells)
+            blocks.append(_binned(keys, n_keys, cells, np.arange(n_x * n_y + 1), made))
+            labels = [f"loc_{i}_{j}" for i in range(n_x) for j in range(n_y)]
+            names += _count_names(labels)
+
+        totals = np.column_stack([np.bincount(keys, minlength=n_keys),
+                                  np.bincount(keys, weights=made, minlength=n_keys).astype(np.int64)])
+        values = np.hstack([totals] + blocks)
+        return pd.DataFrame(values, index=index, columns=['attempts', 'makes'] + names)
+
+    def _sources(self, paths: Optional[Sequence] = None, directory=None, name: str = 'shots',
+                 seasons: Optional[Iterable[int]] = None, partition_col: str = 'SEASON_1') -> List:
+        if paths is not None:
+            return list(paths)
+        if directory is None:
+            raise ValueError("Either paths or a partitioned dataset directory is required")
+        stored = list_partitions(directory, name, partition_col)
+        if seasons is not None:
+            # Built once, so an iterator of seasons is consumed only once
+            wanted = {int(season) for season in seasons}
+            stored = [season for season in stored if season in wanted]
+        return [(directory, name, season, partition_col) for season in stored]
+
+    def count(self, paths: Optional[Sequence] = None, directory=None, name: str = 'shots',
+              seasons: Optional[Iterable[int]] = None, partition_col: str = 'SEASON_1') -> pd.DataFrame:
+        """
+        Shot counts of the given files or seasons, one task per file or season.
+
+        Args:
+            paths: Shot CSV files
+            directory: Parent directory of a season-partitioned shots dataset,
+                       used when paths is None
+            name: Dataset name within directory
+            seasons: Seasons of the partitioned dataset to count. Defaults to all
+            partition_col: Column the dataset is partitioned on
+
+        Returns:
+            Merged counts, as count_chunk()
+        """
+        start = time.perf_counter()
+        sources = self._sources(paths, directory, name, seasons, partition_col)
+        worker = partial(_count_source, aggregator=self)
+
+        if self.n_jobs > 1 and len(sources) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(sources))) as pool:
+                parts = list(pool.map(worker, sources))
+        else:
+            parts = [worker(source) for source in sources]
+
+        counts = merge_counts(parts)
+        if self.team_resolver is not None and len(counts):
+            teams = counts.index.get_level_values('team').to_series()
+            if isinstance(self.team_resolver, FranchiseTable):
+                teams = self.team_resolver.franchises(teams, counts.index.get_level_values('season'))
+            else:
+                teams = self.team_resolver.resolve_series(teams)
+            counts.index = pd.MultiIndex.from_arrays(
+                [teams.to_numpy(), counts.index.get_level_values('season')], names=KEY_NAMES)
+            # Spellings resolving to one code become one team-season
+            counts = merge_counts([counts])
+
+        seconds = time.perf_counter() - start
+        shots = int(counts['attempts'].sum()) if len(counts) else 0
+        self.last_run = {'sources': len(sources), 'shots': shots, 'team_seasons': len(counts),
+                         'seconds': seconds, 'shots_per_second': shots / max(seconds, 1e-12)}
+        self.logger.info(f"Counted {shots} shots from {len(sources)} source(s) in {seconds:.2f}s")
+        return counts
+
+    def aggregate(self, paths: Optional[Sequence] = None, directory=None, name: str = 'shots',
+                  seasons: Optional[Iterable[int]] = None, partition_col: str = 'SEASON_1') -> pd.DataFrame:
+        """
+        Count the given files or seasons and add them to the stored counts.
+
+        The first call builds the counts; later calls with only a new season's
+        shots update them without rescanning history. Rescanning a season
+        already counted would count its shots twice; use replace_seasons()
+        for revised seasons.
+
+        Returns:
+            The updated counts, also kept in `counts`
+        """
+        new_counts = self.count(paths, directory, name, seasons, partition_col)
+        self.counts = new_counts if self.counts is None else merge_counts([self.counts, new_counts])
+        return self.counts
+
+    def replace_seasons(self, paths: Optional[Sequence] = None, directory=None, name: str = 'shots',
+                        seasons: Optional[Iterable[int]] = None, partition_col: str = 'SEASON_1') -> pd.DataFrame:
+        """Recount the given files or seasons, replacing the stored counts of the seasons they cover."""
+        new_counts = self.count(paths, directory, name, seasons, partition_col)
+        if self.counts is not None:
+            counted = new_counts.index.get_level_values('season').unique()
+            kept = self.counts[~self.counts.index.get_level_values('season').isin(counted)]
+            new_counts = merge_counts([kept, new_counts])
+        self.counts = new_counts
+        return self.counts
+
+    def profile_features(self, counts: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Shot-zone frequency and make-rate table of the stored (or given) counts; see shot_profile_features()."""
+        counts = self.counts if counts is None else counts
+        if counts is None:
+            raise ValueError("No shot counts; call aggregate() first")
+        return shot_profile_features(counts)
@@ -0,0 +1,193 @@
+"""
+Season-over-season features per franchise.
+
+For each feature column, TemporalFeatureBuilder computes, per team:
+
+- <col>_lag<l>: the value l seasons (rows) earlier
+- <col>_delta<l>: the change from that value
+- <col>_roll<w>_mean / <col>_roll<w>_std: mean and standard deviation over
+  the last w seasons, including the current one
+
+Rows are sorted once by team and season, and every statistic is computed for
+all teams at once from positions within each team's run and cumulative sums,
+so there is no per-team Python loop. Results match pandas
+groupby().shift() / groupby().rolling() (sample standard deviation, missing
+values skipped).
+
+A new season only affects rows whose lag or window reaches it. append()
+recomputes just those rows, from a short tail of each affected team's history.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class TemporalFeatureBuilder:
+    """Lags, deltas and rolling statistics of feature columns per team."""
+
+    def __init__(self, columns: Sequence[str], lags: Sequence[int] = (1,), windows: Sequence[int] = (3,),
+                 min_periods: int = 1, team_col: str = 'team', season_col: str = 'season'):
+        """
+        Args:
+            columns: Feature columns to derive temporal features from
+            lags: Lags, in seasons, for lag and delta features
+            windows: Rolling window lengths, in seasons
+            min_periods: Minimum non-missing values for a rolling mean; the
+                         rolling standard deviation needs at least two
+            team_col: Column identifying the franchise
+            season_col: Season column
+        """
+        if any(lag < 1 for lag in lags) or any(window < 1 for window in windows):
+            raise ValueError("Lags and windows must be positive")
+        self.columns = list(columns)
+        self.lags = sorted(set(lags))
+        self.windows = sorted(set(windows))
+        self.min_periods = min_periods
+        self.team_col = team_col
+        self.season_col = season_col
+
+        # Rows each output row looks back over
+        self.lookback = max(self.lags + [w - 1 for w in self.windows] + [0])
+        self.history: Optional[pd.DataFrame] = None
+        self.features: Optional[pd.DataFrame] = None
+        self.last_update: Dict = {}
+
+    @property
+    def output_columns(self) -> List[str]:
+        """Names of the generated columns, in output order."""
+        names = []
+        for col in self.columns:
+            for lag in self.lags:
+                names += [f"{col}_lag{lag}", f"{col}_delta{lag}"]
+            for window in self.windows:
+                names += [f"{col}_roll{window}_mean", f"{col}_roll{window}_std"]
+        return names
+
+    def _sorted(self, df: pd.DataFrame):
+        """Sort order by team and season, team codes and position of each row within its team."""
+        codes, _ = pd.factorize(df[self.team_col], sort=False)
+        seasons = df[self.season_col].to_numpy()
+        order = np.lexsort((seasons, codes))
+        sorted_codes = codes[order]
+        sorted_seasons = seasons[order]
+
+        same_team = sorted_codes[1:] == sorted_codes[:-1]
+        if np.any(same_team & (sorted_seasons[1:] == sorted_seasons[:-1])):
+            raise ValueError(f"More than one row per {self.team_col} and {self.season_col}")
+
+        starts = np.flatnonzero(np.r_[True, ~same_team])
+        team_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        position = np.arange(len(order)) - team_start
+        return order, team_start, position
+
+    def _compute(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Temporal features for every row of df, in df's row order."""
+        order, team_start, position = self._sorted(df)
+        n_rows = len(order)
+        index = np.arange(n_rows)
+        out = {}
+
+        for col in self.columns:
+            values = df[col].to_numpy(dtype=np.float64)[order]
+
+            for lag in self.lags:
+                lagged = np.full(n_rows, np.nan)
+                has_lag = position >= lag
+                lagged[has_lag] = values[index[has_lag] - lag]
+                out[f"{col}_lag{lag}"] = lagged
+                out[f"{col}_delta{lag}"] = values - lagged
+
+            # Cumulative sums of shifted values keep the variance numerically stable
+            valid = ~np.isnan(values)
+            shift = values[valid].mean() if valid.any() else 0.0
+            centered = np.where(valid, values - shift, 0.0)
+            count_sum = np.r_[0, np.cumsum(valid)]
+            value_sum = np.r_[0.0, np.cumsum(centered)]
+            square_sum = np.r_[0.0, np.cumsum(centered * centered)]
+
+            for window in self.windows:
+                first = np.maximum(index - window + 1, team_start)
+                count = count_sum[index + 1] - count_sum[first]
+                total = value_sum[index + 1] - value_sum[first]
+                squares = square_sum[index + 1] - square_sum[first]
+
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mean = total / count
+                    var = (squares - total * mean) / (count - 1)
+                out[f"{col}_roll{window}_mean"] = np.where(count >= max(self.min_periods, 1),
+                                                           mean + shift, np.nan)
+                out[f"{col}_roll{window}_std"] = np.where(count >= max(self.min_periods, 2),
+                                                          np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+        # Scatter back to the input row order
+        inverse = np.empty(n_rows, dtype=np.intp)
+        inverse[order] = index
+        result = pd.DataFrame({name: values[inverse] for name, values in out.items()}, index=df.index)
+        return pd.concat([df[[self.team_col, self.season_col]], result[self.output_columns]], axis=1)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute temporal features for every row and keep the history for append().
+
+        Returns:
+            DataFrame with team, season and the temporal features, in df's row order
+        """
+        missing = [col for col in [self.team_col, self.season_col] + self.columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing required columns for temporal features: {missing}")
+
+        features = self._compute(df)
+        self.history = df[[self.team_col, self.season_col] + self.columns].reset_index(drop=True)
+        self.features = features.reset_index(drop=True)
+        self.last_update = {'mode': 'full', 'rows_computed': len(df), 'rows_updated': len(df)}
+        return features
+
+    def append(self, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add or replace team-seasons and recompute only the rows they affect.
+
+        Affected rows are the new rows and, for a team whose new season is
+        not its latest, every later row of that team. Only those rows plus
+        `lookback` earlier rows per team are recomputed.
+
+        Returns:
+            The recomputed rows (team, season and temporal features). The
+            full, updated result is in `features`
+        """
+        if self.history is None:
+            return self.fit_transform(new_rows)
+
+        keys = [self.team_col, self.season_col]
+        new_rows = new_rows[keys + self.columns]
+        new_keys = pd.MultiIndex.from_frame(new_rows[keys])
+        kept = self.history[~pd.MultiIndex.from_frame(self.history[keys]).isin(new_keys)]
+        history = pd.concat([kept, new_rows], ignore_index=True)
+
+        # First changed season per affected team
+        first_changed = new_rows.groupby(self.team_col, observed=True, sort=False)[self.season_col].min()
+        order, _, position = self._sorted(history)
+        sorted_history = history.iloc[order]
+        team_first = sorted_history[self.team_col].map(first_changed).to_numpy()
+        seasons = sorted_history[self.season_col].to_numpy()
+        affected = ~pd.isnull(team_first)
+        affected[affected] = seasons[affected] >= team_first[affected].astype(seasons.dtype)
+
+        # Position of each team's first affected row, to include `lookback` rows before it
+        affected_pos = np.where(affected, position, np.iinfo(np.int64).max)
+        team_codes, _ = pd.factorize(sorted_history[self.team_col])
+        first_pos = np.full(team_codes.max() + 1 if len(team_codes) else 0, np.iinfo(np.int64).max)
+        np.minimum.at(first_pos, team_codes, affected_pos)
+        needed = position >= first_pos[team_codes] - self.lookback
+
+        window = sorted_history[needed]
+        computed = self._compute(window)
+        updated = computed[affected[needed]]
+
+        # Splice the recomputed rows into the stored result
+        updated_keys = pd.MultiIndex.from_frame(updated[keys])
+        stale = pd.MultiIndex.from_frame(self.features[keys]).isin(updated_keys)
+        self.features = pd.concat([self.features[~stale], updated], ignore_index=True)
+        self.history = history
+        self.last_update = {'mode': 'append', 'rows_computed': len(window), 'rows_updated': len(updated)}
+        return updated.reset_index(drop=True)
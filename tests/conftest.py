@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the `src` package importable, as the notebooks do with sys.path.append('..')
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.cleaners import NBACleaner
+
+
+@pytest.fixture
+def cleaner(tmp_path, monkeypatch):
+    # NBACleaner creates its data directories under the working directory
+    monkeypatch.chdir(tmp_path)
+    return NBACleaner()
+
+
+def make_frame():
+    return pd.DataFrame({
+        'team': pd.Categorical(['BOS', 'LAL', 'PHO']),
+        'season': [2020, 2021, 2022],
+        'pts': [101.5, 99.0, 110.25],
+        'ast': [20.0, np.nan, 25.0],
+    })
+
+
+def test_clean_leaves_the_input_unchanged(cleaner):
+    df = make_frame()
+    original = df.copy()
+
+    out = cleaner.clean(df)
+    out.loc[0, 'pts'] = 99
+    out.loc[0, 'season'] = 1999
+    out.loc[1, 'ast'] = -1.0
+
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_clean_output_shares_no_memory_with_the_input(cleaner):
+    df = make_frame()
+    out = cleaner.clean(df)
+
+    for col in ['season', 'pts', 'ast']:
+        assert not np.shares_memory(out[col].to_numpy(), df[col].to_numpy()), col
+
+
+def test_numeric_fill_values_fall_back_to_the_median(cleaner):
+    df = pd.DataFrame({'pts': [1.0, np.nan, 3.0], 'ast': [1.0, np.nan, 5.0]})
+    out = cleaner.handle_numeric_columns(df, fill_values={'pts': -1.0})
+
+    assert out['pts'].tolist() == [1.0, -1.0, 3.0]
+    assert out['ast'].tolist() == [1.0, 3.0, 5.0]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.synthetic import generate_team_stats
+from src.features.feature_builder import FeatureBuilder
+from src.features.feature_graph import PATTERN_FEATURES, STYLE_FEATURES, TEAM_FEATURE_GRAPH
+
+
+@pytest.fixture
+def team_stats():
+    df = generate_team_stats(scale=1, seed=3)
+    # Zero denominators exercise the IEEE division rules on both backends
+    df.loc[df.index[:3], 'tov_per_game'] = 0.0
+    return df
+
+
+@pytest.mark.parametrize('features', [None, [], ['pace_factor'], STYLE_FEATURES, PATTERN_FEATURES[::-1]])
+@pytest.mark.parametrize('keep_columns', [False, True])
+def test_numpy_backend_matches_pandas(team_stats, features, keep_columns):
+    expected = FeatureBuilder(backend='pandas').build(team_stats, features=features, keep_columns=keep_columns)
+    result = FeatureBuilder(backend='numpy').build(team_stats, features=features, keep_columns=keep_columns)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_empty_request_returns_team_seasons(team_stats):
+    result = FeatureBuilder(backend='numpy').build(team_stats, features=[])
+
+    assert list(result.columns) == ['team', 'season']
+    assert len(result) == len(team_stats)
+
+
+def test_evaluate_matrix_row_count(team_stats):
+    inputs = {col: team_stats[col].to_numpy(dtype=float) for col in TEAM_FEATURE_GRAPH.input_columns(['pace_factor'])}
+
+    assert TEAM_FEATURE_GRAPH.evaluate_matrix({}, [], n_rows=5).shape == (5, 0)
+    assert TEAM_FEATURE_GRAPH.evaluate_matrix(inputs, ['pace_factor']).shape == (len(team_stats), 1)
+    with pytest.raises(ValueError):
+        TEAM_FEATURE_GRAPH.evaluate_matrix({}, [])
+    with pytest.raises(ValueError):
+        TEAM_FEATURE_GRAPH.evaluate_matrix(inputs, ['pace_factor'], n_rows=len(team_stats) + 1)
+    np.testing.assert_array_equal(
+        TEAM_FEATURE_GRAPH.evaluate_matrix(inputs, ['pace_factor'])[:, 0],
+        TEAM_FEATURE_GRAPH.evaluate(inputs, ['pace_factor'])['pace_factor'],
+    )
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_matrix import FeatureMatrix, write_feature_matrix
+from src.features.keys import TeamSeasonIndex
+
+
+def make_features(n_rows, value=0.0):
+    teams = ['UTA', 'WAS', 'BOS', 'TOT', 'ATL']
+    return pd.DataFrame({
+        'team': [teams[i % len(teams)] for i in range(n_rows)],
+        'season': [2000 + i // len(teams) for i in range(n_rows)],
+        'x': np.arange(n_rows, dtype=float) + value,
+        'y': np.full(n_rows, value),
+    })
+
+
+def test_reopened_keys_decode_to_the_original_teams(tmp_path):
+    # Teams seen over several encode calls get codes out of sorted order
+    index = TeamSeasonIndex()
+    index.encode(pd.Series(['UTA', 'WAS', 'BOS']), pd.Series([2020] * 3))
+    index.encode(pd.Series(['TOT', 'ATL']), pd.Series([2020] * 2))
+    features = make_features(20)
+
+    write_feature_matrix(features, tmp_path / 'matrix', key_index=index, standardize=True)
+    matrix = FeatureMatrix.open(tmp_path / 'matrix')
+
+    frame = matrix.to_frame()
+    assert frame['team'].tolist() == features['team'].tolist()
+    assert frame['season'].tolist() == features['season'].tolist()
+    np.testing.assert_allclose(frame['x'], features['x'])
+
+
+def test_rewrites_keep_the_current_and_previous_version(tmp_path):
+    path = tmp_path / 'matrix'
+    for value in range(4):
+        write_feature_matrix(make_features(10, value), path)
+
+    versions = sorted(child.name for child in path.iterdir() if child.is_dir())
+    assert len(versions) == 2
+    assert (path / 'CURRENT').read_text() == versions[-1]
+    assert FeatureMatrix.open(path).column('y')[0] == 3.0
+
+
+def test_failed_write_leaves_no_temporary_directory(tmp_path):
+    path = tmp_path / 'matrix'
+    write_feature_matrix(make_features(10), path)
+    with pytest.raises(KeyError):
+        write_feature_matrix(make_features(10), path, columns=['x', 'missing'])
+
+    assert [child.name for child in path.iterdir() if child.name.startswith('.')] == []
+    assert FeatureMatrix.open(path).shape == (10, 2)
+
+
+def test_opens_the_unversioned_layout(tmp_path):
+    path = tmp_path / 'matrix'
+    path.mkdir()
+    np.save(path / 'matrix.npy', np.asfortranarray(np.ones((2, 1), dtype=np.float32)))
+    np.save(path / 'keys.npy', TeamSeasonIndex(['BOS']).encode(pd.Series(['BOS', 'BOS']), pd.Series([2000, 2001])))
+    with open(path / 'meta.json', 'w') as f:
+        json.dump({'columns': ['x'], 'teams': ['BOS'], 'standardized': False, 'scaler': None}, f)
+
+    assert FeatureMatrix.open(path).team_seasons()['season'].tolist() == [2000, 2001]
+
+
+def test_readers_never_see_a_partial_matrix(tmp_path):
+    path = tmp_path / 'matrix'
+    write_feature_matrix(make_features(5, 0), path)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                matrix = FeatureMatrix.open(path)
+                rows = matrix.meta['rows']
+                value = matrix.column('y')[0]
+                assert len(matrix.keys) == rows == len(matrix.values)
+                # Each write has its own row count and value, so a mix would show
+                assert rows == 5 + int(value)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for value in range(1, 30):
+        write_feature_matrix(make_features(5 + value, value), path)
+    done.set()
+    reader.join()
+
+    assert errors == []
@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.features.feature_store import FeatureStore
+
+
+def make_features(value):
+    return pd.DataFrame({'team': ['BOS', 'LAL'], 'season': [2000 + value % 3] * 2, 'x': [value, value]})
+
+
+def test_save_load_and_latest(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    first = store.save(make_features(0), 'pattern_features')
+    second = store.save(make_features(1), 'pattern_features', inputs={'stats': make_features(1)})
+
+    assert (first, second) == ('v000001', 'v000002')
+    assert store.latest('pattern_features') == second
+    assert store.load('pattern_features')['x'].tolist() == [1, 1]
+    assert store.load('pattern_features', version=first)['x'].tolist() == [0, 0]
+    assert store.find_version('pattern_features', {'stats': make_features(1)}) == second
+
+
+def test_concurrent_writers_keep_every_version(tmp_path):
+    def save(value):
+        return FeatureStore(str(tmp_path)).save(make_features(value), 'pattern_features')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = list(pool.map(save, range(24)))
+
+    store = FeatureStore(str(tmp_path))
+    assert len(set(versions)) == 24
+    assert [v['version'] for v in store.versions('pattern_features')] == sorted(versions)
+    assert store.latest('pattern_features') == max(versions)
@@ -0,0 +1,39 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from src.data.cleaners.nba_data_cleaner import TEAM_MAPPINGS
+from src.data.cleaners.team_resolver import TeamNameResolver
+from src.data.franchises import FranchiseTable
+
+
+@pytest.fixture(scope='module')
+def table():
+    return FranchiseTable(TeamNameResolver(TEAM_MAPPINGS))
+
+
+@pytest.mark.parametrize('name, season, franchise, code', [
+    ('HORNETS', 2002, 'CHA', 'CHH'),
+    ('HORNETS', 2005, 'NOP', 'NOH'),
+    ('HORNETS', 2016, 'CHA', 'CHA'),
+    ('SEA', 2005, 'OKC', 'SEA'),
+    ('OKC', 2010, 'OKC', 'OKC'),
+])
+def test_resolves_per_era(table, name, season, franchise, code):
+    resolved = table.resolve(pd.Series([name]), pd.Series([season]))
+    assert resolved['franchise'].iloc[0] == franchise
+    assert resolved['team_code'].iloc[0] == code
+
+
+def test_season_labels_resolve_like_their_end_year(table):
+    names = pd.Series(['HORNETS', 'HORNETS', 'HORNETS'])
+    labels = table.franchises(names, pd.Series(['2004-05', '2004-2005', '2001-02']))
+    years = table.franchises(names, pd.Series([2005, 2005, 2002]))
+    assert list(labels) == list(years) == ['NOP', 'NOP', 'CHA']
+
+
+def test_unparseable_seasons_warn(table, caplog):
+    with caplog.at_level(logging.WARNING, logger='src.data.franchises'):
+        table.franchises(pd.Series(['HORNETS']), pd.Series(['next year']))
+    assert 'could not be parsed' in caplog.text
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.grouped_stats import GroupedStats
+
+KEYS = ['team', 'season']
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame({
+        'team': rng.choice(['BOS', 'LAL', 'NYK', 'CHI'], n).astype(object),
+        'season': rng.choice([2018, 2019, 2020], n).astype(float),
+        'player': rng.choice([f"P{i}" for i in range(60)], n).astype(object),
+        'experience': rng.integers(1, 15, n).astype(float),
+        'age': rng.normal(27, 4, n),
+    })
+    # Missing keys and values, and a group too small for a variance or skew
+    df.loc[rng.choice(n, 20, replace=False), 'team'] = None
+    df.loc[rng.choice(n, 20, replace=False), 'season'] = np.nan
+    df.loc[rng.choice(n, 40, replace=False), 'experience'] = np.nan
+    df.loc[rng.choice(n, 20, replace=False), 'player'] = None
+    small = pd.DataFrame({'team': ['TOR', 'TOR'], 'season': [2020.0, 2020.0], 'player': ['X', 'Y'],
+                          'experience': [3.0, 5.0], 'age': [25.0, 30.0]})
+    return pd.concat([df, small], ignore_index=True)
+
+
+def expected(df):
+    grouped = df.groupby(KEYS, sort=True, observed=True)
+    return pd.DataFrame({
+        'experience_mean': grouped['experience'].mean(),
+        'experience_var': grouped['experience'].var(),
+        'experience_skew': grouped['experience'].skew(),
+        'age_mean': grouped['age'].mean(),
+        'age_var': grouped['age'].var(),
+        'age_skew': grouped['age'].skew(),
+        'player_count': grouped['player'].count(),
+        'player_nunique': grouped['player'].nunique(),
+    })
+
+
+def actual(stats):
+    return pd.concat([
+        stats.mean('experience'), stats.var('experience'), stats.skew('experience'),
+        stats.mean('age'), stats.var('age'), stats.skew('age'),
+        stats.count('player'), stats.nunique('player'),
+    ], axis=1)
+
+
+def test_matches_pandas_groupby_with_missing_keys_and_values(players):
+    stats = GroupedStats.compute(players, KEYS, moment_cols=['experience', 'age'], distinct_cols=['player'])
+    pd.testing.assert_frame_equal(actual(stats), expected(players), check_dtype=False, rtol=1e-9)
+
+
+def test_merged_partials_match_a_single_pass(players):
+    first, second = players.iloc[:150], players.iloc[150:]
+    merged = GroupedStats.compute(first, KEYS, moment_cols=['experience', 'age'], distinct_cols=['player']).merge(
+        GroupedStats.compute(second, KEYS, moment_cols=['experience', 'age'], distinct_cols=['player']))
+    pd.testing.assert_frame_equal(actual(merged), expected(players), check_dtype=False, rtol=1e-9)
+
+
+def test_all_keys_missing():
+    df = pd.DataFrame({'team': [None, None], 'season': [2020, 2021], 'experience': [1.0, 2.0]})
+    stats = GroupedStats.compute(df, KEYS, moment_cols=['experience'])
+    assert len(stats.mean('experience')) == 0
@@ -0,0 +1,112 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.data.collectors import kaggle_collector
+from src.data.collectors.kaggle_collector import KaggleCollector
+
+DATASET = 'owner/nba-stats'
+
+
+class FakeKaggleApi:
+    """Stands in for KaggleApi: lists and 'downloads' in-memory files."""
+
+    def __init__(self, files, failures=0):
+        self.files = dict(files)
+        self.failures = failures
+        self.downloads = 0
+        self.listings = 0
+
+    def dataset_list_files(self, dataset_path):
+        self.listings += 1
+        return SimpleNamespace(files=[
+            SimpleNamespace(name=name, totalBytes=len(content), creationDate='2024-01-01')
+            for name, content in self.files.items()
+        ])
+
+    def dataset_download_files(self, dataset_path, path, unzip):
+        assert unzip
+        self.downloads += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('connection reset')
+        for name, content in self.files.items():
+            with open(os.path.join(path, name), 'w') as f:
+                f.write(content)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(kaggle_collector.time, 'sleep', delays.append)
+    return delays
+
+
+def test_download_returns_the_result_fields(tmp_path):
+    api = FakeKaggleApi({'teams.csv': 'a' * 10, 'players.csv': 'b' * 5})
+    result = KaggleCollector(str(tmp_path), api=api).download_many({'stats': DATASET})['stats']
+
+    assert result['status'] == 'success'
+    assert result['error'] is None
+    assert result['path'] == os.path.join(str(tmp_path), DATASET)
+    assert result['attempts'] == 1
+    assert result['bytes'] == 15
+    assert result['seconds'] >= 0
+    assert sorted(os.listdir(result['path'])) == ['players.csv', 'teams.csv']
+
+
+def test_current_copy_is_skipped(tmp_path):
+    api = FakeKaggleApi({'teams.csv': 'a' * 10})
+    collector = KaggleCollector(str(tmp_path), api=api)
+    collector.download_many({'stats': DATASET})
+
+    again = collector.download_many({'stats': DATASET})['stats']
+    single = collector.download_dataset('stats', DATASET)
+
+    assert again['status'] == single['status'] == 'skipped'
+    assert again['bytes'] == 0
+    assert api.downloads == 1
+
+    assert collector.download_dataset('stats', DATASET, force=True)['status'] == 'success'
+    assert api.downloads == 2
+
+
+def test_changed_remote_is_downloaded_again_without_stale_files(tmp_path):
+    api = FakeKaggleApi({'teams.csv': 'a' * 10, 'old.csv': 'x'})
+    collector = KaggleCollector(str(tmp_path), api=api)
+    collector.download_many({'stats': DATASET})
+
+    api.files = {'teams.csv': 'a' * 12}
+    result = collector.download_many({'stats': DATASET})['stats']
+
+    assert result['status'] == 'success'
+    assert result['bytes'] == 12
+    assert os.listdir(result['path']) == ['teams.csv']
+
+
+def test_retries_with_exponential_backoff(tmp_path, sleeps):
+    api = FakeKaggleApi({'teams.csv': 'a'}, failures=2)
+    result = KaggleCollector(str(tmp_path), api=api).download_many(
+        {'stats': DATASET}, retries=3, backoff=2.0)['stats']
+
+    assert result['status'] == 'success'
+    assert result['attempts'] == 3
+    assert result['error'] is None
+    assert sleeps == [2.0, 4.0]
+
+
+def test_fails_after_the_last_retry(tmp_path, sleeps):
+    api = FakeKaggleApi({'teams.csv': 'a'}, failures=10)
+    collector = KaggleCollector(str(tmp_path), api=api)
+    result = collector.download_many({'stats': DATASET}, retries=2, backoff=1.0)['stats']
+
+    assert result['status'] == 'failed'
+    assert result['attempts'] == 3
+    assert 'connection reset' in result['error']
+    assert result['bytes'] == 0
+    assert sleeps == [1.0, 2.0]
+    # A failed download is never recorded as current, and leaves no partial files
+    assert collector.store.entry(DATASET) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), DATASET))
+    assert os.listdir(os.path.join(str(tmp_path), 'owner')) == []
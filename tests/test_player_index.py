@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('Levenshtein')
+
+from src.data.cleaners import PlayerIdentityIndex
+
+
+@pytest.fixture
+def reference():
+    return pd.DataFrame({
+        'player_id': [1, 2, 5, 6],
+        'player': ['LeBron James', 'Stephen Curry', 'Marcus Williams', 'Marcus Williams'],
+        'team': ['CLE', 'GSW', 'NJN', 'SAS'],
+        'season': [2008, 2008, 2008, 2008],
+    })
+
+
+def match_one(index, name, team, season):
+    return index.match(pd.Series([name]), pd.Series([team]), pd.Series([season])).iloc[0]
+
+
+def test_same_name_players_resolve_by_team_season(reference):
+    index = PlayerIdentityIndex().fit(reference, id_col='player_id')
+    assert match_one(index, 'Marcus Williams', 'SAS', 2008) == 6
+    assert match_one(index, 'Marcus Williams', 'NJN', 2008) == 5
+
+
+def test_fuzzy_match_narrowed_by_team_season_is_not_cached(reference, tmp_path):
+    cache = tmp_path / 'players.json'
+    index = PlayerIdentityIndex(cache_path=cache).fit(reference, id_col='player_id')
+    assert match_one(index, 'M. Williams', 'SAS', 2008) == 6
+    assert match_one(index, 'M. Williams', 'NJN', 2008) == 5
+
+    index.save_cache()
+    reloaded = PlayerIdentityIndex(cache_path=cache).fit(reference, id_col='player_id')
+    assert match_one(reloaded, 'M. Williams', 'NJN', 2008) == 5
+
+
+def test_unique_fuzzy_matches_are_cached(reference, tmp_path):
+    cache = tmp_path / 'players.json'
+    index = PlayerIdentityIndex(cache_path=cache).fit(reference, id_col='player_id')
+    assert match_one(index, 'Lebron Jamse', 'CLE', 2008) == 1
+    index.save_cache()
+
+    reloaded = PlayerIdentityIndex(cache_path=cache).fit(reference, id_col='player_id')
+    assert match_one(reloaded, 'Lebron Jamse', 'CLE', 2008) == 1
+    assert reloaded.stats['cache_hits'] == 1
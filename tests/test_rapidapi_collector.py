@@ -0,0 +1,158 @@
+import asyncio
+import json
+from datetime import date
+
+import httpx
+import pytest
+
+from src.data.collectors import rapidapi_collector
+from src.data.collectors.rapidapi_collector import RapidAPICollector
+
+
+def make_collector(tmp_path, handler, **kwargs):
+    params = {'rate': 1000.0, 'burst': 1000.0, 'retries': 2, 'backoff': 0.01, 'max_concurrency': 4}
+    params.update(kwargs)
+    return RapidAPICollector(base_dir=str(tmp_path), api_key='test', base_url='http://stub',
+                             transport=httpx.MockTransport(handler), **params)
+
+
+def games_body(request):
+    return httpx.Response(200, json={'errors': [], 'response': [{'date': request.url.params['date']}]})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record every asyncio.sleep delay without actually waiting."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(rapidapi_collector.asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def test_games_are_written_by_season(tmp_path):
+    collector = make_collector(tmp_path, games_body)
+    results = collector.collect_games(date(2023, 12, 30), date(2024, 1, 2))
+
+    assert [r['status'] for r in results.values()] == ['success'] * 4
+    path = tmp_path / 'games' / 'season=2024' / '2024-01-01.json'
+    assert json.loads(path.read_text())['response'] == [{'date': '2024-01-01'}]
+    assert collector.store.entry('games') is not None
+
+
+def test_standings_use_the_api_season(tmp_path):
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.url.params))
+        assert request.headers['X-RapidAPI-Key'] == 'test'
+        return httpx.Response(200, json={'errors': [], 'response': []})
+
+    collector = make_collector(tmp_path, handler)
+    results = collector.collect_standings([2024])
+
+    assert results['2024']['status'] == 'success'
+    assert seen == [{'league': 'standard', 'season': '2023'}]
+    assert (tmp_path / 'standings' / 'season=2024.json').exists()
+
+
+def test_retries_server_errors_and_honors_retry_after(tmp_path, sleeps):
+    calls = {}
+
+    def handler(request):
+        day = request.url.params['date']
+        calls[day] = calls.get(day, 0) + 1
+        if day == '2024-01-01' and calls[day] == 1:
+            return httpx.Response(500)
+        if day == '2024-01-02' and calls[day] == 1:
+            return httpx.Response(429, headers={'Retry-After': '3'})
+        return games_body(request)
+
+    collector = make_collector(tmp_path, handler)
+    results = collector.collect_games(date(2024, 1, 1), date(2024, 1, 3))
+
+    assert all(r['status'] == 'success' for r in results.values())
+    assert calls == {'2024-01-01': 2, '2024-01-02': 2, '2024-01-03': 1}
+    assert collector.stats['retries'] == 2
+    assert 3.0 in sleeps
+
+
+def test_gives_up_after_the_last_retry(tmp_path, sleeps):
+    collector = make_collector(tmp_path, lambda request: httpx.Response(503), retries=2)
+    results = collector.collect_games(date(2024, 1, 1), date(2024, 1, 1))
+
+    assert results['2024-01-01']['status'] == 'failed'
+    assert collector.stats['requests'] == 3
+    assert sleeps[:2] == [0.01, 0.02]
+    assert not (tmp_path / 'games').exists()
+
+
+def test_api_errors_are_not_stored(tmp_path):
+    quota = {'errors': {'requests': 'You have reached the request limit'}, 'response': []}
+    collector = make_collector(tmp_path, lambda request: httpx.Response(200, json=quota))
+    results = collector.collect_games(date(2024, 1, 1), date(2024, 1, 1))
+
+    assert results['2024-01-01']['status'] == 'failed'
+    assert 'request limit' in results['2024-01-01']['error']
+    assert not (tmp_path / 'games' / 'season=2024' / '2024-01-01.json').exists()
+
+    # The next run fetches the date again instead of skipping it
+    collector = make_collector(tmp_path, games_body)
+    assert collector.collect_games(date(2024, 1, 1), date(2024, 1, 1))['2024-01-01']['status'] == 'success'
+
+
+def test_resumes_with_the_missing_dates(tmp_path):
+    def failing_handler(request):
+        if request.url.params['date'] == '2024-01-02':
+            return httpx.Response(503)
+        return games_body(request)
+
+    make_collector(tmp_path, failing_handler, retries=0).collect_games(date(2024, 1, 1), date(2024, 1, 3))
+
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.params['date'])
+        return games_body(request)
+
+    collector = make_collector(tmp_path, handler)
+    results = collector.collect_games(date(2024, 1, 1), date(2024, 1, 3))
+
+    assert requested == ['2024-01-02']
+    assert [results[day]['status'] for day in sorted(results)] == ['skipped', 'success', 'skipped']
+
+    collector.collect_games(date(2024, 1, 1), date(2024, 1, 3), force=True)
+    assert len(requested) == 4
+
+
+def test_requests_in_flight_are_bounded(tmp_path):
+    in_flight = {'now': 0, 'peak': 0}
+
+    async def handler(request):
+        in_flight['now'] += 1
+        in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        return games_body(request)
+
+    collector = make_collector(tmp_path, handler, max_concurrency=3)
+    results = collector.collect_games(date(2024, 1, 1), date(2024, 1, 20))
+
+    assert len(results) == 20
+    assert in_flight['peak'] == 3
+
+
+def test_token_bucket_limits_the_rate():
+    async def run():
+        bucket = rapidapi_collector.TokenBucket(rate=50.0, capacity=1.0)
+        start = asyncio.get_running_loop().time()
+        for _ in range(6):
+            await bucket.acquire()
+        return asyncio.get_running_loop().time() - start
+
+    # The first token is available at once, the next five take 1/50 s each
+    assert asyncio.run(run()) >= 5 / 50 * 0.9
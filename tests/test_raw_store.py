@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data.raw_store import RawDataStore
+
+
+def write_dataset(root, name, content):
+    directory = root / name
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / 'data.csv').write_text(content)
+
+
+def test_record_and_change_detection(tmp_path):
+    write_dataset(tmp_path, 'shots', 'a,b\n1,2\n')
+    store = RawDataStore(str(tmp_path))
+
+    assert store.changed_since('cleaning', ['shots'])
+    store.record('shots', source='kaggle', version='v1')
+    assert store.changed_since('cleaning', ['shots'])
+
+    store.mark_consumed('cleaning', ['shots'])
+    assert not store.changed_since('cleaning', ['shots'])
+    assert store.changed_since('cleaning', ['shots', 'never-recorded'])
+
+    write_dataset(tmp_path, 'shots', 'a,b\n1,3\n')
+    store.record('shots', source='kaggle', version='v2')
+    assert store.changed_since('cleaning', ['shots'])
+    assert store.is_current('shots', 'v2')
+
+
+def test_store_instances_sharing_a_root_keep_each_others_entries(tmp_path):
+    write_dataset(tmp_path, 'shots', 'shots')
+    write_dataset(tmp_path, 'injuries', 'injuries')
+    first, second = RawDataStore(str(tmp_path)), RawDataStore(str(tmp_path))
+
+    first.record('shots', source='kaggle')
+    second.record('injuries', source='kaggle')
+    first.mark_consumed('cleaning', ['shots'])
+    second.mark_consumed('features', ['injuries'])
+
+    manifest = RawDataStore(str(tmp_path)).manifest
+    assert set(manifest['datasets']) == {'shots', 'injuries'}
+    assert set(manifest['consumers']) == {'cleaning', 'features'}
+
+
+def test_concurrent_records_are_all_kept(tmp_path):
+    names = [f"dataset{i}" for i in range(16)]
+    for name in names:
+        write_dataset(tmp_path, name, name)
+
+    def record(name):
+        RawDataStore(str(tmp_path)).record(name, source='kaggle')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, names))
+
+    assert set(RawDataStore(str(tmp_path)).manifest['datasets']) == set(names)
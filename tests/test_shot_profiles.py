@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.storage import save_partitioned
+from src.features.shot_profiles import ShotProfileAggregator
+
+
+@pytest.fixture
+def shots():
+    rng = np.random.default_rng(0)
+    n = 3000
+    return pd.DataFrame({
+        'TEAM_NAME': rng.choice(['Boston Celtics', 'Miami Heat'], n),
+        'SEASON_1': rng.choice([2009, 2010, 2011], n),
+        'SHOT_MADE': rng.random(n) < 0.45,
+        'BASIC_ZONE': rng.choice(['Restricted Area', 'Mid-Range', 'Above the Break 3'], n),
+        'SHOT_DISTANCE': rng.integers(0, 30, n).astype(float),
+        'LOC_X': rng.uniform(-250, 250, n),
+        'LOC_Y': rng.uniform(-50, 400, n),
+    })
+
+
+def test_counts_match_groupby(shots, tmp_path):
+    save_partitioned(shots, tmp_path, 'shots', partition_col='SEASON_1')
+    counts = ShotProfileAggregator(n_jobs=1).count(directory=tmp_path)
+
+    grouped = shots.groupby(['TEAM_NAME', 'SEASON_1'])['SHOT_MADE']
+    assert counts['attempts'].to_dict() == grouped.size().to_dict()
+    assert counts['makes'].to_dict() == grouped.sum().to_dict()
+
+
+def test_seasons_may_be_an_iterator(shots, tmp_path):
+    save_partitioned(shots, tmp_path, 'shots', partition_col='SEASON_1')
+    aggregator = ShotProfileAggregator(n_jobs=1)
+
+    counts = aggregator.count(directory=tmp_path, seasons=iter([2009, 2010]))
+
+    assert sorted(counts.index.get_level_values('season').unique()) == [2009, 2010]
+    assert counts['attempts'].sum() == shots['SEASON_1'].isin([2009, 2010]).sum()
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.storage import list_partitions, load_partitioned, save_partitioned
+from src.data.utils import save_data
+
+
+@pytest.fixture
+def stored(tmp_path):
+    df = pd.DataFrame({'season': [2019, 2020, 2020, 2021], 'team': ['A', 'B', 'C', 'D'], 'pts': [1.0, 2.0, 3.0, 4.0]})
+    save_partitioned(df, tmp_path, 'team_stats')
+    return tmp_path, df
+
+
+def test_round_trip(stored):
+    directory, df = stored
+    assert list_partitions(directory, 'team_stats') == [2019, 2020, 2021]
+    loaded = load_partitioned(directory, 'team_stats')
+    pd.testing.assert_frame_equal(loaded, df, check_dtype=False)
+
+
+@pytest.mark.parametrize('seasons, expected', [
+    (2020, ['B', 'C']),
+    (np.int64(2020), ['B', 'C']),
+    ((2020, None), ['B', 'C', 'D']),
+    ([2019, 2021], ['A', 'D']),
+    (iter([2021]), ['D']),
+    (1990, []),
+])
+def test_season_selectors(stored, seasons, expected):
+    directory, _ = stored
+    assert load_partitioned(directory, 'team_stats', seasons=seasons)['team'].tolist() == expected
+
+
+def test_missing_or_empty_dataset(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_partitioned(tmp_path, 'team_stats')
+    (tmp_path / 'team_stats').mkdir()
+    with pytest.raises(FileNotFoundError):
+        load_partitioned(tmp_path, 'team_stats')
+
+
+def test_save_data_partitions_on_a_given_column(tmp_path):
+    injuries = pd.DataFrame({'year': [2020, 2021], 'team': ['A', 'B'], 'count': [3, 4]})
+    save_data(injuries, tmp_path, 'injuries_summary', file_format='parquet', partition_col='year')
+    assert list_partitions(tmp_path, 'injuries_summary', partition_col='year') == [2020, 2021]